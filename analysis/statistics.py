@@ -4,315 +4,153 @@
 ###################
 
 DATA_DIR = "./supplemental_data/"
+FILTER_CONFIG = "./analysis/configs/clpsych2021.json"
+EXPORT_DIR = "./supplemental_data/exports/"
+STORE_DIR = "./.cache/store/"
+DATABASE_PATH = "./.cache/database/catalog.sqlite"
+SNAPSHOT_DIR = "./.cache/snapshots/"
 PLOT_DIR = "./logs/"
 
+## Styling for Figures
+PLOT_STYLE = {
+    "figsize":(8,6),
+    "color":"navy",
+    "alpha":0.7,
+    "label_fontsize":28,
+    "tick_fontsize":18,
+    "dpi":300,
+}
+
 ###################
 ### Imports
 ###################
 
 ## Standard Libraries
-from datetime import datetime
+import os
+import sys
+import argparse
 
 ## External Libraries
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
+
+## Local
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from mhd.catalog import load_catalog
+from mhd.encoding import explode_lists, first_items, multi_hot_encode, label_counts
+from mhd.filters import load_filter_config, build_filter_masks, get_filter_counts, select_stage
+from mhd.export import export_catalog
+from mhd.memo import memoize_stage
+from mhd.figures import render_figures
+from mhd.summary import summarize_sizes, summary_table
+from mhd.store import write_store
+from mhd.database import write_database
+from mhd.snapshots import take_snapshot, yearly_growth
+from mhd.dedup import find_duplicates, suggest_source_ids
+from mhd.profiling import PROFILE_ENABLED, enable_profiling, profile_stage, stage
+from mhd.schema import STANDARDIZED_SCHEMA, validate_catalog, to_compact
+from mhd.lineage import reuse_count_column
+from mhd.labels import map_unique, availability_labels, availability_short_labels, clean_platform_names, task_abbreviations
 
 ###################
 ### Helper Functions
 ###################
 
-## Flatten
-flatten = lambda l: [item for sublist in l for item in sublist]
-
-## Union of Sets
-set_union = lambda s: sorted(list(set.union(*[i for i in s if isinstance(i, set)])))
-
-def format_float(num):
-    """
-
+def original_source_check(data_df):
     """
-    num = num.replace("(","").replace(")","")
-    mult = 1.0
-    if num.endswith("k"):
-        num = num[:-1]
-        mult = 1000.0
-    num = float(num) * mult
-    return num
-    
-def process_size(size):
+    Whether each paper lists itself among its source_ids (i.e. contributes
+    an original dataset), via a membership test on the flattened source_ids.
     """
+    rows, sources = explode_lists(data_df["source_ids"])
+    is_self = np.zeros(len(data_df), dtype=bool)
+    is_self[rows[sources == data_df["paper_id"].values[rows]]] = True
+    return pd.Series(is_self, index=data_df.index)
 
+def get_clean_reference(latex_df):
     """
-    if pd.isnull(size):
-        return np.nan
-    if size == "na":
-        return "N/A"
-    sizes = size.split(", ")
-    sizes = [s.split() for s in sizes]
-    sizes = dict((x, format_float(y)) for x, y in sizes)
-    return sizes
-
-def process_tasks(tasks):
+    APA-style in-text references (e.g. "Coppersmith, Dredze, & Harman (2015)")
+    selected with np.select by the number of listed authors.
     """
+    authors = latex_df["authors"]
+    n_authors = authors.str.count(", ") + 1
+    first_author = authors.str.replace(r", .*$", "", regex=True)
+    names = np.select([n_authors == 1, n_authors == 2, n_authors == 3],
+                      [authors.astype(object),
+                       authors.str.replace(", ", " & ", regex=False).astype(object),
+                       authors.str.replace(r"^([^,]*, [^,]*), ", r"\1, & ", regex=True).astype(object)],
+                      default=(first_author + " et al.").astype(object))
+    return pd.Series(names, index=latex_df.index) + " (" + latex_df["year"].astype(str) + ")"
 
-    """
-    if pd.isnull(tasks):
-        return np.nan
-    if tasks == "na":
-        return "N/A"
-    tasks = set(tasks.split(", "))
-    return tasks
-
-def process_availability(availability):
-    """
+###################
+### Load/Format Dataset
+###################
 
+@profile_stage("load")
+def load_stage(data_dir=DATA_DIR):
     """
-    if pd.isnull(availability):
-        return "Unknown"
-    elif availability == "not_available_for_distribution":
-        return "Not Available (Prohibited)"
-    elif availability == "no_longer_exists":
-        return "Not Available (No Longer Exists)"
-    elif availability == "available_via_signed_agreement":
-        return "Available (Signed Agreement)"
-    elif availability == "available_via_author_contact":
-        return "Available (Author Discretion)"
-    elif availability == "available_via_download":
-        return "Available (No Restrictions)"
-    elif availability == "reproducible_via_api":
-        return "Available (Reproducible via API)"
-    elif availability == "pending":
-        return "Pending Availability"
-    else:
-        raise ValueError("Encountered unaccounted availability")
-
-def process_platforms(platforms):
+    Load the standardized catalog (cached as Parquet by load_catalog) and
+    validate every cell, reporting all schema errors at once.
     """
+    raw_df = load_catalog(f"{data_dir}data_sources_standardized.xlsx")
+    _ = validate_catalog(raw_df, STANDARDIZED_SCHEMA, raise_errors=True)
+    return raw_df
 
+@profile_stage("normalize")
+@memoize_stage("normalize")
+def normalize_stage(raw_df):
     """
-    if pd.isnull(platforms):
-        return np.nan
-    platforms = set(platforms.split(", "))
-    return platforms
-
-def process_annotation_style(style):
+    Parse sizes and label columns once into the compact catalog
+    (mhd.schema.to_compact) and standardize label values. Set-valued labels
+    and source_ids are Arrow list columns (missing -> null, "na" -> empty
+    list); annotation level and primary language are categoricals.
     """
+    ## Copy
+    data_df = raw_df.copy()
+    compact_df, _ = to_compact(raw_df)
 
-    """
-    if pd.isnull(style):
-        return np.nan
-    if style == "na":
-        return "N/A"
-    style = set(style.split(", "))
-    return style
-
-def process_sources(sources):
-    """
+    ## Format Sizes
+    size_cols = ["n_documents","n_individuals","n_conversations"]
+    for sc in size_cols:
+        data_df[f"{sc}_relevant_total"] = compact_df[f"{sc}_relevant_total"]
+        data_df[f"{sc}_total"] = compact_df[f"{sc}_total"]
 
-    """
-    sources = str(sources)
-    sources = sources.split(", ")
-    sources = [int(s) for s in sources]
-    return sources
+    ## Label Lists (Tasks, Platforms, Annotation Style)
+    for col in ["tasks","platforms","annotation_style"]:
+        data_df[col] = compact_df[col]
 
-def original_source_check(row):
-    """
+    ## Process Availability (Display Label per Category)
+    data_df["availability"] = availability_labels(compact_df["availability"])
 
-    """
-    if row["paper_id"] in row["source_ids"]:
-        return True
-    return False
+    ## Process Platforms (First Listed Platform Is the Primary Platform)
+    data_df["primary_platform"] = first_items(compact_df["platforms"])
 
-def check_in_set(candidates, query):
-    """
+    ## Process Annotation Level
+    data_df["annotation_level"] = compact_df["annotation_level"]
 
-    """
-    if not isinstance(candidates, set):
-        return False
-    exists = query in candidates
-    return exists
+    ## Process Sources
+    data_df["source_ids"] = compact_df["source_ids"]
+    data_df["contains_original_source"] = original_source_check(data_df)
+    data_df["reuse_count"] = reuse_count_column(data_df)
 
-def get_clean_task_name(tasks):
-    """
+    ## Process Primary Language
+    data_df["primary_language"] = compact_df["primary_language"].cat.rename_categories(str.title)
+    return data_df
 
+@profile_stage("dedup")
+@memoize_stage("dedup")
+def dedup_stage(data_df):
     """
-    task_names = []
-    for t in tasks:
-        if t in ["adhd","ocd", "ptsd"]:
-            task_names.append(t.upper())
-        elif t == 'mental_health_(combined)':
-            task_names.append("Mental Health Disorder (General)")
-        elif t == "rape_(survivor)":
-            task_names.append("Trauma (Rape Survivor)")
-        else:
-            task_names.append(t.replace("_"," ").title())
-    task_names = ", ".join(task_names)
-    return task_names
-
-def get_clean_task_abbr(clean_task_names):
+    Flag candidate duplicate entries (similar title and authors, published
+    within a year of each other) and suggest source_ids corrections so
+    duplicates point to the earliest entry. Candidates are for manual review.
     """
-
-    """
-    ## Define Abbreviation Map
-    abbr_map = {
-        "Suicide (Ideation)":"SI",
-        "Suicide (Attempt)":"SA",
-        "Bipolar Disorder":"BIPD",
-        "Borderline Personality Disorder":"BRPD",
-        "PTSD": "PTSD",
-        "Seasonal Affective Disorder": "SAD",
-        "Depression": "DEP",
-        "Anxiety": "ANX",
-        "Eating": "EAT",
-        "Eating (Recovery)":"EATR",
-        "OCD": "OCD",
-        "Schizophrenia": "SCHZ",
-        "ADHD": "ADHD",
-        "Psychosis": "PSY",
-        "Anxiety (Social)": "ANXS",
-        "Self Harm": "SH",
-        "Rape (Survivors)": "RS",
-        "Panic": "PAN",
-        "Trauma": "TRA",
-        "Alcoholism": "ALC",
-        "Opiate Addiction": "OPAD",
-        "Aspergers": "ASP",
-        "Autism": "AUT",
-        "Opiate Usage": "OPUS",
-        "Mental Health Disorder (General)": "MHGEN",
-        "Stress": "STR",
-        "Stress (Stressor And Subjects)":"STRS"
+    pairs, clusters = find_duplicates(data_df)
+    duplicates = {
+        "duplicate_pairs":pairs,
+        "duplicate_clusters":clusters,
+        "source_id_suggestions":suggest_source_ids(data_df, clusters),
     }
-    ## Split and Replace
-    clean_task_names = clean_task_names.split(", ")
-    clean_task_names = [abbr_map[t] for t in clean_task_names]
-    return ", ".join(clean_task_names)
-
-
-def get_clean_platform_name(platforms):
-    """
-
-    """
-    platforms = [t.replace("_"," ").title() for t in list(platforms)]
-    platforms = ", ".join(platforms)
-    return platforms
-
-def get_clean_availability(availability):
-    """
-
-    """
-    availability = availability.split("(")[1].split(")")[0]
-    return availability
-
-def get_clean_reference(row):
-    """
-
-    """
-    authors = row["authors"].split(", ")
-    year = row["year"]
-    reference = "{} ({})"
-    if len(authors) == 1:
-        reference = reference.format(authors[0], year)
-    elif len(authors) == 2:
-        authors = " & ".join(authors)
-        reference = reference.format(authors, year)
-    elif len(authors) == 3:
-        authors = ", ".join(authors[:-1]) + ", & " + authors[-1]
-        reference = reference.format(authors, year)
-    else:
-        authors = authors[0] + " et al."
-        reference = reference.format(authors, year)
-    return reference
-
-def sum_relevant_sizes(size_dict):
-    """
-
-    """
-    ## Keys To Consider for Counting Depression/Suicide Data Set Sizes
-    acceptable_keys = ["combined",
-                       "control",
-                       "depression",
-                       "depression_(low-mild)",
-                       "depression_(high)",
-                       "mental_health_(combined)",
-                       "increase_activity",
-                       "constant_activity",
-                       "decrease_activity",
-                       "suicide_(ideation)",
-                       "suicide_(attempt)"]
-    ## Ignore Missing et al.
-    if pd.isnull(size_dict):
-        return np.nan
-    if isinstance(size_dict, str):
-        return np.nan
-    ## Sum
-    total = 0
-    for a in acceptable_keys:
-        if a in size_dict:
-            total += size_dict[a]
-    return total
-
-def sum_all_sizes(size_dict):
-    """
-
-    """
-    ## Ignore Missing et al.
-    if pd.isnull(size_dict):
-        return np.nan
-    if isinstance(size_dict, str):
-        return np.nan
-    ## Sum
-    total = 0
-    for x, y in size_dict.items():
-        total += y
-    return total
-    
-
-###################
-### Load/Format Dataset
-###################
-
-## Load Dataset
-data_df = pd.read_excel(f"{DATA_DIR}data_sources_standardized.xlsx")
-
-## Format Sizes
-size_cols = ["n_documents","n_individuals","n_conversations"]
-for sc in size_cols:
-    data_df[sc] = data_df[sc].map(process_size)
-    data_df[f"{sc}_relevant_total"] = data_df[sc].map(sum_relevant_sizes)
-    data_df[f"{sc}_total"] = data_df[sc].map(sum_all_sizes)
-
-## Format Tasks
-data_df["tasks"] = data_df["tasks"].map(process_tasks)
-unique_tasks = set_union(data_df["tasks"])
-for t in unique_tasks:
-    data_df[f"task={t}"] = data_df["tasks"].map(lambda i: check_in_set(i, t))
-
-## Process Availability
-data_df["availability"] = data_df["availability"].map(process_availability)
-
-## Process Platforms
-data_df["platforms"] = data_df["platforms"].map(process_platforms)
-unique_platforms = set_union(data_df["platforms"])
-for p in unique_platforms:
-    data_df[f"platform={p}"] = data_df["platforms"].map(lambda i: check_in_set(i, p))
-
-## Process Annotation Style
-data_df["annotation_style"] = data_df["annotation_style"].map(process_annotation_style)
-unique_annot_styles = set_union(data_df["annotation_style"])
-for a in unique_annot_styles:
-    data_df[f"annotation={a}"] = data_df["annotation_style"].map(lambda i: check_in_set(i, a))
-
-## Process Sources
-data_df["source_ids"] = data_df["source_ids"].map(process_sources)
-data_df["contains_original_source"] = data_df.apply(original_source_check, axis=1)
-
-## Process Primary Language
-data_df["primary_language"] = data_df["primary_language"].str.title()
-
-## Year Filter 
-data_df = data_df.loc[data_df["year"] < 2020].reset_index(drop=True).copy()
+    return duplicates
 
 ###################
 ### Initial Filtering
@@ -345,45 +183,31 @@ Notes:
     * Unique datasets only (e.g. original)
 """
 
-## Initialize Counts for Filters
-filter_counts = dict()
-
-## Isolate Unique Datasets (139 -> 111)
-filter_counts["initial_search"] = len(data_df)
-data_df =  data_df.loc[data_df["contains_original_source"]]
-filter_counts["unique_datasets_only"] = len(data_df)
-
-## Filter Out Tasks that lack annotation (111 -> 108)
-data_df = data_df.loc[~data_df.tasks.isnull()]
-data_df = data_df.loc[data_df.tasks != "N/A"]
-
-## Platforms to Ignore (108 -> 108: Search-based Filter)
-filter_platforms = set(["ehr",
-                        "death_row_last_statements",
-                        "doctor_patient_conversation",
-                        "interview",
-                        "phone",
-                        'ecological_momentary_assessments',
-                        "essays"])
-data_df = data_df.loc[~data_df["platforms"].map(lambda i: all(p in filter_platforms for p in i))]
-data_df["platforms"] = data_df["platforms"].map(lambda i: set(j for j in i if j not in filter_platforms))
-
-## Tasks to Ignore (108 -> 102)
-filter_tasks = set(["counseling_outcome",
-                    "cyberbullying",
-                    "imminent_death",
-                    "depression_(diagnoses_date)",
-                    "psychiatric_(concepts)",
-                    "psychiatric_(readmission)",
-                    "sentiment",
-                    "aggression",
-                    "breast_cancer",
-                    "ehr_categories",
-                    "life_satisfaction",
-                    "relationships"])
-data_df = data_df.loc[~data_df["tasks"].map(lambda i: all(p in filter_tasks for p in i))]
-data_df["tasks"] = data_df["tasks"].map(lambda i: set(j for j in i if j not in filter_tasks))
-filter_counts["apply_exclusion_criteria"] = len(data_df)
+"""
+- Additional Filtering Criteria
+    * Availability: Known and readily available
+- Note: By nature of how we conducted this review, this strictly disqualifies
+        non-English datasets from making it to the final filtered set.
+"""
+
+@profile_stage("filter")
+@memoize_stage("filter")
+def filter_stage(data_df, filter_config):
+    """
+    Apply the review protocol (Year Filter, 139 -> 111 -> 102 -> 35; see FILTER_CONFIG).
+
+    Returns:
+        filtered (dict): Per-stage "filter_counts", the unique, annotated datasets
+                         within scope ("review_df") and the subset that is known
+                         and readily available ("available_df")
+    """
+    filter_masks = build_filter_masks(data_df, filter_config)
+    filtered = {
+        "filter_counts":get_filter_counts(filter_masks),
+        "review_df":select_stage(data_df, filter_masks, filter_config, "apply_exclusion_criteria"),
+        "available_df":select_stage(data_df, filter_masks, filter_config, "available"),
+    }
+    return filtered
 
 ###################
 ### Preliminary Analysis
@@ -460,126 +284,212 @@ Notes:
     not necessarily considered during the evaluation procedures, however.
 """
 
-## Get Filtered Platforms, Tasks
-unique_platforms_filtered = [p for p in set_union(data_df["platforms"]) if p not in filter_platforms]
-unique_tasks_filtered = [p for p in set_union(data_df["tasks"]) if p not in filter_tasks]
-unique_annot_styles_filtered = set_union(data_df["annotation_style"])
-
-## Platform Distribution
-platform_distribution = data_df[[f"platform={p}" for p in unique_platforms_filtered]].sum().sort_values()
-
-## Task Distribution
-task_distribution = data_df[[f"task={t}" for t in unique_tasks_filtered]].sum().sort_values()
+@profile_stage("distributions")
+@memoize_stage("distributions")
+def distributions_stage(review_df):
+    """
+    Compute platform, task, annotation, growth, language, availability and
+    size distributions over the datasets within scope.
+    """
+    ## Cache
+    distributions = {}
 
-## Annotation Distribution
-annot_dist = data_df[[f"annotation={a}" for a in unique_annot_styles_filtered]].sum().sort_values()
+    ## Platform Distribution (Excluded Platforms Already Removed from Lists)
+    distributions["platform_distribution"] = label_counts(*multi_hot_encode(review_df["platforms"]))
 
-## Language Distribution
-language_dist = data_df.primary_language.value_counts()
+    ## Task Distribution (Excluded Tasks Already Removed from Lists)
+    distributions["task_distribution"] = label_counts(*multi_hot_encode(review_df["tasks"]))
 
-## Availability Distribution
-availability_dist = data_df.availability.value_counts()
-clinical_annots = ["clinical_diagnoses","survey_(clinical)"]
-clinical_availability = data_df.loc[data_df.annotation_style.map(lambda i: any(c in i for c in clinical_annots))][["title","tasks","primary_language","availability"]]
+    ## Annotation Distribution
+    distributions["annot_dist"] = label_counts(*multi_hot_encode(review_df["annotation_style"]))
 
-## Size Distribution
-document_annot_docs = data_df.loc[(data_df.annotation_level=="document")]["n_documents_total"].sort_values().dropna()
-document_annot_inds = data_df.loc[(data_df.annotation_level=="document")]["n_individuals_total"].sort_values().dropna()
-individual_annot_docs = data_df.loc[(data_df.annotation_level=="individual")]["n_documents_total"].sort_values().dropna()
-individual_annot_inds = data_df.loc[(data_df.annotation_level=="individual")]["n_individuals_total"].sort_values().dropna()
+    ## Dataset Reuse (Number of Catalog Papers Reusing Each Original Dataset)
+    distributions["reuse_dist"] = review_df.loc[review_df["reuse_count"] > 0].set_index("title")["reuse_count"].sort_values()
 
-###################
-### Stricter Filtering
-###################
+    ## Year-over-Year Growth
+    distributions["year_growth"] = yearly_growth(review_df["year"])
 
-"""
-- Additional Filtering Criteria
-    * Availability: Known and readily available
-- Note: By nature of how we conducted this review, this strictly disqualifies
-        non-English datasets from making it to the final filtered set.
-"""
+    ## Language Distribution
+    distributions["language_dist"] = review_df.primary_language.cat.remove_unused_categories().value_counts()
 
-## Outline Filtering Criteria
-acceptable_availability = set([
-            "Available (Signed Agreement)",
-            "Available (Reproducible via API)",
-            "Available (Author Discretion)",
-            "Available (No Restrictions)"])
+    ## Availability Distribution
+    distributions["availability_dist"] = review_df.availability.value_counts()
+    clinical_annots = ["clinical_diagnoses","survey_(clinical)"]
+    rows, styles = explode_lists(review_df["annotation_style"])
+    clinical = np.zeros(len(review_df), dtype=bool)
+    clinical[rows[pd.Series(styles).isin(clinical_annots).values]] = True
+    distributions["clinical_availability"] = review_df.loc[clinical][["title","tasks","primary_language","availability"]]
 
-## Apply Additional Filtering Criteria
-filter_counts["known_availability"] = (data_df["availability"] != "Unknown").sum()
-data_df = data_df.loc[data_df["availability"].map(lambda i: i in acceptable_availability)]
-filter_counts["available"] = len(data_df)
+    ## Size Distribution
+    document_annot = review_df.loc[(review_df.annotation_level=="document")]
+    individual_annot = review_df.loc[(review_df.annotation_level=="individual")]
+    distributions["document_annot_docs"] = document_annot["n_documents_total"].sort_values().dropna()
+    distributions["document_annot_inds"] = document_annot["n_individuals_total"].sort_values().dropna()
+    distributions["individual_annot_docs"] = individual_annot["n_documents_total"].sort_values().dropna()
+    distributions["individual_annot_inds"] = individual_annot["n_individuals_total"].sort_values().dropna()
 
-## Format Filter Counts
-filter_counts = pd.Series(filter_counts)
+    ## Size Summary (Streaming Min/Max/Mean/Std and Sketched Quantiles per Annotation Level)
+    distributions["size_summary"] = summary_table(summarize_sizes(review_df, "annotation_level", ["n_documents_total","n_individuals_total"]))
+    return distributions
 
 ###################
 ### Figures (Tables)
 ###################
 
-## Clean DF for Tables
-latex_df = data_df[["title",
-                    "authors",
-                    "year",
-                    "platforms",
-                    "tasks",
-                    "annotation_level",
-                    "n_individuals_total",
-                    "n_documents_total",
-                    "availability"]].copy()
-latex_df["tasks"] = latex_df["tasks"].map(lambda x: set(i for i in x if i not in filter_tasks)).map(get_clean_task_name).map(get_clean_task_abbr)
-latex_df["platforms"] = latex_df["platforms"].map(get_clean_platform_name)
-latex_df["availability"] = latex_df["availability"].map(get_clean_availability)
-latex_df["reference"] = latex_df.apply(get_clean_reference, axis = 1)
-latex_df["reference"] = latex_df["title"] + " " + latex_df["reference"]
-latex_df["annotation_level"] = latex_df["annotation_level"].str.title().map(lambda i: i[:3] + ".")
-latex_df["n_individuals_total"] = latex_df["n_individuals_total"].map(lambda i: "{:,d}".format(int(i)) if not pd.isnull(i) else "")
-latex_df["n_documents_total"] = latex_df["n_documents_total"].map(lambda i: "{:,d}".format(int(i)) if not pd.isnull(i) else "")
-
-## Sort Rows, Columns
-latex_df.sort_values("year", ascending = True, inplace = True)
-latex_df = latex_df[["reference",
-                     "platforms",
-                     "tasks",
-                     "annotation_level",
-                     "n_individuals_total",
-                     "n_documents_total",
-                     "availability"]].copy()
-latex_df.reset_index(drop=True, inplace=True)
-latex_df.rename(columns = {"reference":"Reference",
-                           "platforms":"Platform(s)",
-                           "tasks":"Task(s)",
-                           "annotation_level":"Label Resolution",
-                           "n_individuals_total":"# Individuals",
-                           "n_documents_total":"# Documents",
-                           "availability":"Availability"},
-                inplace = True)
+@profile_stage("tables")
+@memoize_stage("tables")
+def tables_stage(available_df):
+    """
+    Format the known and readily available datasets for the paper's table.
+    """
+    ## Clean DF for Tables
+    latex_df = available_df[["title",
+                             "authors",
+                             "year",
+                             "platforms",
+                             "tasks",
+                             "annotation_level",
+                             "n_individuals_total",
+                             "n_documents_total",
+                             "availability"]].copy()
+    latex_df["tasks"] = task_abbreviations(latex_df["tasks"])
+    latex_df["platforms"] = clean_platform_names(latex_df["platforms"])
+    latex_df["availability"] = availability_short_labels(latex_df["availability"])
+    latex_df["reference"] = get_clean_reference(latex_df)
+    latex_df["reference"] = latex_df["title"] + " " + latex_df["reference"]
+    latex_df["annotation_level"] = map_unique(latex_df["annotation_level"], lambda i: i.title()[:3] + ".")
+    latex_df["n_individuals_total"] = latex_df["n_individuals_total"].map(lambda i: "{:,d}".format(int(i)) if not pd.isnull(i) else "")
+    latex_df["n_documents_total"] = latex_df["n_documents_total"].map(lambda i: "{:,d}".format(int(i)) if not pd.isnull(i) else "")
+
+    ## Sort Rows, Columns
+    latex_df.sort_values("year", ascending = True, inplace = True)
+    latex_df = latex_df[["reference",
+                         "platforms",
+                         "tasks",
+                         "annotation_level",
+                         "n_individuals_total",
+                         "n_documents_total",
+                         "availability"]].copy()
+    latex_df.reset_index(drop=True, inplace=True)
+    latex_df.rename(columns = {"reference":"Reference",
+                               "platforms":"Platform(s)",
+                               "tasks":"Task(s)",
+                               "annotation_level":"Label Resolution",
+                               "n_individuals_total":"# Individuals",
+                               "n_documents_total":"# Documents",
+                               "availability":"Availability"},
+                    inplace = True)
+    return latex_df
 
 ###################
 ### Figures (Plots)
 ###################
 
-## Search
-fig, ax = plt.subplots(figsize=(8,6))
-ax.bar(range(filter_counts.shape[0]),
-       filter_counts.values,
-       color="navy",
-       alpha=0.7,
-       edgecolor="navy")
-for i, c in enumerate(filter_counts.values):
-    ax.text(i, c + 1, int(c), fontsize=18, ha="center", va="bottom")
-ax.set_xticks(range(filter_counts.shape[0]))
-ax.set_xticklabels([i.replace("_","\n").title() for i in filter_counts.index],
-                    rotation=45,
-                    ha="center")
-ax.set_ylabel("# Articles", fontweight="bold", fontsize=28)
-ax.set_xlabel("Filtering Stage", fontweight="bold", fontsize=28)
-ax.spines["top"].set_visible(False)
-ax.spines["right"].set_visible(False)
-ax.tick_params(labelsize=18)
-ax.set_ylim(0,filter_counts.max()+8)
-fig.tight_layout()
-fig.savefig("./supplemental_data/search.pdf", dpi=300)
-plt.close(fig)
+@profile_stage("figures")
+def figures_stage(filter_counts, distributions, plot_style=PLOT_STYLE, output_dir=DATA_DIR, plot_dir=PLOT_DIR):
+    """
+    Render the search (filtering stage) figure and the platform, task,
+    language, annotation and size distribution figures. Figures render in
+    parallel and are skipped when their data and style are unchanged.
+
+    Returns:
+        figure_paths (list of str): Paths to rendered figures
+    """
+    ## Search
+    specs = [{"path":f"{output_dir}search.pdf",
+              "kind":"bar",
+              "data":filter_counts,
+              "style":plot_style,
+              "ticklabels":[i.replace("_","\n").title() for i in filter_counts.index],
+              "rotation":45,
+              "headroom":8,
+              "xlabel":"Filtering Stage",
+              "ylabel":"# Articles"}]
+    ## Label Distributions
+    label_figures = [("platform_distribution", "platforms", "Platform"),
+                     ("task_distribution", "tasks", "Task"),
+                     ("language_dist", "languages", "Primary Language"),
+                     ("annot_dist", "annotation", "Annotation Mechanism")]
+    for key, name, ylabel in label_figures:
+        specs.append({"path":f"{plot_dir}{name}.pdf",
+                      "kind":"barh",
+                      "data":distributions[key],
+                      "style":dict(plot_style, figsize=(8,10), label_fontsize=20, tick_fontsize=12),
+                      "top":25,
+                      "xlabel":"# Datasets",
+                      "ylabel":ylabel})
+    ## Size Distributions
+    for level in ["document","individual"]:
+        specs.append({"path":f"{plot_dir}sizes_{level}.pdf",
+                      "kind":"hist",
+                      "data":{"Documents":distributions[f"{level}_annot_docs"],
+                              "Individuals":distributions[f"{level}_annot_inds"]},
+                      "style":dict(plot_style, label_fontsize=20),
+                      "xlabel":"log10(Size)",
+                      "ylabel":"# Datasets"})
+    return render_figures(specs)
+
+###################
+### Execute
+###################
 
+def main(changed=None):
+    """
+    Run every stage of the analysis. Memoized stages only re-execute when
+    their inputs or parameters change.
+
+    Args:
+        changed (collection of int or None): paper_ids added, removed or
+                                             edited since the last run, if
+                                             known (only the store partitions
+                                             holding them are rewritten)
+
+    Returns:
+        outputs (dict): Intermediate and final outputs of each stage
+    """
+    ## Load and Normalize
+    raw_df = load_stage(DATA_DIR)
+    with stage("snapshot"):
+        _ = take_snapshot(raw_df, snapshot_dir=SNAPSHOT_DIR)
+    data_df = normalize_stage(raw_df)
+    with stage("store"):
+        _ = write_store(data_df, STORE_DIR, changed=changed)
+    duplicates = dedup_stage(data_df)
+    ## Filter
+    filter_config = load_filter_config(FILTER_CONFIG)
+    filtered = filter_stage(data_df, filter_config)
+    with stage("database"):
+        _ = write_database(data_df, {"review":filtered["review_df"], "available":filtered["available_df"]}, DATABASE_PATH)
+    ## Distributions
+    distributions = distributions_stage(filtered["review_df"])
+    ## Tables
+    latex_df = tables_stage(filtered["available_df"])
+    with stage("export"):
+        export_paths = export_catalog(filtered["available_df"], latex_df, EXPORT_DIR, prefix="available_datasets")
+    ## Figures
+    figure_paths = figures_stage(filtered["filter_counts"], distributions, PLOT_STYLE, DATA_DIR, PLOT_DIR)
+    ## Gather Outputs
+    outputs = {"data_df":data_df,
+               "latex_df":latex_df,
+               "export_paths":export_paths,
+               "figure_paths":figure_paths}
+    outputs.update(duplicates)
+    outputs.update(filtered)
+    outputs.update(distributions)
+    return outputs
+
+def parse_command_line():
+    """
+
+    """
+    parser = argparse.ArgumentParser(description="Summary statistics for the CLPsych 2021 review")
+    parser.add_argument("--profile", action="store_true", default=False, help="Report wall/CPU time and peak memory of each stage")
+    parser.add_argument("--profile-dump", action="store_true", default=False, help="Also write a cProfile dump of the slowest stage")
+    args = parser.parse_args()
+    return args
+
+if __name__ == "__main__":
+    args = parse_command_line()
+    if args.profile or args.profile_dump or PROFILE_ENABLED:
+        enable_profiling("statistics", dump=True if args.profile_dump else None)
+    _ = main()
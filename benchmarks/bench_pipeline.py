@@ -0,0 +1,348 @@
+"""
+Benchmarks for the catalog tooling on synthetic standardized catalogs.
+
+Run from the root directory of the repository:
+
+    pytest benchmarks/bench_pipeline.py --benchmark-only
+
+Catalog sizes can be restricted with MHD_BENCH_SIZES (e.g. "1000,100000").
+Peak memory (tracemalloc) of each stage is stored in the benchmark's
+extra_info and shows up in --benchmark-json output.
+"""
+
+###################
+### Imports
+###################
+
+## Standard Libraries
+import os
+import sys
+import inspect
+import itertools
+import tracemalloc
+import importlib.util
+
+## External Libraries
+import pytest
+import numpy as np
+import pandas as pd
+from tabulate import tabulate
+
+## Local
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from benchmarks.synthetic import generate_catalog
+import excel_to_markdown
+from mhd.sizes import parse_sizes, sum_sizes
+from mhd.encoding import multi_hot_encode, label_counts
+from mhd.filters import load_filter_config, build_filter_masks, select_stage
+from mhd.query import CatalogIndex
+from mhd.markdown import format_cell, scan_rows, write_table
+from mhd.summary import summarize_sizes, summary_table
+from mhd.dedup import MAX_BUCKET_SIZE, find_duplicates
+from mhd.database import write_database, read_distribution
+from mhd.store import write_store, load_store, store_files, slice_distribution
+from mhd.snapshots import take_snapshot, diff_snapshots
+from mhd.watch import diff_rows
+from mhd.ingest import known_vocabularies, normalize_submissions
+from mhd.labels import AVAILABILITY_LABELS
+
+###################
+### Globals
+###################
+
+## Catalog Sizes
+SIZES = [int(i) for i in os.environ.get("MHD_BENCH_SIZES", "1000,100000,1000000").split(",")]
+
+## Root of the Repository
+ROOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+## Rounds per Size (Large Catalogs Run Once)
+ROUNDS = lambda n: 5 if n <= 1000 else 1
+
+###################
+### Fixtures
+###################
+
+def _load_statistics():
+    """
+    Import analysis/statistics.py without shadowing the standard library module.
+    """
+    spec = importlib.util.spec_from_file_location("analysis_statistics", os.path.join(ROOT_DIR, "analysis", "statistics.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+@pytest.fixture(scope="session")
+def statistics():
+    return _load_statistics()
+
+@pytest.fixture(scope="session")
+def filter_config():
+    return load_filter_config(os.path.join(ROOT_DIR, "analysis", "configs", "clpsych2021.json"))
+
+@pytest.fixture(scope="session", params=SIZES, ids=lambda n: f"n={n}")
+def catalog(request):
+    return generate_catalog(request.param)
+
+@pytest.fixture(scope="session")
+def normalized(catalog, statistics):
+    return inspect.unwrap(statistics.normalize_stage)(catalog)
+
+###################
+### Helpers
+###################
+
+def run_benchmark(benchmark, func, *args):
+    """
+    Record peak traced memory for one call, then time the function.
+    """
+    tracemalloc.start()
+    func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    benchmark.extra_info["peak_memory_mb"] = peak / 1e6
+    rounds = ROUNDS(len(args[0]))
+    return benchmark.pedantic(func, args=args, rounds=rounds, iterations=1)
+
+def original_source_check_rowwise(row):
+    """
+    Row-wise reference implementation (DataFrame.apply(axis=1)).
+    """
+    return row["paper_id"] in row["source_ids"]
+
+def get_clean_reference_rowwise(row):
+    """
+    Row-wise reference implementation (DataFrame.apply(axis=1)).
+    """
+    authors = row["authors"].split(", ")
+    if len(authors) == 1:
+        authors = authors[0]
+    elif len(authors) == 2:
+        authors = " & ".join(authors)
+    elif len(authors) == 3:
+        authors = ", ".join(authors[:-1]) + ", & " + authors[-1]
+    else:
+        authors = authors[0] + " et al."
+    return "{} ({})".format(authors, row["year"])
+
+def format_readme_rowwise(df):
+    """
+    Row-wise reference implementation of the README cell formatting (cell
+    by cell map and DataFrame.apply(axis=1), as excel_to_markdown.py did
+    before it was vectorized).
+    """
+    df = df.copy()
+    newline_replace = lambda x: x.replace("\n","<br/>") if not isinstance(x, float) else x
+    strip_space = lambda x: x.strip() if not isinstance(x, float) else x
+    for col in ["Paper","Authors","Platform","Target Outcomes","Reference Link"]:
+        df[col] = df[col].astype(object).map(newline_replace).map(strip_space)
+    df["Paper"] = df.apply(lambda row: "[{}]({})".format(row["Paper"], row["Reference Link"]), axis=1)
+    return df[excel_to_markdown.col_subset]
+
+###################
+### Benchmarks
+###################
+
+def test_sum_sizes(benchmark, catalog):
+    benchmark.group = "sizes"
+    ## Same Path as mhd.schema.to_compact (One Parse, Then Summation)
+    run_benchmark(benchmark, lambda sizes: sum_sizes(parse_sizes(sizes), sizes.index), catalog["n_documents"])
+
+def test_normalize_stage(benchmark, catalog, statistics):
+    benchmark.group = "normalize"
+    run_benchmark(benchmark, inspect.unwrap(statistics.normalize_stage), catalog)
+
+def test_original_source_rowwise(benchmark, normalized):
+    benchmark.group = "original_source"
+    run_benchmark(benchmark, lambda df: df.apply(original_source_check_rowwise, axis=1), normalized)
+
+def test_original_source_vectorized(benchmark, normalized, statistics):
+    benchmark.group = "original_source"
+    result = run_benchmark(benchmark, statistics.original_source_check, normalized)
+    expected = normalized.apply(original_source_check_rowwise, axis=1)
+    assert (result.values == expected.values).all()
+
+def test_references_rowwise(benchmark, catalog):
+    benchmark.group = "references"
+    run_benchmark(benchmark, lambda df: df.apply(get_clean_reference_rowwise, axis=1), catalog)
+
+def test_references_vectorized(benchmark, catalog, statistics):
+    benchmark.group = "references"
+    result = run_benchmark(benchmark, statistics.get_clean_reference, catalog)
+    expected = catalog.apply(get_clean_reference_rowwise, axis=1)
+    assert result.tolist() == expected.tolist()
+
+def test_multi_hot(benchmark, normalized):
+    benchmark.group = "multi_hot"
+    run_benchmark(benchmark, lambda x: label_counts(*multi_hot_encode(x)), normalized["tasks"])
+
+def test_filter_masks(benchmark, normalized, filter_config):
+    benchmark.group = "filters"
+    run_benchmark(benchmark, build_filter_masks, normalized, filter_config)
+
+def test_filter_select(benchmark, normalized, filter_config):
+    benchmark.group = "filters"
+    masks = build_filter_masks(normalized, filter_config)
+    run_benchmark(benchmark, lambda df: select_stage(df, masks, filter_config, "available"), normalized)
+
+def test_catalog_index(benchmark, catalog):
+    benchmark.group = "query"
+    run_benchmark(benchmark, CatalogIndex, catalog)
+
+def test_catalog_query(benchmark, catalog):
+    benchmark.group = "query"
+    index = CatalogIndex(catalog)
+    criteria = {"task":"depression", "platform":["reddit","twitter"], "min_year":2015}
+    ids = run_benchmark(benchmark, lambda df: index.query_ids(**criteria), catalog)
+    has_label = lambda col, labels: catalog[col].astype(object).str.split(", ").map(lambda x: isinstance(x, list) and len(set(x) & set(labels)) > 0)
+    expected = has_label("tasks", ["depression"]) & has_label("platforms", ["reddit","twitter"]) & (catalog["year"] >= 2015)
+    assert ids == np.flatnonzero(expected.values).tolist()
+
+def test_size_summary_streaming(benchmark, normalized):
+    benchmark.group = "size_summary"
+    run_benchmark(benchmark, lambda df: summary_table(summarize_sizes(df, chunksize=100000)), normalized)
+
+def test_size_summary_sorted(benchmark, normalized):
+    benchmark.group = "size_summary"
+    def sorted_summary(df):
+        return dict((level, df.loc[df["annotation_level"] == level, ["n_documents_total","n_individuals_total"]].apply(lambda s: s.sort_values().dropna().describe()))
+                    for level in df["annotation_level"].dropna().unique())
+    run_benchmark(benchmark, sorted_summary, normalized)
+
+def test_dedup(benchmark, catalog):
+    benchmark.group = "dedup"
+    ## Synthetic Titles Share a Small Vocabulary, So Near-Duplicates Are Far Denser Than in Real Catalogs
+    if len(catalog) > 100000:
+        pytest.skip("Synthetic titles are too repetitive for deduplication beyond 100k rows")
+    run_benchmark(benchmark, find_duplicates, catalog)
+
+def test_dedup_oversized_bucket(catalog):
+    ## Copies of One Paper Fill an LSH Bucket Far Beyond MAX_BUCKET_SIZE
+    copies = catalog.iloc[[0] * 3 * MAX_BUCKET_SIZE].assign(paper_id=np.arange(3 * MAX_BUCKET_SIZE) + len(catalog) + 1)
+    _, clusters = find_duplicates(pd.concat([catalog.iloc[:1000], copies], ignore_index=True))
+    members = clusters.loc[clusters["paper_id"].isin(copies["paper_id"])]
+    assert len(members) == len(copies) and members["cluster"].nunique() == 1
+
+def test_database_write(benchmark, normalized, tmp_path):
+    benchmark.group = "database"
+    paths = (str(tmp_path / f"catalog_{i}.sqlite") for i in itertools.count())
+    run_benchmark(benchmark, lambda df: write_database(df, db_path=next(paths)), normalized)
+
+def test_store_partial_write(benchmark, normalized, tmp_path):
+    benchmark.group = "store"
+    partial_dir, full_dir = str(tmp_path / "partial"), str(tmp_path / "full")
+    _ = write_store(normalized, partial_dir)
+    edited = normalized.copy()
+    edited.loc[edited.index[:10], "year"] = 1999
+    edited.loc[edited.index[10:20], "title"] = "edited"
+    changed = set(edited["paper_id"].iloc[:20])
+    ## Alternate Versions So Every Round Rewrites the Affected Partitions
+    versions = itertools.cycle([edited, normalized])
+    run_benchmark(benchmark, lambda df: write_store(next(versions), partial_dir, changed=changed), edited)
+    _ = write_store(edited, partial_dir, changed=changed)
+    _ = write_store(edited, full_dir)
+    pd.testing.assert_frame_equal(load_store(partial_dir), load_store(full_dir))
+
+def test_store_slice_full_scan(benchmark, normalized, tmp_path):
+    benchmark.group = "store_slice"
+    store_dir = str(tmp_path / "store")
+    _ = write_store(normalized, store_dir)
+    def full_scan(df):
+        loaded = load_store(store_dir)
+        in_slice = loaded.loc[loaded["year"].between(2015, 2016) & (loaded["primary_platform"] == "twitter"), "tasks"]
+        return label_counts(*multi_hot_encode(in_slice))
+    benchmark.extra_info["files_read"] = len(store_files(store_dir))
+    run_benchmark(benchmark, full_scan, normalized)
+
+def test_store_slice_pushdown(benchmark, normalized, tmp_path):
+    benchmark.group = "store_slice"
+    store_dir = str(tmp_path / "store")
+    _ = write_store(normalized, store_dir)
+    predicates = {"min_year":2015, "max_year":2016, "platforms":["twitter"]}
+    benchmark.extra_info["files_read"] = len(store_files(store_dir, **predicates))
+    counts = run_benchmark(benchmark, lambda df: slice_distribution("tasks", store_dir, **predicates), normalized)
+    ## Only the Matching Partitions Are Opened
+    assert 0 < benchmark.extra_info["files_read"] < len(store_files(store_dir))
+    in_slice = normalized.loc[normalized["year"].between(2015, 2016) & (normalized["primary_platform"] == "twitter"), "tasks"]
+    assert counts.sort_index().to_dict() == label_counts(*multi_hot_encode(in_slice)).sort_index().to_dict()
+
+def test_diff_rows_repeated_keys(catalog):
+    ## Two Rows Share a Key; Only the Second Is Edited
+    old = pd.concat([catalog.iloc[:100], catalog.iloc[[0]]], ignore_index=True)
+    new = old.copy()
+    new.loc[100, "tasks"] = "anxiety"
+    diff = diff_rows(old, new, ["title","year"])
+    assert diff["changed"] == [(old.loc[0, "title"], old.loc[0, "year"], 1)] and diff["columns"] == ["tasks"]
+    assert diff["added"] == [] and diff["removed"] == []
+
+def test_distributions_pandas(benchmark, normalized):
+    benchmark.group = "distributions"
+    run_benchmark(benchmark, lambda df: (label_counts(*multi_hot_encode(df["tasks"])), df["primary_language"].value_counts()), normalized)
+
+def test_distributions_sqlite(benchmark, normalized, tmp_path):
+    benchmark.group = "distributions"
+    db_path = str(tmp_path / "catalog.sqlite")
+    _ = write_database(normalized, db_path=db_path)
+    tasks, languages = run_benchmark(benchmark, lambda df: (read_distribution("task_distribution", db_path=db_path), read_distribution("language_distribution", db_path=db_path)), normalized)
+    assert tasks.sort_index().to_dict() == label_counts(*multi_hot_encode(normalized["tasks"])).sort_index().to_dict()
+    assert languages.sort_index().to_dict() == normalized["primary_language"].value_counts().sort_index().to_dict()
+
+def test_snapshot_diff(benchmark, catalog, tmp_path):
+    benchmark.group = "snapshots"
+    snapshot_dir = str(tmp_path / "snapshots")
+    edited = catalog.drop(index=catalog.index[:5])
+    edited.loc[edited.index[:10], "tasks"] = "anxiety"
+    _ = take_snapshot(catalog, snapshot_dir=snapshot_dir)
+    _ = take_snapshot(edited, snapshot_dir=snapshot_dir)
+    result = run_benchmark(benchmark, lambda df: diff_snapshots(0, 1, snapshot_dir), catalog)
+    assert len(result["removed"]) == 5 and len(result["added"]) == 0
+    assert set(result["changed"]["columns"]) <= {"tasks"}
+
+def test_ingest_normalize(benchmark, catalog):
+    benchmark.group = "ingest"
+    free_text = lambda col: catalog[col].str.replace("_", " ").str.title()
+    submissions = catalog[["title","authors","year","reference_link"]].assign(
+        platforms=free_text("platforms"),
+        tasks=free_text("tasks"),
+        annotation_style=free_text("annotation_style"),
+        annotation_level=free_text("annotation_level"),
+        primary_language=free_text("primary_language"),
+        availability=catalog["availability"].map(AVAILABILITY_LABELS),
+        size=catalog["paper_id"].map(lambda i: f"{i:,} users ({i * 10:,} posts)"),
+    )
+    vocabularies = known_vocabularies(catalog)
+    rows, errors = run_benchmark(benchmark, lambda df: normalize_submissions(df, vocabularies), submissions)
+    assert len(errors.loc[errors["severity"] == "error"]) == 0
+    for col in ["platforms","tasks","annotation_style","annotation_level","primary_language","availability"]:
+        assert rows[col].fillna("").tolist() == catalog[col].fillna("").tolist()
+
+def test_readme_formatting_matches_rowwise():
+    raw_df = excel_to_markdown.load_raw_catalog(os.path.join(ROOT_DIR, "data_sources.xlsx"))
+    edge_cases = raw_df.head(4).copy()
+    edge_cases["Paper"] = ["  Padded title \n", "Line\nbreaks\nhere", "Title", "Title"]
+    edge_cases.loc[edge_cases.index[2], ["Authors","Target Outcomes"]] = float("nan")
+    edge_cases.loc[edge_cases.index[3], "Reference Link"] = float("nan")
+    df = pd.concat([raw_df, edge_cases], ignore_index=True)
+    expected = format_readme_rowwise(df)
+    assert list(excel_to_markdown.format_columns(df.head(1)).columns) == list(expected.columns)
+    ## Small Chunks So Rows Straddle Chunk Boundaries
+    rows = list(excel_to_markdown.iter_rows(df, chunksize=7))
+    assert len(rows) == len(expected)
+    for row, expected_row in zip(rows, expected.itertuples(index=False, name=None)):
+        assert [format_cell(c) for c in row] == [format_cell(c) for c in expected_row]
+
+def test_render_streaming(benchmark, catalog):
+    benchmark.group = "render"
+    columns = ["title","authors","platforms","year","tasks"]
+    numeric = [False, False, False, True, False]
+    def render(df):
+        rows = lambda: df[columns].itertuples(index=False, name=None)
+        _, widths = scan_rows(rows(), columns)
+        with open(os.devnull, "w") as the_file:
+            write_table(the_file, rows(), columns, widths, numeric)
+    run_benchmark(benchmark, render, catalog)
+
+def test_render_tabulate(benchmark, catalog):
+    benchmark.group = "render"
+    columns = ["title","authors","platforms","year","tasks"]
+    run_benchmark(benchmark, lambda df: tabulate(df[columns], tablefmt="pipe", headers="keys", showindex="never"), catalog)
@@ -0,0 +1,123 @@
+"""
+Startup regression checks for the catalog scripts, based on `python -X importtime`.
+
+Run from the root directory of the repository:
+
+    pytest benchmarks/bench_startup.py --benchmark-only
+
+Light paths (command line help, an up-to-date README) must not import pandas,
+matplotlib or tabulate, and their total import time must stay under
+MHD_STARTUP_BUDGET_MS (default 150 ms; pandas alone costs roughly 500 ms).
+"""
+
+###################
+### Imports
+###################
+
+## Standard Libraries
+import os
+import sys
+import shutil
+import subprocess
+
+## External Libraries
+import pytest
+
+###################
+### Globals
+###################
+
+## Root of the Repository
+ROOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+## Total Import Time Allowed on Light Paths (Milliseconds)
+STARTUP_BUDGET_MS = float(os.environ.get("MHD_STARTUP_BUDGET_MS", "150"))
+
+## Libraries Only Stages That Need Them May Import
+HEAVY_MODULES = ["pandas", "matplotlib", "tabulate"]
+
+###################
+### Helpers
+###################
+
+def import_times(args, cwd=ROOT_DIR):
+    """
+    Run a Python command under -X importtime.
+
+    Args:
+        args (list of str): Interpreter arguments (e.g. ["-m", "mhd", "--help"])
+        cwd (str): Working directory
+
+    Returns:
+        modules (dict): Imported module -> cumulative import time (us)
+        total_ms (float): Summed cumulative time of top-level imports
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime"] + args,
+                            cwd=cwd,
+                            capture_output=True,
+                            text=True)
+    assert result.returncode == 0, result.stderr
+    modules, total = {}, 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = int(cumulative)
+        if not name[1:].startswith(" "):
+            total += int(cumulative)
+    return modules, total / 1000
+
+def assert_light(modules, total_ms):
+    """
+    Check that no heavy library was imported and the import budget holds.
+    """
+    heavy = [m for m in HEAVY_MODULES if m in modules]
+    assert len(heavy) == 0, f"Heavy modules imported on a light path: {heavy}"
+    assert total_ms <= STARTUP_BUDGET_MS, f"Import time {total_ms:.1f} ms exceeds {STARTUP_BUDGET_MS:.0f} ms"
+
+@pytest.fixture(scope="module")
+def readme_workspace(tmp_path_factory):
+    """
+    Copy of the README renderer and raw catalog with a freshly rendered README.
+    """
+    workspace = tmp_path_factory.mktemp("readme")
+    shutil.copy(os.path.join(ROOT_DIR, "excel_to_markdown.py"), workspace)
+    shutil.copy(os.path.join(ROOT_DIR, "data_sources.xlsx"), workspace)
+    shutil.copytree(os.path.join(ROOT_DIR, "mhd"), workspace / "mhd", ignore=shutil.ignore_patterns("__pycache__"))
+    _ = subprocess.run([sys.executable, "excel_to_markdown.py"], cwd=workspace, check=True, capture_output=True)
+    return str(workspace)
+
+###################
+### Benchmarks
+###################
+
+def test_cli_help_startup(benchmark):
+    modules, total_ms = import_times(["-m", "mhd", "--help"])
+    assert_light(modules, total_ms)
+    benchmark.extra_info["import_ms"] = total_ms
+    benchmark.pedantic(subprocess.run,
+                       args=([sys.executable, "-m", "mhd", "--help"],),
+                       kwargs={"cwd":ROOT_DIR, "capture_output":True},
+                       rounds=5,
+                       iterations=1)
+
+def test_readme_up_to_date_startup(benchmark, readme_workspace):
+    modules, total_ms = import_times(["excel_to_markdown.py"], cwd=readme_workspace)
+    assert_light(modules, total_ms)
+    benchmark.extra_info["import_ms"] = total_ms
+    benchmark.pedantic(subprocess.run,
+                       args=([sys.executable, "excel_to_markdown.py"],),
+                       kwargs={"cwd":readme_workspace, "capture_output":True},
+                       rounds=5,
+                       iterations=1)
+
+def test_query_import_defers_tabulate():
+    modules, _ = import_times(["-c", "import mhd.query"])
+    assert "tabulate" not in modules
+
+def test_statistics_import_defers_plotting():
+    code = ("import importlib.util; "
+            "spec = importlib.util.spec_from_file_location('analysis_statistics', 'analysis/statistics.py'); "
+            "spec.loader.exec_module(importlib.util.module_from_spec(spec))")
+    modules, _ = import_times(["-c", code])
+    assert "matplotlib" not in modules and "tabulate" not in modules
@@ -0,0 +1,182 @@
+###################
+### Imports
+###################
+
+## Standard Libraries
+import os
+import sys
+
+## External Libraries
+import pandas as pd
+import numpy as np
+
+## Local
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from mhd.catalog import load_catalog
+
+###################
+### Globals
+###################
+
+## Reference Catalog Used to Estimate Label Frequencies
+REFERENCE_CATALOG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "supplemental_data", "data_sources_standardized.xlsx")
+
+## Set-Valued Columns
+SET_COLUMNS = ["platforms","tasks","annotation_style"]
+
+## Single-Valued Categorical Columns
+CATEGORICAL_COLUMNS = ["annotation_level","availability","primary_language"]
+
+## Vocabulary for Titles and Authors
+WORDS = ["depression","detection","social","media","language","mental","health","suicide","risk",
+         "twitter","reddit","users","deep","learning","analysis","posts","online","signals",
+         "early","prediction","corpus","dataset","linguistic","clinical","forum","model"]
+SURNAMES = ["Smith","Chen","Garcia","Kumar","Nguyen","Yates","Cohan","Dredze","Harman","Losada",
+            "Sekulic","Zhang","Wang","Park","Kim","Tanaka","Silva","Rossi","Muller","Novak"]
+
+###################
+### Vocabulary
+###################
+
+def estimate_vocabulary(reference_df):
+    """
+    Estimate label frequencies and labels-per-row distributions from a
+    reference standardized catalog.
+
+    Args:
+        reference_df (pandas DataFrame): Raw standardized catalog
+
+    Returns:
+        vocabulary (dict): Per-column labels, label probabilities, labels-per-row
+                           probabilities and missing-value rate
+    """
+    vocabulary = {}
+    for col in SET_COLUMNS + CATEGORICAL_COLUMNS:
+        values = reference_df[col].astype(object)
+        values = values.where(values != "na")
+        split = values.dropna().str.split(", ")
+        counts = split.explode().value_counts()
+        n_labels = split.map(len).value_counts(normalize=True).sort_index()
+        vocabulary[col] = {"labels":counts.index.tolist(),
+                           "p":(counts / counts.sum()).values,
+                           "n_labels":n_labels.index.values,
+                           "n_labels_p":n_labels.values,
+                           "missing_rate":values.isnull().mean()}
+    return vocabulary
+
+def _add_long_tail(vocab, n_extra, tail_mass, prefix):
+    """
+    Add rare synthetic labels (total probability tail_mass) to a vocabulary so
+    label cardinality grows with catalog size.
+    """
+    if n_extra == 0:
+        return vocab
+    vocab = dict(vocab)
+    vocab["labels"] = vocab["labels"] + [f"{prefix}_{i}" for i in range(n_extra)]
+    vocab["p"] = np.concatenate([vocab["p"] * (1 - tail_mass), np.ones(n_extra) * tail_mass / n_extra])
+    return vocab
+
+###################
+### Generation
+###################
+
+def _sample_sets(rng, vocab, n_rows):
+    """
+
+    """
+    labels = np.array(vocab["labels"], dtype=object)
+    n_labels = rng.choice(vocab["n_labels"], size=n_rows, p=vocab["n_labels_p"])
+    max_labels = int(n_labels.max())
+    draws = rng.choice(len(labels), size=(n_rows, max_labels), p=vocab["p"])
+    values = []
+    for k, row in zip(n_labels, draws):
+        values.append(", ".join(labels[np.unique(row[:k])]))
+    values = pd.Series(values, dtype=object)
+    values[rng.random(n_rows) < vocab["missing_rate"]] = np.nan
+    return values
+
+def _sample_categorical(rng, vocab, n_rows):
+    """
+
+    """
+    values = pd.Series(rng.choice(np.array(vocab["labels"], dtype=object), size=n_rows, p=vocab["p"]), dtype=object)
+    values[rng.random(n_rows) < vocab["missing_rate"]] = np.nan
+    return values
+
+def _sample_sizes(rng, tasks, n_rows, missing_rate):
+    """
+    Size strings such as "depression (9.3k), control (476)".
+    """
+    counts = np.round(rng.lognormal(mean=7, sigma=2, size=n_rows), 0).astype(int)
+    use_k = counts >= 1000
+    values = []
+    for task_str, c, k in zip(tasks, counts, use_k):
+        if not isinstance(task_str, str):
+            values.append("na")
+            continue
+        count_str = "{:.1f}k".format(c / 1000) if k else str(c)
+        entries = [f"{t} ({count_str})" for t in task_str.split(", ")]
+        entries.append(f"control ({count_str})")
+        values.append(", ".join(entries))
+    values = pd.Series(values, dtype=object)
+    values[rng.random(n_rows) < missing_rate] = np.nan
+    return values
+
+def generate_catalog(n_rows,
+                     seed=42,
+                     reference_df=None,
+                     long_tail=True,
+                     reuse_rate=0.2):
+    """
+    Generate a synthetic standardized catalog shaped like
+    data_sources_standardized.xlsx.
+
+    Args:
+        n_rows (int): Number of papers
+        seed (int): Random seed
+        reference_df (pandas DataFrame or None): Catalog used to estimate label
+                                                 frequencies (default: the
+                                                 repository's standardized sheet)
+        long_tail (bool): If True, add ~sqrt(n_rows) rare labels to each set-valued
+                          column so cardinality grows with catalog size
+        reuse_rate (float): Fraction of papers that reuse an earlier dataset
+
+    Returns:
+        catalog_df (pandas DataFrame): Synthetic catalog with raw (unparsed) values
+    """
+    rng = np.random.default_rng(seed)
+    if reference_df is None:
+        reference_df = load_catalog(REFERENCE_CATALOG)
+    vocabulary = estimate_vocabulary(reference_df)
+    n_extra = int(np.sqrt(n_rows)) if long_tail else 0
+    ## Identifiers, Titles, Authors, Years
+    paper_ids = np.arange(1, n_rows + 1)
+    title_words = rng.choice(np.array(WORDS, dtype=object), size=(n_rows, 6))
+    n_authors = rng.integers(1, 7, size=n_rows)
+    author_draws = rng.choice(np.array(SURNAMES, dtype=object), size=(n_rows, 6))
+    catalog_df = pd.DataFrame({
+        "paper_id":paper_ids,
+        "title":[" ".join(w).title() for w in title_words],
+        "authors":[", ".join(a[:k]) for a, k in zip(author_draws, n_authors)],
+        "year":rng.integers(2012, 2022, size=n_rows),
+    })
+    ## Set-Valued and Categorical Labels
+    for col in SET_COLUMNS:
+        vocab = _add_long_tail(vocabulary[col], n_extra, 0.05, f"synthetic_{col}")
+        catalog_df[col] = _sample_sets(rng, vocab, n_rows)
+    catalog_df.loc[catalog_df["platforms"].isnull(), "platforms"] = "twitter"
+    for col in CATEGORICAL_COLUMNS:
+        catalog_df[col] = _sample_categorical(rng, vocabulary[col], n_rows)
+    catalog_df.loc[catalog_df["annotation_level"].isnull(), "annotation_level"] = "individual"
+    catalog_df.loc[catalog_df["primary_language"].isnull(), "primary_language"] = "english"
+    ## Sizes
+    catalog_df["n_individuals"] = _sample_sizes(rng, catalog_df["tasks"], n_rows, 0.1)
+    catalog_df["n_documents"] = _sample_sizes(rng, catalog_df["tasks"], n_rows, 0.3)
+    catalog_df["n_conversations"] = "na"
+    ## Sources (Reuse of Earlier Datasets)
+    reuse = (rng.random(n_rows) < reuse_rate) & (paper_ids > 1)
+    sources = np.where(reuse, rng.integers(1, np.maximum(paper_ids, 2)), paper_ids)
+    catalog_df["source_ids"] = pd.Series(sources).astype(str).values
+    catalog_df["reference_link"] = [f"https://example.org/paper/{i}" for i in paper_ids]
+    catalog_df = catalog_df[reference_df.columns.tolist()]
+    return catalog_df
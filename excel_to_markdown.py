@@ -1,32 +1,37 @@
-
 ## Imports
-import pandas as pd
-from tabulate import tabulate
+import os
+import sys
+import hashlib
+import argparse
 from datetime import datetime
-
-## Read Data
-df = pd.read_excel("data_sources.xlsx")
-
-## Format Cells
-newline_replace = lambda x: x.replace("\n","<br/>") if not isinstance(x, float) else x
-strip_space = lambda x: x.strip() if not isinstance(x, float) else x
-columns_to_format = ["Paper",
-                     "Authors",
-                     "Platform",
-                     "Target Outcomes",
-                     "Labeling Methodology",
-                     "Size",
-                     "Availability",
-                     "Additional Comments",
-                     "Dataset Link (if any)",
-                     "Reference Link"]
-for col in columns_to_format:
-    df[col] = df[col].map(newline_replace)
-    df[col] = df[col].map(strip_space)
-
-## Link in Title
-title_formatter = lambda row: "[{}]({})".format(row["Paper"], row["Reference Link"])
-df["Paper"] = df.apply(title_formatter, axis = 1)
+from mhd.catalog import hash_file
+from mhd.profiling import PROFILE_ENABLED, enable_profiling, stage
+from mhd.markdown import (WRITE_BUFFER,
+                          hash_content,
+                          load_manifest,
+                          write_manifest,
+                          scan_rows,
+                          write_table,
+                          load_existing_table,
+                          splice_table)
+
+## Globals
+CATALOG_PATH = "data_sources.xlsx"
+README_PATH = "README.md"
+## Row Hash Sidecar (Local State, Ignored by Git; Without It the Rendered
+## README Is Compared Against the Existing One Before Replacing It)
+MANIFEST_PATH = ".readme_manifest.json"
+
+## pandas and the Catalog Schema Are Imported by the Functions That Need Them,
+## So an Up-to-Date README Is Detected Without Loading Either
+
+## Cell Formatters
+newline_replace = lambda x: x.str.replace("\n","<br/>", regex=False)
+strip_space = lambda x: x.str.strip()
+format_text = lambda x: strip_space(newline_replace(x.astype(object).where(x.isnull(), x.astype(str))))
+
+## Rows Formatted at a Time While Streaming
+FORMAT_CHUNK = 10000
 
 ## Subset Columns
 col_subset = ["Paper",
@@ -34,17 +39,34 @@ col_subset = ["Paper",
               "Platform",
               "Year",
               "Target Outcomes"]
-df = df[col_subset].copy()
-
-## Sort by Date
-df = df.sort_values("Year", ascending=False)
-df = df.reset_index(drop=True)
 
-## Generate Markdown Table
-md_table = tabulate(df, tablefmt="pipe", headers="keys", showindex="never")
-
-## Output
-md_output = """
+def format_columns(df):
+    """
+    Format cells column by column (title linked to its reference via string
+    concatenation over columns).
+    """
+    import pandas as pd
+    formatted = pd.DataFrame({
+        "Paper":"[" + format_text(df["Paper"]).fillna("nan") + "](" + format_text(df["Reference Link"]).fillna("nan") + ")",
+        "Authors":format_text(df["Authors"]),
+        "Platform":format_text(df["Platform"]),
+        "Year":df["Year"],
+        "Target Outcomes":format_text(df["Target Outcomes"]),
+    })
+    return formatted
+
+def iter_rows(df, chunksize=FORMAT_CHUNK):
+    """
+    Yield formatted rows, formatting one chunk of the catalog at a time so
+    memory for formatted cells stays flat as the catalog grows.
+    """
+    for start in range(0, len(df), chunksize):
+        formatted = format_columns(df.iloc[start:start+chunksize])
+        for row in formatted.itertuples(index=False, name=None):
+            yield list(row)
+
+## Template
+md_header = """
 # Mental Health Datasets
 
 The information below is an evolving list of data sets (primarily from electronic/social media) that have been used to model mental-health phenomena. The raw data (with additional columns) can be found in `data_sources.xlsx`. If you are an author of any of these papers and feel that anything is misrepresented, please do not hesitate to reach out to me at kharrigian@jhu.edu.
@@ -67,12 +89,157 @@ We hope this repository becomes the central knowledge base for researchers worki
 You can view our backlog of literature that needs annotation [here](https://docs.google.com/spreadsheets/d/1KI-LlcTw5YCS0iuPEkCUD29z0XdZnqw91iWxyY8Y-jw/edit?usp=sharing). To annotate one of these papers, or to annotate a paper we haven't yet identified, please begin by updating the backlog to note that you are taking responsibility for a paper's annotation. After, you can use our [standardized annotation form](https://docs.google.com/forms/d/e/1FAIpQLSfgN5pPivsNvWBsO3YZBx8H91nrBHTd0bWI2Ao1X9KPhlUWsQ/viewform?usp=sf_link) to make a submission that will be reviewed and published within the main directory.
 
 ## Dataset Directory
-"""+"""
+"""
+md_template = """
 **Last Update**: {}
 
-{}
-""".format(datetime.now().isoformat(), md_table)
-
-## Write Out
-with open("README.md", "w") as the_file:
-    the_file.write(md_output)
\ No newline at end of file
+"""
+
+def source_hash(path=CATALOG_PATH):
+    """
+    Hash of everything the README is rendered from: the workbook, this
+    script (template and formatters) and the markdown writer.
+    """
+    import mhd.markdown
+    hasher = hashlib.sha256()
+    for source in [path, os.path.abspath(__file__), mhd.markdown.__file__]:
+        hasher.update(hash_file(source).encode("utf-8"))
+    return hasher.hexdigest()
+
+def readme_is_current(sources,
+                      readme_path=README_PATH,
+                      manifest_path=MANIFEST_PATH):
+    """
+    Whether the README was last rendered from the given sources (see
+    source_hash). Only files are hashed; the workbook is not parsed.
+    """
+    manifest = load_manifest(manifest_path)
+    if manifest is None or not os.path.exists(readme_path):
+        return False
+    return manifest.get("source_hash") == sources
+
+def _without_timestamp(path):
+    """
+    README lines other than the **Last Update** line.
+    """
+    with open(path, "r") as the_file:
+        return [line for line in the_file if not line.startswith("**Last Update**")]
+
+def load_raw_catalog(path=CATALOG_PATH):
+    """
+    Load and validate the raw catalog.
+    """
+    from mhd.catalog import load_catalog
+    from mhd.schema import RAW_SCHEMA, validate_catalog
+    with stage("load"):
+        df = load_catalog(path)
+    with stage("validate"):
+        _ = validate_catalog(df, RAW_SCHEMA, raise_errors=True)
+    return df
+
+def render_readme(df,
+                  incremental=False,
+                  readme_path=README_PATH,
+                  manifest_path=MANIFEST_PATH,
+                  sources=None):
+    """
+    Render the catalog to the README, skipping the write when no rendered
+    content has changed.
+
+    Args:
+        df (pandas DataFrame): Raw catalog
+        incremental (bool): Re-render only added/changed rows and splice them
+                            into the existing table (a full render is used
+                            if the column widths changed)
+        readme_path (str): Output README
+        manifest_path (str): Row hash manifest
+        sources (str or None): source_hash of the inputs, recorded in the
+                               manifest for readme_is_current
+
+    Returns:
+        written (bool): Whether the README was rewritten
+    """
+    import pandas as pd
+
+    ## Subset Columns and Sort by Date
+    df = df[col_subset + ["Reference Link"]]
+    numeric = [pd.api.types.is_numeric_dtype(df[col]) for col in col_subset]
+    df = df.sort_values("Year", ascending=False)
+    df = df.reset_index(drop=True)
+
+    ## First Pass: Row Hashes and Column Widths (Cells Formatted Chunk by Chunk)
+    with stage("scan"):
+        row_hashes, widths = scan_rows(iter_rows(df), col_subset)
+
+    ## Check for Changes (Skip Write if Content Unchanged)
+    content_hash = hash_content(row_hashes, md_header + md_template, col_subset)
+    manifest = load_manifest(manifest_path)
+    if manifest is not None and manifest["content_hash"] == content_hash and os.path.exists(readme_path):
+        if sources is not None and manifest.get("source_hash") != sources:
+            write_manifest(manifest_path, content_hash, col_subset, manifest["rows"], sources, widths)
+        return False
+
+    ## Existing Table Rows (Incremental Mode)
+    existing = None
+    if incremental and manifest is not None:
+        existing = load_existing_table(readme_path, manifest, col_subset, widths)
+
+    ## Second Pass: Stream Output Row by Row
+    tmp_path = readme_path + ".tmp"
+    with stage("render"), open(tmp_path, "w", buffering=WRITE_BUFFER) as the_file:
+        the_file.write(md_header)
+        the_file.write(md_template.format(datetime.now().isoformat()))
+        if existing is None:
+            write_table(the_file, iter_rows(df), col_subset, widths, numeric)
+        else:
+            splice_table(the_file, iter_rows(df), row_hashes, existing, widths, numeric)
+        the_file.write("\n")
+    ## Without a Manifest (e.g. a Fresh Checkout), Keep an Identical README
+    unchanged = manifest is None and os.path.exists(readme_path) and _without_timestamp(tmp_path) == _without_timestamp(readme_path)
+    if unchanged:
+        os.remove(tmp_path)
+    else:
+        os.replace(tmp_path, readme_path)
+    write_manifest(manifest_path, content_hash, col_subset, row_hashes, sources, widths)
+    return not unchanged
+
+def parse_command_line():
+    """
+
+    """
+    parser = argparse.ArgumentParser(description="Render data_sources.xlsx to README.md")
+    parser.add_argument("--incremental",
+                        action="store_true",
+                        default=False,
+                        help="Re-render only added/changed rows and splice them into the existing table")
+    parser.add_argument("--profile",
+                        action="store_true",
+                        default=False,
+                        help="Report wall/CPU time and peak memory of each stage")
+    parser.add_argument("--profile-dump",
+                        action="store_true",
+                        default=False,
+                        help="Also write a cProfile dump of the slowest stage")
+    args = parser.parse_args()
+    return args
+
+def main():
+    """
+
+    """
+    args = parse_command_line()
+    if args.profile or args.profile_dump or PROFILE_ENABLED:
+        enable_profiling("excel_to_markdown", dump=True if args.profile_dump else None)
+    with stage("check"):
+        sources = source_hash(CATALOG_PATH)
+        current = readme_is_current(sources)
+    if current:
+        print("README is up to date. Skipping write.")
+        sys.exit(0)
+    df = load_raw_catalog(CATALOG_PATH)
+    if not render_readme(df, incremental=args.incremental, sources=sources):
+        print("README is up to date. Skipping write.")
+        sys.exit(0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+###################
+### Imports
+###################
+
+## Standard Libraries
+import sys
+import argparse
+
+## Local (Command Modules Are Imported by Each Command, So Building the
+## Parser and Printing Help Does Not Load pandas)
+from .config import CATALOG_PATH, RAW_CATALOG_PATH, INDEX_PATH, DATABASE_PATH, SNAPSHOT_DIR, STORE_DIR, INDEX_FIELDS
+
+###################
+### Commands
+###################
+
+def query(args):
+    """
+    Answer a catalog query from the command line.
+    """
+    from .query import CatalogIndex, format_results
+    index = CatalogIndex.from_workbook(args.catalog)
+    criteria = dict((field, getattr(args, field)) for field in INDEX_FIELDS)
+    results = index.query(min_year=args.min_year,
+                          max_year=args.max_year,
+                          min_individuals=args.min_individuals,
+                          min_documents=args.min_documents,
+                          **criteria)
+    sys.stdout.write(format_results(results, args.format) + "\n")
+
+def lineage(args):
+    """
+    Print the reuse lineage of a dataset.
+    """
+    from .catalog import load_catalog
+    from .lineage import build_lineage_index
+    catalog_df = load_catalog(args.catalog)
+    titles = catalog_df.set_index("paper_id")["title"]
+    index = build_lineage_index(catalog_df)
+    related = index.ancestors(args.paper_id) if args.upstream else index.descendants(args.paper_id)
+    direction = "Sources of" if args.upstream else "Papers reusing"
+    sys.stdout.write(f"{direction} [{args.paper_id}] {titles[args.paper_id]}:\n")
+    for paper_id, depth in sorted(related.items(), key=lambda x: (x[1], x[0])):
+        sys.stdout.write("{}[{}] {}\n".format("  " * depth, paper_id, titles[paper_id]))
+
+def search(args):
+    """
+    Ranked full-text search over the raw catalog's free-text columns.
+    """
+    from .query import format_results
+    from .search import search_catalog
+    results = search_catalog(" ".join(args.terms),
+                             catalog_path=args.catalog,
+                             index_path=args.index,
+                             limit=args.limit,
+                             match_all=args.all)
+    sys.stdout.write(format_results(results, args.format) + "\n")
+
+def dedup(args):
+    """
+    Report candidate duplicate papers and suggested source_ids corrections.
+    """
+    from .catalog import load_catalog
+    from .query import format_results
+    from .dedup import SIMILARITY_THRESHOLD, find_duplicates, suggest_source_ids
+    catalog_df = load_catalog(args.catalog)
+    threshold = args.threshold if args.threshold is not None else SIMILARITY_THRESHOLD
+    pairs, clusters = find_duplicates(catalog_df, threshold=threshold)
+    if args.format == "table":
+        sys.stdout.write(f"Candidate Duplicate Clusters ({clusters['cluster'].nunique()}):\n")
+        sys.stdout.write(format_results(clusters, args.format) + "\n")
+        sys.stdout.write("Suggested source_ids Corrections:\n")
+    sys.stdout.write(format_results(suggest_source_ids(catalog_df, clusters), args.format) + "\n")
+
+def sql(args):
+    """
+    Read an aggregate view (or run an ad-hoc query) against the catalog database.
+    """
+    from .query import format_results
+    from .database import VIEWS, read_view, read_sql
+    if args.query in VIEWS:
+        results = read_view(args.query, scope=args.scope, db_path=args.database)
+    else:
+        results = read_sql(args.query, db_path=args.database)
+    sys.stdout.write(format_results(results, args.format) + "\n")
+
+def distribution(args):
+    """
+    Label counts over a year, platform or language slice of the catalog store.
+    """
+    from .query import format_results
+    from .store import slice_distribution
+    counts = slice_distribution(args.column,
+                                store_dir=args.store,
+                                min_year=args.min_year,
+                                max_year=args.max_year,
+                                platforms=args.platform,
+                                languages=args.language)
+    sys.stdout.write(format_results(counts.rename_axis(args.column).reset_index(name="papers"), args.format) + "\n")
+
+def snapshot(args):
+    """
+    Store the current version of the catalog.
+    """
+    from .catalog import load_catalog
+    from .snapshots import take_snapshot
+    entry, created = take_snapshot(load_catalog(args.catalog), snapshot_dir=args.snapshots, note=args.note)
+    status = "Stored snapshot" if created else "Catalog unchanged since snapshot"
+    sys.stdout.write("{} {} ({} rows)\n".format(status, entry["id"][:12], entry["rows"]))
+
+def history(args):
+    """
+    List stored catalog versions with the number of changed papers.
+    """
+    from .query import format_results
+    from .snapshots import catalog_history
+    sys.stdout.write(format_results(catalog_history(args.snapshots), args.format) + "\n")
+
+def diff(args):
+    """
+    Compare two stored catalog versions.
+    """
+    from .query import format_results
+    from .snapshots import diff_snapshots
+    changes = diff_snapshots(args.old, args.new, args.snapshots)
+    for name in ["added","removed","changed"]:
+        columns = ["paper_id","title","year"] if name != "changed" else ["paper_id","columns"]
+        sys.stdout.write("{} ({}):\n".format(name.title(), len(changes[name])))
+        if len(changes[name]) > 0:
+            sys.stdout.write(format_results(changes[name][columns], args.format) + "\n")
+    for name in ["tasks","platforms"]:
+        shift = changes[f"{name}_shift"].rename_axis(name).reset_index(name="change")
+        sys.stdout.write("{} Count Shift:\n".format(name.title()))
+        if len(shift) > 0:
+            sys.stdout.write(format_results(shift, args.format) + "\n")
+
+def growth(args):
+    """
+    Year-over-year growth of a stored catalog version.
+    """
+    from .query import format_results
+    from .snapshots import growth_series
+    sys.stdout.write(format_results(growth_series(args.version, args.snapshots).reset_index(), args.format) + "\n")
+
+def ingest(args):
+    """
+    Merge contributor form exports into both catalog workbooks.
+    """
+    from .query import format_results
+    from .ingest import ingest_submissions
+    result = ingest_submissions(args.paths,
+                                catalog_path=args.catalog,
+                                raw_catalog_path=args.raw_catalog,
+                                allow_new_labels=args.allow_new_labels,
+                                max_workers=args.workers,
+                                dry_run=args.dry_run)
+    action = "Would append" if args.dry_run else "Appended"
+    sys.stdout.write("{} {} papers ({} duplicates skipped, {} rejected)\n".format(action,
+                                                                               len(result["appended"]),
+                                                                               len(result["duplicates"]),
+                                                                               len(result["rejected"])))
+    if len(result["appended"]) > 0:
+        sys.stdout.write(format_results(result["appended"][["paper_id","title","year","platforms","tasks"]], args.format) + "\n")
+    if len(result["errors"]) > 0:
+        sys.stdout.write("Problems ({}):\n".format(len(result["errors"])))
+        sys.stdout.write(format_results(result["errors"], args.format) + "\n")
+    if args.errors is not None:
+        result["errors"].to_csv(args.errors, index=False)
+
+###################
+### Command Line
+###################
+
+def parse_command_line(argv=None):
+    """
+
+    """
+    parser = argparse.ArgumentParser(prog="mhd", description="Mental health dataset catalog tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    ## Query
+    query_parser = subparsers.add_parser("query", help="Search the standardized catalog")
+    query_parser.add_argument("--catalog", type=str, default=CATALOG_PATH, help="Standardized catalog workbook")
+    for field in INDEX_FIELDS:
+        query_parser.add_argument(f"--{field}",
+                                  type=str,
+                                  action="append",
+                                  default=None,
+                                  help=f"Match {field} (repeat to match any of several values)")
+    query_parser.add_argument("--min-year", type=int, default=None)
+    query_parser.add_argument("--max-year", type=int, default=None)
+    query_parser.add_argument("--min-individuals", type=float, default=None)
+    query_parser.add_argument("--min-documents", type=float, default=None)
+    query_parser.add_argument("--format", type=str, default="table", choices=["table","json","csv"])
+    query_parser.set_defaults(func=query)
+    ## Lineage
+    lineage_parser = subparsers.add_parser("lineage", help="Show dataset reuse lineage")
+    lineage_parser.add_argument("paper_id", type=int, help="Paper whose dataset lineage to show")
+    lineage_parser.add_argument("--catalog", type=str, default=CATALOG_PATH, help="Standardized catalog workbook")
+    lineage_parser.add_argument("--upstream", action="store_true", default=False, help="Show sources instead of downstream users")
+    lineage_parser.set_defaults(func=lineage)
+    ## Search
+    search_parser = subparsers.add_parser("search", help="Full-text search of titles, authors, methodology and comments")
+    search_parser.add_argument("terms", type=str, nargs="+", help="Keywords (e.g. regex self-report diagnosis)")
+    search_parser.add_argument("--catalog", type=str, default=RAW_CATALOG_PATH, help="Raw catalog workbook")
+    search_parser.add_argument("--index", type=str, default=INDEX_PATH, help="Search index location")
+    search_parser.add_argument("--limit", type=int, default=10)
+    search_parser.add_argument("--all", action="store_true", default=False, help="Require every keyword to match")
+    search_parser.add_argument("--format", type=str, default="table", choices=["table","json","csv"])
+    search_parser.set_defaults(func=search)
+    ## Deduplication
+    dedup_parser = subparsers.add_parser("dedup", help="Find candidate duplicate papers")
+    dedup_parser.add_argument("--catalog", type=str, default=CATALOG_PATH, help="Standardized catalog workbook")
+    dedup_parser.add_argument("--threshold", type=float, default=None, help="Minimum weighted title/author similarity (default: 0.6)")
+    dedup_parser.add_argument("--format", type=str, default="table", choices=["table","json","csv"])
+    dedup_parser.set_defaults(func=dedup)
+    ## SQL
+    sql_parser = subparsers.add_parser("sql", help="Query the SQLite catalog database built by analysis/statistics.py")
+    sql_parser.add_argument("query", type=str, help="View name (e.g. language_distribution) or SQL query")
+    sql_parser.add_argument("--scope", type=str, default="catalog", help="Scope of view rows (catalog, review or available)")
+    sql_parser.add_argument("--database", type=str, default=DATABASE_PATH, help="Catalog database location")
+    sql_parser.add_argument("--format", type=str, default="table", choices=["table","json","csv"])
+    sql_parser.set_defaults(func=sql)
+    ## Distributions Over Store Slices
+    distribution_parser = subparsers.add_parser("distribution", help="Label counts over a slice of the store written by analysis/statistics.py")
+    distribution_parser.add_argument("column", type=str, help="Normalized column (e.g. tasks, platforms, primary_language)")
+    distribution_parser.add_argument("--min-year", type=int, default=None)
+    distribution_parser.add_argument("--max-year", type=int, default=None)
+    distribution_parser.add_argument("--platform", type=str, action="append", default=None, help="Primary platform (repeat to keep several)")
+    distribution_parser.add_argument("--language", type=str, action="append", default=None, help="Primary language as normalized, e.g. English (repeat to keep several)")
+    distribution_parser.add_argument("--store", type=str, default=STORE_DIR, help="Catalog store location")
+    distribution_parser.add_argument("--format", type=str, default="table", choices=["table","json","csv"])
+    distribution_parser.set_defaults(func=distribution)
+    ## Snapshots
+    snapshot_parser = subparsers.add_parser("snapshot", help="Store the current catalog version")
+    snapshot_parser.add_argument("--catalog", type=str, default=CATALOG_PATH, help="Standardized catalog workbook")
+    snapshot_parser.add_argument("--note", type=str, default=None, help="Description stored with the snapshot")
+    history_parser = subparsers.add_parser("history", help="List stored catalog versions")
+    diff_parser = subparsers.add_parser("diff", help="Compare two stored catalog versions")
+    diff_parser.add_argument("old", type=str, nargs="?", default="-2", help="Version position (0 is oldest, -1 latest) or hash prefix")
+    diff_parser.add_argument("new", type=str, nargs="?", default="-1", help="Version position or hash prefix")
+    growth_parser = subparsers.add_parser("growth", help="Year-over-year growth of a stored catalog version")
+    growth_parser.add_argument("--version", type=str, default="-1", help="Version position or hash prefix")
+    for subparser, func in [(snapshot_parser, snapshot), (history_parser, history), (diff_parser, diff), (growth_parser, growth)]:
+        subparser.add_argument("--snapshots", type=str, default=SNAPSHOT_DIR, help="Snapshot directory")
+        if subparser is not snapshot_parser:
+            subparser.add_argument("--format", type=str, default="table", choices=["table","json","csv"])
+        subparser.set_defaults(func=func)
+    ## Ingestion
+    ingest_parser = subparsers.add_parser("ingest", help="Append contributor form exports to the catalog workbooks")
+    ingest_parser.add_argument("paths", type=str, nargs="+", help="Form exports (.csv or .jsonl)")
+    ingest_parser.add_argument("--catalog", type=str, default=CATALOG_PATH, help="Standardized catalog workbook")
+    ingest_parser.add_argument("--raw-catalog", type=str, default=RAW_CATALOG_PATH, help="Raw catalog workbook")
+    ingest_parser.add_argument("--allow-new-labels", action="store_true", default=False, help="Accept well-formed labels not yet in the catalog")
+    ingest_parser.add_argument("--workers", type=int, default=None, help="Normalization processes (default: CPU count)")
+    ingest_parser.add_argument("--dry-run", action="store_true", default=False, help="Report without appending")
+    ingest_parser.add_argument("--errors", type=str, default=None, help="Write problems found to this CSV file")
+    ingest_parser.add_argument("--format", type=str, default="table", choices=["table","json","csv"])
+    ingest_parser.set_defaults(func=ingest)
+    args = parser.parse_args(argv)
+    return args
+
+def main(argv=None):
+    """
+
+    """
+    args = parse_command_line(argv)
+    args.func(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+###################
+### Imports
+###################
+
+## Standard Libraries
+import os
+import json
+import hashlib
+
+###################
+### Globals
+###################
+
+## Location of Cached Catalogs
+CACHE_DIR = "./.cache/catalog/"
+
+## Read Size for Hashing Workbooks
+HASH_CHUNK_SIZE = 1 << 20
+
+###################
+### Helpers
+###################
+
+def hash_file(path):
+    """
+    Compute the SHA-256 digest of a file's contents.
+
+    Args:
+        path (str): Path to the file
+
+    Returns:
+        digest (str): Hexadecimal content hash
+    """
+    hasher = hashlib.sha256()
+    with open(path, "rb") as the_file:
+        for chunk in iter(lambda: the_file.read(HASH_CHUNK_SIZE), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+def _get_cache_paths(path, sheet_name, cache_dir):
+    """
+
+    """
+    stem = os.path.splitext(os.path.basename(path))[0]
+    location = hashlib.sha256(os.path.abspath(path).encode("utf-8")).hexdigest()[:12]
+    key = f"{stem}.{location}.{sheet_name}"
+    return f"{cache_dir}{key}.parquet", f"{cache_dir}{key}.json"
+
+def _load_manifest(manifest_path):
+    """
+
+    """
+    if not os.path.exists(manifest_path):
+        return None
+    with open(manifest_path, "r") as the_file:
+        return json.load(the_file)
+
+def _write_manifest(manifest_path, manifest):
+    """
+
+    """
+    with open(manifest_path + ".tmp", "w") as the_file:
+        json.dump(manifest, the_file, indent=2)
+    os.replace(manifest_path + ".tmp", manifest_path)
+
+def _write_cache(cache_path, df):
+    """
+    Write a cached copy via a temporary file, so an interrupted write never
+    leaves a partial cache in place.
+    """
+    _coerce_mixed_columns(df).to_parquet(cache_path + ".tmp", index=False)
+    os.replace(cache_path + ".tmp", cache_path)
+
+def _coerce_mixed_columns(df):
+    """
+    Cast object columns holding a mix of types (e.g. numbers typed into
+    free-text cells) to strings so they can be stored in Arrow format.
+    Missing values are left untouched.
+    """
+    import pandas as pd
+    df = df.copy()
+    for col in df.columns:
+        if df[col].dtype != object:
+            continue
+        types = set(type(i) for i in df[col].dropna())
+        if len(types) > 1:
+            df[col] = df[col].map(lambda i: str(i) if not pd.isnull(i) else i)
+    return df
+
+###################
+### Loading
+###################
+
+def load_catalog(path,
+                 sheet_name=0,
+                 cache_dir=CACHE_DIR,
+                 use_cache=True):
+    """
+    Load a catalog workbook, reusing a cached Parquet copy when the workbook
+    has not changed since it was last parsed.
+
+    Each workbook path has its own cache entry, keyed on the workbook's
+    modification time and content hash. An unchanged modification time
+    reuses the cache without reading the workbook. A changed modification time with an unchanged hash (e.g. after
+    a fresh checkout) refreshes the manifest but skips re-parsing.
+
+    Args:
+        path (str): Path to the .xlsx workbook
+        sheet_name (int or str): Sheet to parse
+        cache_dir (str): Directory holding cached Parquet files
+        use_cache (bool): If False, always parse the workbook directly
+
+    Returns:
+        df (pandas DataFrame): Parsed catalog
+    """
+    ## Deferred So Hashing Helpers Can Be Used Without Loading pandas
+    import pandas as pd
+    ## Bypass Cache
+    if not use_cache:
+        return pd.read_excel(path, sheet_name=sheet_name)
+    ## Check Existing Cache
+    if not cache_dir.endswith("/"):
+        cache_dir = cache_dir + "/"
+    cache_path, manifest_path = _get_cache_paths(path, sheet_name, cache_dir)
+    manifest = _load_manifest(manifest_path)
+    mtime = os.path.getmtime(path)
+    if manifest is not None and os.path.exists(cache_path):
+        if manifest["mtime"] == mtime:
+            return pd.read_parquet(cache_path)
+        digest = hash_file(path)
+        if manifest["sha256"] == digest:
+            manifest["mtime"] = mtime
+            _write_manifest(manifest_path, manifest)
+            return pd.read_parquet(cache_path)
+    else:
+        digest = hash_file(path)
+    ## Parse Workbook and Rebuild Cache
+    df = pd.read_excel(path, sheet_name=sheet_name)
+    if not os.path.exists(cache_dir):
+        os.makedirs(cache_dir)
+    _write_cache(cache_path, df)
+    _write_manifest(manifest_path, {"source":os.path.abspath(path),
+                                    "sheet_name":sheet_name,
+                                    "mtime":mtime,
+                                    "sha256":digest})
+    return pd.read_parquet(cache_path)
+
+###################
+### Appending
+###################
+
+def _cell(value):
+    """
+    Convert a cell to a value openpyxl can write (missing -> empty cell).
+    """
+    if isinstance(value, str):
+        return value
+    if value is None or value != value:
+        return None
+    return value.item() if hasattr(value, "item") else value
+
+def append_catalogs(appends, cache_dir=CACHE_DIR):
+    """
+    Append rows to several catalog workbooks together. Every workbook is
+    first written in full to a temporary file; only when all of them were
+    written are they moved into place, so a failure (e.g. a locked file or
+    an unwritable cell) leaves every workbook unchanged. Existing rows and
+    their formatting are not rewritten. Cached Parquet copies that were
+    current are extended with the same rows and re-keyed to the new
+    workbooks, so the next load_catalog call does not re-parse them.
+
+    Args:
+        appends (list of tuple): (path, rows, sheet_name) for each workbook.
+                                 Rows are a pandas DataFrame with columns
+                                 named as in the sheet's header (missing
+                                 columns are left empty).
+        cache_dir (str): Directory holding cached Parquet files
+
+    Returns:
+        n_rows (list of int): Number of rows appended to each workbook
+    """
+    import pandas as pd
+    from openpyxl import load_workbook
+    if not cache_dir.endswith("/"):
+        cache_dir = cache_dir + "/"
+    ## Write Every Workbook to a Temporary File
+    pending = []
+    try:
+        for path, rows, sheet_name in appends:
+            cache_path, manifest_path = _get_cache_paths(path, sheet_name, cache_dir)
+            manifest = _load_manifest(manifest_path)
+            cache_current = manifest is not None and os.path.exists(cache_path) and manifest["sha256"] == hash_file(path)
+            workbook = load_workbook(path)
+            sheet = workbook.worksheets[sheet_name] if isinstance(sheet_name, int) else workbook[sheet_name]
+            header = [c.value for c in sheet[1]]
+            for row in rows.reindex(columns=header).itertuples(index=False, name=None):
+                sheet.append([_cell(v) for v in row])
+            tmp_path = path + ".tmp.xlsx"
+            pending.append((path, tmp_path, rows, cache_path, manifest_path, manifest if cache_current else None))
+            workbook.save(tmp_path)
+    except Exception:
+        for _, tmp_path, _, _, _, _ in pending:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        raise
+    ## Move All Workbooks into Place
+    for path, tmp_path, _, _, _, _ in pending:
+        os.replace(tmp_path, path)
+    ## Extend Current Caches
+    for path, _, rows, cache_path, manifest_path, manifest in pending:
+        if manifest is None:
+            continue
+        cached = pd.read_parquet(cache_path)
+        appended = rows.reindex(columns=cached.columns).astype(object).where(rows.reindex(columns=cached.columns).notnull(), None)
+        df = pd.concat([cached, appended], ignore_index=True)
+        for col in cached.columns:
+            if cached[col].dtype != object:
+                df[col] = df[col].astype(cached[col].dtype)
+        _write_cache(cache_path, df)
+        manifest.update({"mtime":os.path.getmtime(path), "sha256":hash_file(path)})
+        _write_manifest(manifest_path, manifest)
+    return [len(rows) for _, rows, _ in appends]
+
+def append_catalog(path,
+                   rows,
+                   sheet_name=0,
+                   cache_dir=CACHE_DIR):
+    """
+    Append rows to a single catalog workbook (see append_catalogs).
+
+    Returns:
+        n_rows (int): Number of rows appended
+    """
+    return append_catalogs([(path, rows, sheet_name)], cache_dir)[0]
@@ -0,0 +1,35 @@
+###################
+### Default Locations
+###################
+
+## Kept Free of Third-Party Imports So the Command Line Can Build Its Parser
+## Without Loading pandas
+
+## Catalog Workbooks
+CATALOG_PATH = "./supplemental_data/data_sources_standardized.xlsx"
+RAW_CATALOG_PATH = "./data_sources.xlsx"
+
+## Full-Text Search Index
+INDEX_PATH = "./.cache/search/catalog_fts.sqlite"
+
+## Catalog Database (SQLite Tables and Aggregate Views)
+DATABASE_PATH = "./.cache/database/catalog.sqlite"
+
+## Stored Catalog Versions
+SNAPSHOT_DIR = "./.cache/snapshots/"
+
+## Partitioned Normalized Catalog (Written by analysis/statistics.py)
+STORE_DIR = "./.cache/store/"
+
+###################
+### Query Fields
+###################
+
+## Query Field -> Catalog Column (Inverted Indexes)
+INDEX_FIELDS = {
+    "task":"tasks",
+    "platform":"platforms",
+    "language":"primary_language",
+    "annotation":"annotation_style",
+    "availability":"availability",
+}
@@ -0,0 +1,300 @@
+###################
+### Imports
+###################
+
+## Standard Libraries
+import os
+import sqlite3
+
+## External Libraries
+import pandas as pd
+
+## Local
+from .config import DATABASE_PATH
+from .memo import hash_object
+from .encoding import explode_lists
+
+###################
+### Globals
+###################
+
+## Scalar Catalog Columns (Column -> SQLite Type)
+PAPER_COLUMNS = {
+    "paper_id":"INTEGER PRIMARY KEY",
+    "title":"TEXT",
+    "authors":"TEXT",
+    "year":"INTEGER",
+    "annotation_level":"TEXT",
+    "availability":"TEXT",
+    "primary_language":"TEXT",
+    "primary_platform":"TEXT",
+    "n_documents_total":"REAL",
+    "n_individuals_total":"REAL",
+    "n_conversations_total":"REAL",
+    "contains_original_source":"INTEGER",
+    "reuse_count":"INTEGER",
+    "reference_link":"TEXT",
+}
+
+## List Columns (Column -> (Junction Table, Value Column, SQLite Type))
+JUNCTION_TABLES = {
+    "tasks":("paper_tasks", "task", "TEXT"),
+    "platforms":("paper_platforms", "platform", "TEXT"),
+    "annotation_style":("paper_annotation_styles", "annotation_style", "TEXT"),
+    "source_ids":("paper_sources", "source_id", "INTEGER"),
+}
+
+## Scope Holding Every Paper (Further Scopes, e.g. "review", Are Supplied by Callers;
+## Junction Rows Are Stored per Scope Because Filtering Can Remove Labels from Lists)
+CATALOG_SCOPE = "catalog"
+
+## Annotation Styles Grounded in Clinical Assessment
+CLINICAL_ANNOTATIONS = ["clinical_diagnoses","survey_(clinical)"]
+
+## Aggregate Views (Every View Has a "scope" Column)
+VIEWS = {
+    "platform_distribution":"""
+        SELECT scope, platform AS label, COUNT(*) AS n_datasets
+        FROM paper_platforms
+        GROUP BY scope, platform""",
+    "task_distribution":"""
+        SELECT scope, task AS label, COUNT(*) AS n_datasets
+        FROM paper_tasks
+        GROUP BY scope, task""",
+    "annotation_distribution":"""
+        SELECT scope, annotation_style AS label, COUNT(*) AS n_datasets
+        FROM paper_annotation_styles
+        GROUP BY scope, annotation_style""",
+    "language_distribution":"""
+        SELECT s.scope, p.primary_language AS label, COUNT(*) AS n_datasets
+        FROM paper_scopes s JOIN papers p ON p.paper_id = s.paper_id
+        WHERE p.primary_language IS NOT NULL
+        GROUP BY s.scope, p.primary_language""",
+    "availability_distribution":"""
+        SELECT s.scope, p.availability AS label, COUNT(*) AS n_datasets
+        FROM paper_scopes s JOIN papers p ON p.paper_id = s.paper_id
+        WHERE p.availability IS NOT NULL
+        GROUP BY s.scope, p.availability""",
+    "year_distribution":"""
+        SELECT s.scope, p.year AS label, COUNT(*) AS n_datasets
+        FROM paper_scopes s JOIN papers p ON p.paper_id = s.paper_id
+        GROUP BY s.scope, p.year""",
+    "clinical_availability":"""
+        SELECT s.scope, p.paper_id, p.title,
+               (SELECT GROUP_CONCAT(task, ', ') FROM (SELECT task FROM paper_tasks t WHERE t.scope = s.scope AND t.paper_id = p.paper_id ORDER BY task)) AS tasks,
+               p.primary_language, p.availability
+        FROM paper_scopes s JOIN papers p ON p.paper_id = s.paper_id
+        WHERE EXISTS (SELECT 1 FROM paper_annotation_styles a WHERE a.scope = s.scope AND a.paper_id = p.paper_id AND a.annotation_style IN ({clinical}))""",
+    "annotation_sizes":"""
+        SELECT s.scope, p.annotation_level, p.paper_id, p.n_documents_total, p.n_individuals_total
+        FROM paper_scopes s JOIN papers p ON p.paper_id = s.paper_id""",
+    "size_summary":"""
+        SELECT s.scope, p.annotation_level,
+               COUNT(p.n_documents_total) AS documents_count,
+               MIN(p.n_documents_total) AS documents_min,
+               AVG(p.n_documents_total) AS documents_mean,
+               MAX(p.n_documents_total) AS documents_max,
+               COUNT(p.n_individuals_total) AS individuals_count,
+               MIN(p.n_individuals_total) AS individuals_min,
+               AVG(p.n_individuals_total) AS individuals_mean,
+               MAX(p.n_individuals_total) AS individuals_max
+        FROM paper_scopes s JOIN papers p ON p.paper_id = s.paper_id
+        GROUP BY s.scope, p.annotation_level""",
+}
+
+## Indexed Columns (Table -> Columns of Each Index)
+INDEXES = {
+    "papers":[["year"],["availability"],["primary_language"],["annotation_level"]],
+    "paper_tasks":[["scope","task"]],
+    "paper_platforms":[["scope","platform"]],
+    "paper_annotation_styles":[["scope","annotation_style"]],
+    "paper_sources":[["scope","source_id"]],
+}
+
+###################
+### Schema
+###################
+
+def _create_schema(connection):
+    """
+    Create tables, indexes and views if they do not exist.
+    """
+    columns = ",\n".join(f"{col} {sql_type}" for col, sql_type in PAPER_COLUMNS.items())
+    statements = [f"CREATE TABLE IF NOT EXISTS papers ({columns})",
+                  "CREATE TABLE IF NOT EXISTS paper_scopes (scope TEXT NOT NULL, paper_id INTEGER NOT NULL REFERENCES papers(paper_id), PRIMARY KEY (scope, paper_id))",
+                  "CREATE TABLE IF NOT EXISTS metadata (key TEXT PRIMARY KEY, value TEXT)"]
+    for table, value_col, sql_type in JUNCTION_TABLES.values():
+        statements.append(f"CREATE TABLE IF NOT EXISTS {table} (scope TEXT NOT NULL, paper_id INTEGER NOT NULL REFERENCES papers(paper_id), {value_col} {sql_type} NOT NULL, PRIMARY KEY (scope, paper_id, {value_col}))")
+    for table, indexes in INDEXES.items():
+        for cols in indexes:
+            statements.append("CREATE INDEX IF NOT EXISTS {}_{} ON {} ({})".format(table, "_".join(cols), table, ", ".join(cols)))
+    clinical = ", ".join("'{}'".format(a) for a in CLINICAL_ANNOTATIONS)
+    for view, query in VIEWS.items():
+        statements.append(f"CREATE VIEW IF NOT EXISTS {view} AS {query.format(clinical=clinical)}")
+    connection.executescript(";\n".join(statements) + ";")
+
+def schema_hash():
+    """
+    Hash of the table, index and view definitions. Stored in the metadata
+    table so a database built from older definitions is detected.
+    """
+    return hash_object([PAPER_COLUMNS, JUNCTION_TABLES, INDEXES, VIEWS, CLINICAL_ANNOTATIONS])
+
+def _stored_schema_hash(connection):
+    """
+
+    """
+    try:
+        row = connection.execute("SELECT value FROM metadata WHERE key = 'schema_hash'").fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return row[0] if row is not None else None
+
+def _drop_schema(connection):
+    """
+    Drop every view and table (indexes are dropped with their tables).
+    """
+    objects = connection.execute("SELECT type, name FROM sqlite_master WHERE type IN ('view','table') AND name NOT LIKE 'sqlite_%'").fetchall()
+    statements = [f"DROP {obj_type.upper()} IF EXISTS {name}" for obj_type, name in sorted(objects, key=lambda o: o[0] != "view")]
+    if len(statements) > 0:
+        connection.executescript(";\n".join(statements) + ";")
+
+def connect(db_path=DATABASE_PATH):
+    """
+    Open (and if needed create) the catalog database. A database built from
+    different schema definitions is dropped and recreated empty (its content
+    hash goes with it, so the next write_database call repopulates it).
+    """
+    db_dir = os.path.dirname(db_path)
+    if db_dir and not os.path.exists(db_dir):
+        os.makedirs(db_dir)
+    connection = sqlite3.connect(db_path)
+    schema = schema_hash()
+    if _stored_schema_hash(connection) != schema:
+        _drop_schema(connection)
+        _create_schema(connection)
+        with connection:
+            connection.execute("INSERT OR REPLACE INTO metadata (key, value) VALUES ('schema_hash', ?)", (schema,))
+    return connection
+
+###################
+### Ingestion
+###################
+
+def _scalar(value):
+    """
+    Convert a cell to a value sqlite3 can bind (missing -> NULL).
+    """
+    if pd.isnull(value):
+        return None
+    return value.item() if hasattr(value, "item") else value
+
+def _junction_rows(scope, df, col):
+    """
+    (scope, paper_id, value) rows of a list column. Missing and empty lists
+    hold no labels and contribute no rows.
+    """
+    rows, items = explode_lists(df[col])
+    pairs = pd.DataFrame({"paper_id":df["paper_id"].values[rows], "value":items}).drop_duplicates()
+    return [(scope, int(p), _scalar(v)) for p, v in pairs.itertuples(index=False, name=None)]
+
+def write_database(df, scopes=None, db_path=DATABASE_PATH):
+    """
+    Load a normalized catalog into SQLite: a papers table, junction tables for
+    tasks, platforms, annotation styles and sources, and named scopes (paper
+    subsets) over which the aggregate views are grouped. The database is only
+    rewritten when the catalog or scopes change.
+
+    Args:
+        df (pandas DataFrame): Normalized catalog (output of normalize_stage)
+        scopes (dict or None): Scope name -> subset of the catalog in that
+                               scope (e.g. the output of select_stage, whose
+                               label lists may have excluded labels removed).
+                               The full catalog is the "catalog" scope.
+        db_path (str): SQLite database path
+
+    Returns:
+        written (bool): Whether the database was rewritten
+    """
+    scopes = dict(scopes or {})
+    scopes[CATALOG_SCOPE] = df
+    key = hash_object([df] + [[name, scopes[name]] for name in sorted(scopes)])
+    connection = connect(db_path)
+    current = connection.execute("SELECT value FROM metadata WHERE key = 'content_hash'").fetchone()
+    if current is not None and current[0] == key:
+        connection.close()
+        return False
+    columns = [col for col in PAPER_COLUMNS if col in df.columns]
+    placeholders = ", ".join("?" for _ in columns)
+    with connection:
+        for table in ["paper_scopes"] + [t for t, _, _ in JUNCTION_TABLES.values()] + ["papers"]:
+            connection.execute(f"DELETE FROM {table}")
+        connection.executemany(f"INSERT INTO papers ({', '.join(columns)}) VALUES ({placeholders})",
+                               [[_scalar(v) for v in row] for row in df[columns].itertuples(index=False, name=None)])
+        for name, scope_df in scopes.items():
+            connection.executemany("INSERT INTO paper_scopes (scope, paper_id) VALUES (?, ?)",
+                                   [(name, int(p)) for p in scope_df["paper_id"]])
+            for col, (table, value_col, _) in JUNCTION_TABLES.items():
+                if col in scope_df.columns:
+                    connection.executemany(f"INSERT INTO {table} (scope, paper_id, {value_col}) VALUES (?, ?, ?)", _junction_rows(name, scope_df, col))
+        connection.execute("INSERT OR REPLACE INTO metadata (key, value) VALUES ('content_hash', ?)", (key,))
+    connection.execute("ANALYZE")
+    connection.close()
+    return True
+
+###################
+### Queries
+###################
+
+def _open(db_path):
+    """
+
+    """
+    if not os.path.exists(db_path):
+        raise FileNotFoundError(f"No catalog database found at {db_path}. Build it by running analysis/statistics.py.")
+    connection = sqlite3.connect(db_path)
+    if _stored_schema_hash(connection) != schema_hash():
+        connection.close()
+        raise RuntimeError(f"The catalog database at {db_path} was built with an older schema. Rebuild it by running analysis/statistics.py.")
+    return connection
+
+def read_sql(query, db_path=DATABASE_PATH, params=()):
+    """
+    Run an ad-hoc query against the catalog database.
+
+    Returns:
+        results (pandas DataFrame)
+    """
+    connection = _open(db_path)
+    results = pd.read_sql_query(query, connection, params=params)
+    connection.close()
+    return results
+
+def read_view(view, scope=CATALOG_SCOPE, db_path=DATABASE_PATH):
+    """
+    Rows of an aggregate view within one scope.
+
+    Args:
+        view (str): One of VIEWS
+        scope (str): Scope name (e.g. "catalog", "review", "available")
+        db_path (str): SQLite database path
+
+    Returns:
+        results (pandas DataFrame): View rows without the scope column
+    """
+    if view not in VIEWS:
+        raise KeyError(f"Unknown view: {view}")
+    results = read_sql(f"SELECT * FROM {view} WHERE scope = ?", db_path, params=(scope,))
+    return results.drop(columns=["scope"])
+
+def read_distribution(view, scope=CATALOG_SCOPE, db_path=DATABASE_PATH):
+    """
+    Label counts from a *_distribution view, sorted ascending like
+    encoding.label_counts.
+
+    Returns:
+        counts (pandas Series): Number of datasets per label
+    """
+    results = read_view(view, scope, db_path)
+    counts = results.set_index("label")["n_datasets"].rename_axis(None)
+    return counts.sort_values()
@@ -0,0 +1,286 @@
+###################
+### Imports
+###################
+
+## External Libraries
+import pandas as pd
+import numpy as np
+import pyarrow as pa
+
+## Local
+from .encoding import is_list_column, explode_lists, filter_items, join_items
+from .schema import _to_list_array
+
+###################
+### Globals
+###################
+
+## Character Shingle Length for Titles
+SHINGLE_SIZE = 3
+
+## MinHash Signature Length and LSH Banding (Bands x Rows = Permutations)
+NUM_PERMUTATIONS = 64
+LSH_BANDS = 16
+
+## Candidate Verification
+TITLE_WEIGHT = 0.7
+SIMILARITY_THRESHOLD = 0.6
+MAX_YEAR_GAP = 1
+
+## Margin Below the Threshold at Which MinHash Estimates Are Verified Exactly
+ESTIMATE_SLACK = 0.1
+
+## Buckets Larger Than This Are Not Compared Exhaustively; Their Members Are Sorted
+## by Full Signature and Each Is Compared with the Next MAX_BUCKET_SIZE - 1 Members
+## (Identical Signatures Are Adjacent, So Chains of Pairs Still Join Their Clusters)
+MAX_BUCKET_SIZE = 50
+
+###################
+### Shingling
+###################
+
+def normalize_title(titles):
+    """
+    Lowercase titles and reduce them to alphanumeric words.
+    """
+    return titles.fillna("").astype(str).str.lower().str.replace(r"[^0-9a-z]+", " ", regex=True).str.strip()
+
+def author_shingles(authors):
+    """
+    Long (row, surname hash) arrays of lowercase author surnames ("et al."
+    and separators removed).
+    """
+    tokens = authors.fillna("").astype(str).str.lower().str.replace(r"et al\.?", "", regex=True).reset_index(drop=True)
+    tokens = tokens.str.split(r"\s*,\s*|\s+and\s+|\s*&\s*", regex=True).explode().str.strip()
+    tokens = tokens.loc[tokens.notnull() & (tokens != "")]
+    tokens = pd.DataFrame({"row":tokens.index.values, "hash":pd.util.hash_array(tokens.values.astype(object))})
+    tokens = tokens.drop_duplicates()
+    return tokens["row"].values, tokens["hash"].values
+
+def title_shingles(titles, size=SHINGLE_SIZE):
+    """
+    Long (row, shingle hash) arrays of character n-grams for each title.
+
+    Returns:
+        rows (numpy array): Row position of each shingle (ascending)
+        hashes (numpy array): 64-bit shingle hashes (unique within a row)
+    """
+    titles = normalize_title(titles).reset_index(drop=True)
+    shingles = titles.map(lambda t: [t[i:i+size] for i in range(max(1, len(t) - size + 1))]).explode()
+    shingles = pd.DataFrame({"row":shingles.index.values, "hash":pd.util.hash_array(shingles.values.astype(object))})
+    shingles = shingles.drop_duplicates()
+    return shingles["row"].values, shingles["hash"].values
+
+###################
+### MinHash / LSH
+###################
+
+def minhash_signatures(rows, hashes, n_rows, num_permutations=NUM_PERMUTATIONS, seed=0, chunk_size=1 << 18):
+    """
+    MinHash signatures from long (row, shingle hash) arrays. Each permutation
+    is a multiply-add hash (a * x + b, wrapping in 64 bits); shingles are
+    processed in blocks and reduced per row so memory stays bounded.
+
+    Returns:
+        signatures (numpy array): (n_rows x num_permutations) uint64
+    """
+    rng = np.random.default_rng(seed)
+    a = rng.integers(0, np.iinfo(np.uint64).max, size=num_permutations, dtype=np.uint64) | np.uint64(1)
+    b = rng.integers(0, np.iinfo(np.uint64).max, size=num_permutations, dtype=np.uint64)
+    signatures = np.full((n_rows, num_permutations), np.iinfo(np.uint64).max, dtype=np.uint64)
+    for start in range(0, len(rows), chunk_size):
+        block_rows = rows[start:start+chunk_size]
+        permuted = hashes[start:start+chunk_size, None] * a[None, :] + b[None, :]
+        starts = np.concatenate([[0], np.flatnonzero(np.diff(block_rows)) + 1])
+        block_min = np.minimum.reduceat(permuted, starts, axis=0)
+        signatures[block_rows[starts]] = np.minimum(signatures[block_rows[starts]], block_min)
+    return signatures
+
+def lsh_candidates(signatures, bands=LSH_BANDS, max_bucket_size=MAX_BUCKET_SIZE, seed=1):
+    """
+    Candidate pairs of rows sharing at least one LSH band bucket. Buckets of
+    up to max_bucket_size rows yield every pair; larger buckets yield pairs
+    of rows within max_bucket_size - 1 positions of each other in full
+    signature order.
+
+    Returns:
+        pairs (numpy array): (n_pairs x 2) row positions with i < j
+    """
+    n_rows, num_permutations = signatures.shape
+    band_size = num_permutations // bands
+    mixers = np.random.default_rng(seed).integers(0, np.iinfo(np.uint64).max, size=num_permutations, dtype=np.uint64) | np.uint64(1)
+    signature_keys = (signatures * mixers[None, :]).sum(axis=1)
+    mixers = mixers[:band_size]
+    pairs = []
+    for band in range(bands):
+        keys = (signatures[:, band*band_size:(band+1)*band_size] * mixers[None, :]).sum(axis=1)
+        order = np.argsort(keys, kind="stable")
+        starts = np.concatenate([[0], np.flatnonzero(np.diff(keys[order])) + 1])
+        sizes = np.diff(np.append(starts, n_rows))
+        ## Enumerate Pairs for All Buckets of the Same Size at Once
+        for size in np.unique(sizes[(sizes >= 2) & (sizes <= max_bucket_size)]):
+            members = order[starts[sizes == size][:, None] + np.arange(size)[None, :]]
+            i, j = np.triu_indices(size, k=1)
+            pairs.append(np.stack([members[:, i].ravel(), members[:, j].ravel()], axis=1))
+        ## Compare Members of Oversized Buckets Within a Window
+        bucket = np.repeat(np.arange(len(starts)), sizes)
+        oversized = sizes[bucket] > max_bucket_size
+        if oversized.any():
+            members, member_bucket = order[oversized], bucket[oversized]
+            window_order = np.lexsort((members, signature_keys[members], member_bucket))
+            members, member_bucket = members[window_order], member_bucket[window_order]
+            for offset in range(1, max_bucket_size):
+                same = member_bucket[offset:] == member_bucket[:-offset]
+                pairs.append(np.stack([members[:-offset][same], members[offset:][same]], axis=1))
+    if len(pairs) == 0:
+        return np.empty((0, 2), dtype=np.int64)
+    pairs = np.sort(np.concatenate(pairs), axis=1).astype(np.int64)
+    pair_codes = np.sort(pairs[:, 0] * n_rows + pairs[:, 1])
+    pair_codes = pair_codes[np.append(True, np.diff(pair_codes) != 0)]
+    return np.stack([pair_codes // n_rows, pair_codes % n_rows], axis=1)
+
+###################
+### Clustering
+###################
+
+def _jaccard(a, b):
+    """
+
+    """
+    if len(a) == 0 and len(b) == 0:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+def _row_sets(rows, hashes, n_rows):
+    """
+    Per-row sets of hashes (list indexed by row position).
+    """
+    sets = [frozenset()] * n_rows
+    starts = np.concatenate([[0], np.flatnonzero(np.diff(rows)) + 1]) if len(rows) > 0 else np.empty(0, dtype=int)
+    for start, end in zip(starts, np.append(starts[1:], len(rows))):
+        sets[rows[start]] = frozenset(hashes[start:end].tolist())
+    return sets
+
+def _estimate_similarity(title_signatures, author_signatures, candidates, block_size=1 << 16):
+    """
+    Weighted similarity of candidate pairs estimated from MinHash agreement.
+    """
+    estimated = np.empty(len(candidates))
+    for start in range(0, len(candidates), block_size):
+        i, j = candidates[start:start+block_size, 0], candidates[start:start+block_size, 1]
+        title_est = (title_signatures[i] == title_signatures[j]).mean(axis=1)
+        author_est = (author_signatures[i] == author_signatures[j]).mean(axis=1)
+        estimated[start:start+block_size] = TITLE_WEIGHT * title_est + (1 - TITLE_WEIGHT) * author_est
+    return estimated
+
+def _connected_components(pairs, n_rows):
+    """
+    Union-find over accepted pairs. Returns a component label per row.
+    """
+    parent = np.arange(n_rows)
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+    for i, j in pairs:
+        ri, rj = find(i), find(j)
+        if ri != rj:
+            parent[max(ri, rj)] = min(ri, rj)
+    return np.array([find(i) for i in range(n_rows)])
+
+def find_duplicates(df,
+                    id_col="paper_id",
+                    title_col="title",
+                    authors_col="authors",
+                    year_col="year",
+                    threshold=SIMILARITY_THRESHOLD,
+                    num_permutations=NUM_PERMUTATIONS,
+                    bands=LSH_BANDS):
+    """
+    Detect near-duplicate catalog entries. Candidates come from MinHash/LSH
+    over title shingles (near-linear in catalog size) and are pruned using
+    MinHash estimates of title and author similarity; each remaining pair is
+    then scored exactly by title shingle and author surname Jaccard similarity and
+    must be published within MAX_YEAR_GAP years.
+
+    Args:
+        df (pandas DataFrame): Catalog (standardized or raw, with the named columns)
+        id_col (str): Identifier column
+        title_col, authors_col, year_col (str): Compared columns
+        threshold (float): Minimum weighted similarity of a duplicate pair
+        num_permutations (int): MinHash signature length
+        bands (int): LSH bands (more bands -> more candidates)
+
+    Returns:
+        pairs (pandas DataFrame): Accepted pairs ("id_a", "id_b", "title_similarity",
+                                  "author_similarity", "similarity")
+        clusters (pandas DataFrame): One row per duplicated entry with "cluster"
+                                     and "canonical_id"
+    """
+    df = df.reset_index(drop=True)
+    rows, hashes = title_shingles(df[title_col])
+    signatures = minhash_signatures(rows, hashes, len(df), num_permutations)
+    candidates = lsh_candidates(signatures, bands)
+    ## Discard Candidates Whose Year Gap or Estimated Similarity Rules Them Out
+    years = df[year_col].values
+    candidates = candidates[np.abs(years[candidates[:, 0]] - years[candidates[:, 1]]) <= MAX_YEAR_GAP]
+    author_rows, author_hashes = author_shingles(df[authors_col])
+    author_signatures = minhash_signatures(author_rows, author_hashes, len(df), num_permutations)
+    estimated = _estimate_similarity(signatures, author_signatures, candidates)
+    candidates = candidates[estimated >= threshold - ESTIMATE_SLACK]
+    ## Verify Remaining Candidates Exactly
+    shingle_sets = _row_sets(rows, hashes, len(df))
+    author_sets = _row_sets(author_rows, author_hashes, len(df))
+    records = []
+    for i, j in candidates:
+        title_sim = _jaccard(shingle_sets[i], shingle_sets[j])
+        author_sim = _jaccard(author_sets[i], author_sets[j])
+        similarity = TITLE_WEIGHT * title_sim + (1 - TITLE_WEIGHT) * author_sim
+        if similarity >= threshold:
+            records.append((i, j, title_sim, author_sim, similarity))
+    pairs = pd.DataFrame(records, columns=["row_a","row_b","title_similarity","author_similarity","similarity"])
+    ## Cluster Accepted Pairs
+    components = _connected_components(pairs[["row_a","row_b"]].values, len(df))
+    clusters = df[[id_col, title_col, authors_col, year_col]].copy()
+    clusters["cluster"] = components
+    clusters = clusters.loc[clusters["cluster"].duplicated(keep=False)]
+    clusters = clusters.sort_values([year_col, id_col])
+    clusters["canonical_id"] = clusters.groupby("cluster")[id_col].transform("first")
+    pairs.insert(0, "id_b", df[id_col].values[pairs["row_b"].values])
+    pairs.insert(0, "id_a", df[id_col].values[pairs["row_a"].values])
+    pairs = pairs.drop(columns=["row_a","row_b"]).sort_values("similarity", ascending=False)
+    return pairs.reset_index(drop=True), clusters.reset_index(drop=True)
+
+def suggest_source_ids(df, clusters, id_col="paper_id", source_col="source_ids"):
+    """
+    Suggested source_ids for duplicated entries: every non-canonical member of
+    a cluster should point to the canonical (earliest) entry instead of
+    claiming to be an original dataset. source_ids may be Arrow lists (see
+    mhd.schema.to_compact) or the catalog's comma-separated strings.
+
+    Returns:
+        suggestions (pandas DataFrame): id, current and suggested source_ids
+                                        for entries whose source_ids would change
+    """
+    sources = df.set_index(id_col)[source_col]
+    if not is_list_column(sources):
+        sources = pd.Series(_to_list_array(sources.astype(str), pa.int32()), index=sources.index)
+    suggestions = clusters.loc[clusters[id_col] != clusters["canonical_id"], [id_col, "cluster", "canonical_id"]].copy()
+    current = sources.reindex(suggestions[id_col].values)
+    suggestions["current_source_ids"] = join_items(current).values
+    if len(suggestions) == 0:
+        suggestions["suggested_source_ids"] = []
+        return suggestions
+    ## Current Sources Without the Entry Itself
+    parents, items = explode_lists(current)
+    keep = items != suggestions[id_col].values[parents]
+    kept = pd.Series(join_items(filter_items(current, keep)).values, index=suggestions.index, dtype=object)
+    ## Canonical Entry First Unless Already Listed
+    canonical = suggestions["canonical_id"].values
+    listed = np.zeros(len(suggestions), dtype=bool)
+    listed[parents[keep & (items == canonical[parents])]] = True
+    canonical = suggestions["canonical_id"].astype(str).astype(object)
+    prefixed = canonical.where(kept == "", canonical + ", " + kept)
+    suggestions["suggested_source_ids"] = kept.where(listed, prefixed).astype(str)
+    return suggestions.loc[suggestions["suggested_source_ids"] != suggestions["current_source_ids"]].reset_index(drop=True)
@@ -0,0 +1,154 @@
+###################
+### Imports
+###################
+
+## External Libraries
+import pandas as pd
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+###################
+### List Columns
+###################
+
+def is_list_column(values):
+    """
+    Whether a column holds Arrow lists.
+    """
+    return isinstance(values.dtype, pd.ArrowDtype) and pa.types.is_list(values.dtype.pyarrow_dtype)
+
+def list_array(values):
+    """
+    Arrow ListArray behind a list-valued column (see mhd.schema.to_compact).
+    """
+    lists = pa.array(pd.Series(values).array)
+    if isinstance(lists, pa.ChunkedArray):
+        lists = lists.combine_chunks()
+    return lists
+
+def to_list_column(lists, index=None):
+    """
+    Wrap an Arrow ListArray as a pandas column.
+    """
+    return pd.Series(pd.array(lists, dtype=pd.ArrowDtype(lists.type)), index=index)
+
+def explode_lists(values):
+    """
+    Flatten a list-valued column to (row position, item) pairs without
+    creating per-row Python objects. Missing and empty lists contribute no
+    pairs.
+
+    Args:
+        values (pandas Series or pyarrow ListArray): List-valued column
+
+    Returns:
+        rows (1d-array): Position of each item's row in the input
+        items (1d-array): Flattened items
+    """
+    lists = values if isinstance(values, pa.Array) else list_array(values)
+    return lists.value_parent_indices().to_numpy(), lists.flatten().to_numpy(zero_copy_only=False)
+
+def rebuild_lists(lists, parents, items):
+    """
+    Rebuild a ListArray from flattened items and the (sorted) position of
+    each item's list. Missing lists stay missing.
+
+    Args:
+        lists (pyarrow ListArray): List array being rebuilt (for its length
+                                   and missing lists)
+        parents (1d-array): Sorted list position of each item
+        items (pyarrow Array): Items of the rebuilt lists
+
+    Returns:
+        rebuilt (pyarrow ListArray)
+    """
+    offsets = np.searchsorted(parents, np.arange(len(lists) + 1)).astype(np.int32)
+    return pa.ListArray.from_arrays(pa.array(offsets), items, mask=lists.is_null())
+
+def filter_items(values, keep):
+    """
+    Drop items from every list of a list-valued column. Missing lists stay
+    missing; lists whose items are all dropped become empty.
+
+    Args:
+        values (pandas Series or pyarrow ListArray): List-valued column
+        keep (boolean array or pyarrow BooleanArray): Mask over the flattened items
+
+    Returns:
+        filtered (pandas Series): List-valued column aligned with the input
+    """
+    index = values.index if isinstance(values, pd.Series) else None
+    lists = list_array(values) if isinstance(values, pd.Series) else values
+    keep = pa.array(keep, type=pa.bool_())
+    filtered = rebuild_lists(lists, lists.value_parent_indices().filter(keep).to_numpy(), lists.flatten().filter(keep))
+    return to_list_column(filtered, index)
+
+def sort_items(values):
+    """
+    Sort the items within every list of a list-valued column.
+    """
+    lists = list_array(values)
+    rows, items = explode_lists(lists)
+    codes, _ = pd.factorize(items, sort=True)
+    order = np.lexsort((codes, rows))
+    return to_list_column(rebuild_lists(lists, rows, lists.flatten().take(pa.array(order))), values.index)
+
+def first_items(values):
+    """
+    First item of every list (missing for missing or empty lists).
+    """
+    values = pd.Series(values)
+    rows, items = explode_lists(pc.list_slice(list_array(values), 0, 1))
+    first = np.full(len(values), np.nan, dtype=object)
+    first[rows] = items
+    return pd.Series(first, index=values.index)
+
+def join_items(values, sep=", "):
+    """
+    Join the items of every list (missing lists stay missing, empty lists
+    become empty strings).
+    """
+    values = pd.Series(values)
+    joined = pc.binary_join(pc.cast(list_array(values), pa.list_(pa.string())), sep)
+    return pd.Series(joined.to_numpy(zero_copy_only=False), index=values.index)
+
+###################
+### Encoding
+###################
+
+def multi_hot_encode(values):
+    """
+    Encode a list-valued column as a multi-hot bitmap. The column is
+    flattened once, so cost scales with the number of (row, label) pairs
+    rather than rows x labels. Missing and empty lists ("na") encode as all
+    zeros.
+
+    Args:
+        values (pandas Series): List-valued column (e.g. normalized tasks)
+
+    Returns:
+        bitmap (2d-array): uint8 matrix of shape (n_rows, n_labels), aligned
+                           positionally with the input
+        labels (pandas Index): Sorted label for each bitmap column
+    """
+    rows, items = explode_lists(values)
+    codes, labels = pd.factorize(items, sort=True)
+    bitmap = np.zeros((len(values), len(labels)), dtype=np.uint8)
+    bitmap[rows, codes] = 1
+    return bitmap, pd.Index(labels)
+
+def label_counts(bitmap, labels):
+    """
+    Count the number of rows containing each label.
+
+    Args:
+        bitmap (2d-array): Multi-hot matrix from multi_hot_encode
+        labels (pandas Index): Label for each bitmap column
+
+    Returns:
+        counts (pandas Series): Row count per label, sorted ascending
+    """
+    counts = pd.Series(bitmap.sum(axis=0, dtype=np.int64), index=labels)
+    counts = counts.sort_values()
+    return counts
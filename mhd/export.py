@@ -0,0 +1,201 @@
+###################
+### Imports
+###################
+
+## Standard Libraries
+import os
+import re
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+## External Libraries
+import pandas as pd
+
+## Local
+from .markdown import WRITE_BUFFER, scan_rows, write_table
+from .encoding import is_list_column, sort_items, join_items
+
+###################
+### Globals
+###################
+
+## Characters Escaped in LaTeX Cells
+LATEX_SPECIAL = {
+    "\\":r"\textbackslash{}",
+    "&":r"\&",
+    "%":r"\%",
+    "$":r"\$",
+    "#":r"\#",
+    "_":r"\_",
+    "{":r"\{",
+    "}":r"\}",
+    "~":r"\textasciitilde{}",
+    "^":r"\textasciicircum{}",
+}
+LATEX_PATTERN = re.compile("|".join(re.escape(c) for c in LATEX_SPECIAL))
+
+## Available Export Formats (Name -> File Extension)
+EXPORT_FORMATS = {
+    "markdown":"md",
+    "latex":"tex",
+    "csv":"csv",
+    "jsonl":"jsonl",
+    "bibtex":"bib",
+}
+
+###################
+### Helpers
+###################
+
+def _serialize_value(value):
+    """
+    Convert list cells to sorted lists, missing values to None and numpy
+    scalars to Python scalars so rows can be written as JSON.
+    """
+    if isinstance(value, list):
+        return sorted(value)
+    if pd.isnull(value):
+        return None
+    if hasattr(value, "item"):
+        return value.item()
+    return value
+
+def _flatten_lists(df):
+    """
+    Join the sorted items of list cells with ", " (the workbook convention,
+    with empty lists written as "na") for flat formats.
+    """
+    df = df.copy()
+    for col in df.columns:
+        if is_list_column(df[col]):
+            joined = join_items(sort_items(df[col]))
+            df[col] = joined.where(joined != "", "na")
+    return df
+
+def escape_latex(text):
+    """
+    Escape LaTeX special characters in a cell.
+    """
+    return LATEX_PATTERN.sub(lambda m: LATEX_SPECIAL[m.group()], str(text))
+
+def _bibtex_key(authors, year, title, used):
+    """
+
+    """
+    first_author = re.sub(r"[^a-z]", "", authors.split(",")[0].lower()) or "anon"
+    first_word = next((w for w in re.findall(r"[a-z]+", title.lower()) if len(w) > 3), "")
+    key = f"{first_author}{year}{first_word}"
+    candidate, suffix = key, 0
+    while candidate in used:
+        suffix += 1
+        candidate = f"{key}{chr(ord('a') + suffix - 1)}"
+    used.add(candidate)
+    return candidate
+
+###################
+### Writers
+###################
+
+def export_markdown(table_df, path):
+    """
+    Write a table as a markdown pipe table.
+    """
+    columns = [str(c) for c in table_df.columns]
+    numeric = [pd.api.types.is_numeric_dtype(table_df[c]) for c in table_df.columns]
+    rows = lambda: table_df.itertuples(index=False, name=None)
+    _, widths = scan_rows(rows(), columns)
+    with open(path, "w", buffering=WRITE_BUFFER) as the_file:
+        write_table(the_file, rows(), columns, widths, numeric)
+        the_file.write("\n")
+
+def export_latex(table_df, path):
+    """
+    Write a table as a booktabs LaTeX tabular.
+    """
+    with open(path, "w", buffering=WRITE_BUFFER) as the_file:
+        the_file.write("\\begin{tabular}{" + "l" * table_df.shape[1] + "}\n")
+        the_file.write("\\toprule\n")
+        the_file.write(" & ".join(escape_latex(c) for c in table_df.columns) + " \\\\\n")
+        the_file.write("\\midrule\n")
+        for row in table_df.itertuples(index=False, name=None):
+            cells = ["" if isinstance(v, float) and pd.isnull(v) else escape_latex(v) for v in row]
+            the_file.write(" & ".join(cells) + " \\\\\n")
+        the_file.write("\\bottomrule\n")
+        the_file.write("\\end{tabular}\n")
+
+def export_csv(df, path):
+    """
+    Write the catalog as CSV (list cells sorted and joined with ", ").
+    """
+    _flatten_lists(df).to_csv(path, index=False)
+
+def export_jsonl(df, path):
+    """
+    Write the catalog as JSON Lines (list cells as sorted lists).
+    """
+    columns = list(df.columns)
+    with open(path, "w", buffering=WRITE_BUFFER) as the_file:
+        for row in df.itertuples(index=False, name=None):
+            record = dict((c, _serialize_value(v)) for c, v in zip(columns, row))
+            the_file.write(json.dumps(record) + "\n")
+
+def export_bibtex(df, path):
+    """
+    Write a BibTeX entry for each paper in the catalog.
+    """
+    used = set()
+    with open(path, "w", buffering=WRITE_BUFFER) as the_file:
+        for title, authors, year, link in df[["title","authors","year","reference_link"]].itertuples(index=False, name=None):
+            key = _bibtex_key(authors, year, title, used)
+            fields = [("title", "{" + escape_latex(title.strip()) + "}"),
+                      ("author", " and ".join(escape_latex(a.strip()) for a in authors.split(","))),
+                      ("year", str(year))]
+            if isinstance(link, str):
+                fields.append(("url", link.strip()))
+            the_file.write(f"@misc{{{key},\n")
+            the_file.write(",\n".join(f"  {x}={{{y}}}" for x, y in fields))
+            the_file.write("\n}\n\n")
+
+###################
+### Export Stage
+###################
+
+def export_catalog(catalog_df,
+                   table_df,
+                   output_dir,
+                   prefix="catalog",
+                   formats=None,
+                   max_workers=None):
+    """
+    Render a processed catalog to several formats concurrently. Table formats
+    (markdown, LaTeX) use the display table; data formats (CSV, JSON Lines,
+    BibTeX) use the processed catalog.
+
+    Args:
+        catalog_df (pandas DataFrame): Processed catalog
+        table_df (pandas DataFrame): Display table (e.g. latex_df)
+        output_dir (str): Directory for output files
+        prefix (str): Output filename prefix
+        formats (list of str or None): Subset of EXPORT_FORMATS (default all)
+        max_workers (int or None): Thread pool size (default one per format)
+
+    Returns:
+        paths (dict): Format -> written file path
+    """
+    if formats is None:
+        formats = list(EXPORT_FORMATS.keys())
+    writers = {
+        "markdown":(export_markdown, table_df),
+        "latex":(export_latex, table_df),
+        "csv":(export_csv, catalog_df),
+        "jsonl":(export_jsonl, catalog_df),
+        "bibtex":(export_bibtex, catalog_df),
+    }
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+    paths = dict((f, os.path.join(output_dir, f"{prefix}.{EXPORT_FORMATS[f]}")) for f in formats)
+    with ThreadPoolExecutor(max_workers=max_workers or len(formats)) as executor:
+        futures = [executor.submit(writers[f][0], writers[f][1], paths[f]) for f in formats]
+        for future in futures:
+            future.result()
+    return paths
@@ -0,0 +1,203 @@
+###################
+### Imports
+###################
+
+## Standard Libraries
+import os
+import json
+from concurrent.futures import ProcessPoolExecutor
+
+## External Libraries
+import numpy as np
+
+## Local
+from .memo import hash_object
+
+###################
+### Globals
+###################
+
+## Manifest of Rendered Figure Hashes (Path -> Key)
+MANIFEST_PATH = "./.cache/figures/manifest.json"
+
+## Default Figure Styling
+DEFAULT_STYLE = {
+    "figsize":(8,6),
+    "color":"navy",
+    "alpha":0.7,
+    "label_fontsize":28,
+    "tick_fontsize":18,
+    "dpi":300,
+}
+
+###################
+### Backend
+###################
+
+def _pyplot():
+    """
+    Import pyplot with the non-interactive Agg backend (safe in worker
+    processes and headless environments).
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    return plt
+
+def _format_axes(ax, spec, style):
+    """
+
+    """
+    if spec.get("xlabel"):
+        ax.set_xlabel(spec["xlabel"], fontweight="bold", fontsize=style["label_fontsize"])
+    if spec.get("ylabel"):
+        ax.set_ylabel(spec["ylabel"], fontweight="bold", fontsize=style["label_fontsize"])
+    ax.spines["top"].set_visible(False)
+    ax.spines["right"].set_visible(False)
+    ax.tick_params(labelsize=style["tick_fontsize"])
+
+###################
+### Figure Kinds
+###################
+
+def _plot_bar(ax, spec, style):
+    """
+    Vertical bars with value annotations (e.g. filtering stage counts).
+    """
+    data = spec["data"]
+    ax.bar(range(data.shape[0]),
+           data.values,
+           color=style["color"],
+           alpha=style["alpha"],
+           edgecolor=style["color"])
+    for i, c in enumerate(data.values):
+        ax.text(i, c + 1, int(c), fontsize=style["tick_fontsize"], ha="center", va="bottom")
+    ax.set_xticks(range(data.shape[0]))
+    ax.set_xticklabels(spec.get("ticklabels", data.index.tolist()),
+                       rotation=spec.get("rotation", 0),
+                       ha="center")
+    ax.set_ylim(0, data.max() + spec.get("headroom", 0))
+
+def _plot_barh(ax, spec, style):
+    """
+    Horizontal bars for label distributions (largest at the top).
+    """
+    data = spec["data"].sort_values()
+    if spec.get("top") is not None:
+        data = data.iloc[-spec["top"]:]
+    ax.barh(range(data.shape[0]),
+            data.values,
+            color=style["color"],
+            alpha=style["alpha"],
+            edgecolor=style["color"])
+    ax.set_yticks(range(data.shape[0]))
+    ax.set_yticklabels(data.index.tolist())
+
+def _plot_hist(ax, spec, style):
+    """
+    Overlaid log10 histograms for one or more size series (dict of label ->
+    Series).
+    """
+    series = dict((label, s.dropna()) for label, s in spec["data"].items())
+    series = dict((label, np.log10(s[s > 0].astype(float))) for label, s in series.items() if len(s) > 0)
+    if len(series) == 0:
+        return
+    all_values = np.concatenate([s.values for s in series.values()])
+    bins = np.linspace(np.floor(all_values.min()), np.ceil(all_values.max()), spec.get("bins", 20))
+    alpha = style["alpha"] if len(series) == 1 else 0.5
+    for label, values in series.items():
+        ax.hist(values, bins=bins, alpha=alpha, label=label, edgecolor="black")
+    ax.legend(loc="best", fontsize=style["tick_fontsize"] * 0.75, frameon=False)
+
+## Kind -> Plotting Function
+FIGURE_KINDS = {
+    "bar":_plot_bar,
+    "barh":_plot_barh,
+    "hist":_plot_hist,
+}
+
+###################
+### Rendering
+###################
+
+def render_figure(spec):
+    """
+    Render a single figure specification to disk.
+
+    Args:
+        spec (dict): Figure specification with "path", "kind", "data" (Series,
+                     or dict of Series for "hist"), "style" and optional axis
+                     labels / kind-specific options
+
+    Returns:
+        path (str): Path to the rendered figure
+    """
+    plt = _pyplot()
+    style = dict(DEFAULT_STYLE, **spec.get("style", {}))
+    fig, ax = plt.subplots(figsize=style["figsize"])
+    FIGURE_KINDS[spec["kind"]](ax, spec, style)
+    _format_axes(ax, spec, style)
+    fig.tight_layout()
+    fig.savefig(spec["path"], dpi=style["dpi"])
+    plt.close(fig)
+    return spec["path"]
+
+def figure_key(spec):
+    """
+    Hash of everything that determines a figure's appearance (data, style,
+    kind and options).
+    """
+    return hash_object(dict((k, v) for k, v in spec.items() if k != "path"))
+
+def _load_manifest(manifest_path):
+    """
+
+    """
+    if manifest_path is None or not os.path.exists(manifest_path):
+        return {}
+    with open(manifest_path, "r") as the_file:
+        return json.load(the_file)
+
+def _write_manifest(manifest_path, manifest):
+    """
+
+    """
+    manifest_dir = os.path.dirname(manifest_path)
+    if manifest_dir and not os.path.exists(manifest_dir):
+        os.makedirs(manifest_dir)
+    with open(manifest_path, "w") as the_file:
+        json.dump(manifest, the_file, indent=1, sort_keys=True)
+
+def render_figures(specs,
+                   manifest_path=MANIFEST_PATH,
+                   max_workers=None):
+    """
+    Render independent figures in a process pool, skipping any figure whose
+    file exists and whose data/style hash matches the last render.
+
+    Args:
+        specs (list of dict): Figure specifications (see render_figure)
+        manifest_path (str or None): Where rendered hashes are recorded (None
+                                     always re-renders)
+        max_workers (int or None): Process pool size (default: one per stale
+                                   figure, capped at the CPU count)
+
+    Returns:
+        figure_paths (list of str): Paths to every figure (rendered or skipped)
+    """
+    manifest = _load_manifest(manifest_path)
+    keys = dict((spec["path"], figure_key(spec)) for spec in specs)
+    stale = [spec for spec in specs if not os.path.exists(spec["path"]) or manifest.get(spec["path"]) != keys[spec["path"]]]
+    for output_dir in set(os.path.dirname(spec["path"]) for spec in stale):
+        if output_dir and not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+    if len(stale) == 1:
+        _ = render_figure(stale[0])
+    elif len(stale) > 1:
+        max_workers = max_workers or min(len(stale), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            _ = list(executor.map(render_figure, stale))
+    if manifest_path is not None and len(stale) > 0:
+        manifest.update(dict((spec["path"], keys[spec["path"]]) for spec in stale))
+        _write_manifest(manifest_path, manifest)
+    return [spec["path"] for spec in specs]
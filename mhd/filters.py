@@ -0,0 +1,176 @@
+###################
+### Imports
+###################
+
+## Standard Libraries
+import json
+
+## External Libraries
+import pandas as pd
+import numpy as np
+
+## Local
+from .encoding import is_list_column, list_array, explode_lists, filter_items
+
+###################
+### Filter Masks
+###################
+
+def year_range_mask(df, column="year", min_year=None, max_year=None):
+    """
+    Keep rows whose year falls within [min_year, max_year] (bounds optional).
+    """
+    mask = pd.Series(True, index=df.index)
+    if min_year is not None:
+        mask &= df[column] >= min_year
+    if max_year is not None:
+        mask &= df[column] <= max_year
+    return mask
+
+def flag_mask(df, column):
+    """
+    Keep rows where a boolean column is True.
+    """
+    return df[column].astype(bool)
+
+def not_missing_mask(df, column, missing_values=None):
+    """
+    Keep rows that are non-null and not one of the placeholder missing values.
+    Empty lists (e.g. tasks coded "na") count as missing in list columns.
+    """
+    values = df[column]
+    mask = values.notnull()
+    if is_list_column(values):
+        mask &= list_array(values).value_lengths().to_numpy(zero_copy_only=False) > 0
+    elif missing_values:
+        mask &= ~values.isin(missing_values)
+    return mask.astype(bool)
+
+def exclude_labels_mask(df, column, labels):
+    """
+    Drop rows of a list column whose labels all fall in the excluded list.
+    Missing and empty lists are kept.
+    """
+    rows, items = explode_lists(df[column])
+    has_labels = np.zeros(len(df), dtype=bool)
+    has_labels[rows] = True
+    allowed = np.zeros(len(df), dtype=bool)
+    allowed[rows[~pd.Series(items).isin(labels).values]] = True
+    return pd.Series(allowed | ~has_labels, index=df.index)
+
+def include_values_mask(df, column, values):
+    """
+    Keep rows whose value is one of the listed values.
+    """
+    return df[column].isin(values)
+
+def exclude_values_mask(df, column, values):
+    """
+    Keep rows whose value is not one of the listed values.
+    """
+    return ~df[column].isin(values)
+
+## Registry of Filter Types Available to Configuration Files
+FILTER_TYPES = {
+    "year_range":year_range_mask,
+    "flag":flag_mask,
+    "not_missing":not_missing_mask,
+    "exclude_labels":exclude_labels_mask,
+    "include_values":include_values_mask,
+    "exclude_values":exclude_values_mask,
+}
+
+###################
+### Pipeline
+###################
+
+def load_filter_config(path):
+    """
+    Load a review protocol (ordered filtering stages) from a JSON file.
+
+    Args:
+        path (str): Path to the configuration file
+
+    Returns:
+        config (dict): Protocol with a "name" and a list of "stages". Each stage
+                       has a "name", a list of "filters" and an optional
+                       "count_only" flag (counted but not applied downstream).
+    """
+    with open(path, "r") as the_file:
+        config = json.load(the_file)
+    for stage in config["stages"]:
+        for filt in stage["filters"]:
+            if filt["type"] not in FILTER_TYPES:
+                raise ValueError(f"Unknown filter type: {filt['type']}")
+    return config
+
+def _filter_mask(df, filt):
+    """
+
+    """
+    kwargs = dict((x, y) for x, y in filt.items() if x not in ["type","description"])
+    return FILTER_TYPES[filt["type"]](df, **kwargs)
+
+def build_filter_masks(df, config):
+    """
+    Evaluate every stage of a review protocol against a loaded catalog. Masks
+    are computed over the full frame (no intermediate copies) and combined
+    cumulatively in stage order.
+
+    Args:
+        df (pandas DataFrame): Processed catalog
+        config (dict): Protocol from load_filter_config
+
+    Returns:
+        masks (pandas DataFrame): One boolean column per stage marking rows that
+                                  survive through that stage
+    """
+    masks = {}
+    current = pd.Series(True, index=df.index)
+    for stage in config["stages"]:
+        stage_mask = current.copy()
+        for filt in stage["filters"]:
+            stage_mask &= _filter_mask(df, filt)
+        masks[stage["name"]] = stage_mask
+        if not stage.get("count_only", False):
+            current = stage_mask
+    masks = pd.DataFrame(masks, index=df.index)
+    return masks
+
+def get_filter_counts(masks):
+    """
+    Number of rows surviving each stage.
+
+    Args:
+        masks (pandas DataFrame): Output of build_filter_masks
+
+    Returns:
+        counts (pandas Series): Survivor count per stage, in stage order
+    """
+    return masks.sum()
+
+def select_stage(df, masks, config, stage):
+    """
+    Materialize the rows surviving through a stage. Labels excluded by
+    "exclude_labels" filters up to that stage are also removed from the
+    surviving rows' label lists.
+
+    Args:
+        df (pandas DataFrame): Processed catalog
+        masks (pandas DataFrame): Output of build_filter_masks
+        config (dict): Protocol from load_filter_config
+        stage (str): Name of the stage to select through
+
+    Returns:
+        stage_df (pandas DataFrame): Filtered copy of the catalog
+    """
+    stage_df = df.loc[masks[stage]].copy()
+    for s in config["stages"]:
+        if not s.get("count_only", False):
+            for filt in s["filters"]:
+                if filt["type"] == "exclude_labels":
+                    _, items = explode_lists(stage_df[filt["column"]])
+                    stage_df[filt["column"]] = filter_items(stage_df[filt["column"]], ~pd.Series(items).isin(filt["labels"]).values)
+        if s["name"] == stage:
+            break
+    return stage_df
@@ -0,0 +1,437 @@
+###################
+### Imports
+###################
+
+## Standard Libraries
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+## External Libraries
+import pandas as pd
+import numpy as np
+
+## Local
+from .catalog import load_catalog, append_catalogs
+from .config import CATALOG_PATH, RAW_CATALOG_PATH
+from .dedup import normalize_title
+from .labels import AVAILABILITY_LABELS
+from .schema import STANDARDIZED_SCHEMA, RAW_SCHEMA, ANNOTATION_LEVELS, LABEL_PATTERN, validate_catalog
+
+###################
+### Globals
+###################
+
+## Form Export Header -> Standardized Column (Headers Are Matched Case-Insensitively;
+## Standardized Column Names Are Also Accepted As Headers)
+FORM_FIELDS = {
+    "paper":"title",
+    "authors":"authors",
+    "year":"year",
+    "platform":"platforms",
+    "target outcomes":"tasks",
+    "annotation style":"annotation_style",
+    "annotation level":"annotation_level",
+    "size":"size",
+    "availability":"availability",
+    "primary language":"primary_language",
+    "source ids":"source_ids",
+    "reference link":"reference_link",
+}
+
+## Standardized Column -> Raw Sheet Column (Rows Appended to data_sources.xlsx)
+RAW_FIELDS = {
+    "title":"Paper",
+    "authors":"Authors",
+    "year":"Year",
+    "platforms":"Platform",
+    "tasks":"Target Outcomes",
+    "labeling_methodology":"Labeling Methodology",
+    "size":"Size",
+    "availability":"Availability",
+    "additional_comments":"Additional Comments",
+    "dataset_link":"Dataset Link (if any)",
+    "reference_link":"Reference Link",
+}
+
+## Free-Text Spellings -> Label Codes (Applied After normalize_label)
+LABEL_ALIASES = {
+    "platforms":{
+        "askfm":"ask_fm",
+        "livejournal":"live_journal",
+        "google_search":"web_search",
+        "web_browsing_history":"web_search",
+        "crisis_text_line":"sms",
+        "synthetic_crisis_text_conversations":"sms_(synthetic)",
+        "weibo":"sina_weibo",
+        "reachout":"reach_out",
+        "teenhelp_org":"teen_help_(online_forum)",
+        "ptt":"ptt_(bbs)",
+        "online_forum":"online_forums",
+        "online_support_forums":"online_forums",
+    },
+    "tasks":{
+        "bipolar":"bipolar_disorder",
+        "borderline_personality":"borderline_personality_disorder",
+        "eating_disorder":"eating",
+        "anorexia":"eating",
+        "anorexia_(recovery)":"eating_(recovery)",
+        "suicidal_ideation":"suicide_(ideation)",
+        "suicidality":"suicide_(ideation)",
+        "suicidal_risk":"suicide_(ideation)",
+        "suicide_attempt":"suicide_(attempt)",
+        "self_hard":"self_harm",
+        "non_suicidal_self_injury":"self_harm",
+        "social_anxiety":"anxiety_(social)",
+        "rape_survivors":"rape_(survivors)",
+        "panic_attacks":"panic",
+        "post_partum_depression":"postpartum_depression",
+        "obsessive_compulsive_disorder":"ocd",
+        "major_depressive_disorder":"depression",
+        "mental_health_(general)":"mental_health_(combined)",
+        "drug_use":"substance_use",
+        "depression_diagnosis_date":"depression_(diagnoses_date)",
+    },
+    "annotation_style":{
+        "regular_expressions":"regular_expression",
+        "regex":"regular_expression",
+        "keyword_matching":"regular_expression",
+        "manual":"manual_annotation",
+        "hashtags":"hashtag_usage",
+        "clinical_survey":"survey_(clinical)",
+    },
+    "primary_language":{},
+    "annotation_level":{},
+}
+
+## Target Outcomes That Are Not Tasks (Control Groups)
+IGNORED_LABELS = {"tasks":["control","controls"]}
+
+## Availability (Normalized Text Prefix -> Code; First Match Wins)
+AVAILABILITY_PREFIXES = [
+    ("not_available", "not_available_for_distribution"),
+    ("no_longer", "no_longer_exists"),
+    ("reproducible", "reproducible_via_api"),
+    ("available_via_signed", "available_via_signed_agreement"),
+    ("signed_agreement", "available_via_signed_agreement"),
+    ("available_via_author", "available_via_author_contact"),
+    ("available_upon_request", "available_via_author_contact"),
+    ("available_pending", "pending"),
+    ("pending", "pending"),
+    ("freely_available", "available_via_download"),
+    ("available_via_download", "available_via_download"),
+    ("available_for_download", "available_via_download"),
+]
+
+## Size Units -> Size Column
+SIZE_UNITS = {
+    "n_individuals":["individual","user","participant","people","subject","patient","respondent","account"],
+    "n_documents":["tweet","post","document","message","comment","text","blog","entry","entries","essay","statement","note","data point"],
+    "n_conversations":["conversation","chat","session","thread"],
+}
+
+## Counts Followed by a Unit (e.g. "1,593 individuals", "992k tweets", "1.0M tweets")
+SIZE_MENTION = re.compile(r"(?P<count>\d[\d,]*(?:\.\d+)?)\s*(?P<scale>[kKmM](?![a-zA-Z]))?\s+(?P<unit>data points?|[A-Za-z]+)")
+
+## Markers for Size Columns Left Empty (Matching Existing Rows)
+MISSING_SIZES = {"n_conversations":"na"}
+
+## Rows Normalized per Worker Task
+CHUNK_SIZE = 1000
+
+###################
+### Label Normalization
+###################
+
+def normalize_label(text):
+    """
+    Free text -> label code style (lowercase, underscores, parentheses kept),
+    e.g. "Seasonal Affective Disorder (SAD)" -> "seasonal_affective_disorder_(sad)".
+    """
+    text = re.sub(r"^\s*and\s+", "", str(text).strip(), flags=re.IGNORECASE).lower().replace("'", "")
+    text = re.sub(r"[^a-z0-9()]+", "_", text)
+    text = re.sub(r"_*([()])_*", r"\1", text)
+    text = re.sub(r"(?<=[a-z0-9)])\(", "_(", re.sub(r"\)(?=[a-z0-9(])", ")_", text))
+    return text.strip("_")
+
+def resolve_label(text, vocabulary, aliases):
+    """
+    Map one free-text label to a known code. Tries the normalized text, its
+    alias, the text without a trailing parenthetical description and the
+    singular form, in that order.
+
+    Returns:
+        code (str or None): Known code (None if unresolved)
+        normalized (str): Normalized text (used for new labels)
+    """
+    normalized = normalize_label(text)
+    stripped = re.sub(r"_?\([^()]*\)$", "", normalized)
+    for candidate in [normalized, stripped, stripped[:-1] if stripped.endswith("s") else stripped]:
+        candidate = aliases.get(candidate, candidate)
+        if candidate in vocabulary:
+            return candidate, normalized
+    return None, normalized
+
+def encode_labels(text, column, vocabularies, allow_new_labels=False):
+    """
+    Encode a comma-separated free-text cell as a label set.
+
+    Returns:
+        codes (str or float): ", "-joined codes, "na" for "None ..." and NaN if empty
+        unknown (list of str): Labels that could not be resolved
+    """
+    if pd.isnull(text) or str(text).strip() == "":
+        return np.nan, []
+    if str(text).strip().lower().startswith("none") or str(text).strip().lower() == "na":
+        return "na", []
+    codes, unknown = [], []
+    for part in str(text).replace("/", ",").replace(";", ",").split(","):
+        if part.strip() == "":
+            continue
+        code, normalized = resolve_label(part, vocabularies[column], LABEL_ALIASES.get(column, {}))
+        if normalized in IGNORED_LABELS.get(column, []):
+            continue
+        if code is None:
+            if allow_new_labels and re.fullmatch(LABEL_PATTERN, normalized):
+                code = normalized
+            else:
+                unknown.append(part.strip())
+                continue
+        if code not in codes:
+            codes.append(code)
+    return (", ".join(codes) if len(codes) > 0 else np.nan), unknown
+
+def encode_availability(text):
+    """
+    Availability code of a free-text availability statement (None if unresolved).
+    """
+    if pd.isnull(text) or str(text).strip() == "":
+        return np.nan
+    normalized = normalize_label(text)
+    if normalized in AVAILABILITY_LABELS:
+        return normalized
+    for code, display in AVAILABILITY_LABELS.items():
+        if normalized == normalize_label(display):
+            return code
+    for prefix, code in AVAILABILITY_PREFIXES:
+        if normalized.startswith(prefix):
+            return code
+    return None
+
+def _format_count(count):
+    """
+    Count in the catalog's size notation (e.g. 476, 1.593k).
+    """
+    if count >= 1000:
+        return "{:g}k".format(round(count / 1000, 3))
+    return "{:g}".format(count)
+
+def encode_sizes(text, vocabularies):
+    """
+    Parse a free-text Size cell into the n_individuals / n_documents /
+    n_conversations columns. Lines or ";"-separated segments may start with
+    a class label ("Depression: 441 individuals (1.0M tweets)"); counts
+    without one are recorded as "combined".
+
+    Returns:
+        sizes (dict): Size column -> "<label> (<count>), ..." (parsed columns only)
+    """
+    if pd.isnull(text):
+        return {}
+    unit_columns = dict((unit, col) for col, units in SIZE_UNITS.items() for unit in units)
+    totals = {}
+    for segment in re.split(r"[\n;]", str(text)):
+        label = "combined"
+        match = re.match(r"\s*([^:\d]+):", segment)
+        if match is not None:
+            code, normalized = resolve_label(match.group(1), vocabularies["tasks"], LABEL_ALIASES["tasks"])
+            label = code or normalized
+        for mention in SIZE_MENTION.finditer(segment):
+            unit = mention.group("unit").lower()
+            unit = unit if unit in unit_columns else unit.rstrip("s")
+            if unit not in unit_columns:
+                continue
+            count = float(mention.group("count").replace(",", ""))
+            count *= {"k":1e3, "m":1e6}.get((mention.group("scale") or "").lower(), 1)
+            column_totals = totals.setdefault(unit_columns[unit], {})
+            column_totals[label] = column_totals.get(label, 0) + count
+    return dict((col, ", ".join(f"{label} ({_format_count(count)})" for label, count in counts.items())) for col, counts in totals.items())
+
+###################
+### Submissions
+###################
+
+def read_submissions(path):
+    """
+    Read a form export (.csv, .jsonl or .json lines) with headers mapped to
+    standardized column names. Unrecognized headers (e.g. the form's
+    Timestamp) are kept as they are.
+    """
+    if path.endswith(".csv"):
+        df = pd.read_csv(path, dtype=str)
+    elif path.endswith(".jsonl") or path.endswith(".json"):
+        df = pd.read_json(path, lines=True, dtype=False)
+    else:
+        raise ValueError(f"Unsupported submission format: {path}")
+    columns = dict((col, FORM_FIELDS.get(str(col).strip().lower(), str(col).strip())) for col in df.columns)
+    df = df.rename(columns=columns)
+    df["source_file"] = os.path.basename(path)
+    return df
+
+def known_vocabularies(catalog_df):
+    """
+    Label codes already used in the standardized catalog.
+    """
+    vocabularies = {}
+    for col in ["platforms","tasks","annotation_style","primary_language"]:
+        labels = catalog_df[col].dropna().astype(str).str.split(",").explode().str.strip()
+        vocabularies[col] = set(labels.loc[labels != "na"])
+    vocabularies["annotation_level"] = set(ANNOTATION_LEVELS)
+    return vocabularies
+
+def _normalize_chunk(args):
+    """
+    Normalize a chunk of submissions into standardized rows (worker task).
+
+    Returns:
+        rows (pandas DataFrame): Standardized columns (paper_id unassigned)
+        errors (pandas DataFrame): "row", "column", "value", "message", "severity"
+    """
+    chunk, vocabularies, allow_new_labels = args
+    rows, errors = [], []
+    ## Label Cells Repeat Heavily, So Each Distinct Value Is Encoded Once
+    encoded = {}
+    for index, submission in zip(chunk.index, chunk.to_dict("records")):
+        get = lambda col: submission[col] if col in submission and not pd.isnull(submission[col]) else np.nan
+        row = {"title":get("title"), "authors":get("authors"), "year":get("year")}
+        for col in ["platforms","tasks","annotation_style","annotation_level","primary_language"]:
+            if (col, get(col)) not in encoded:
+                encoded[(col, get(col))] = encode_labels(get(col), col, vocabularies, allow_new_labels)
+            row[col], unknown = encoded[(col, get(col))]
+            errors.extend((index, col, label, "unknown label", "error") for label in unknown)
+        ## Sizes (Explicit Columns Take Precedence Over the Free-Text Size)
+        sizes = encode_sizes(get("size"), vocabularies)
+        for col in SIZE_UNITS:
+            row[col] = get(col) if not pd.isnull(get(col)) else sizes.get(col, MISSING_SIZES.get(col, np.nan))
+        if not pd.isnull(get("size")) and len(sizes) == 0:
+            errors.append((index, "size", get("size"), "no counts recognized (fill n_individuals/n_documents)", "warning"))
+        if ("availability", get("availability")) not in encoded:
+            encoded[("availability", get("availability"))] = encode_availability(get("availability"))
+        row["availability"] = encoded[("availability", get("availability"))]
+        if row["availability"] is None:
+            errors.append((index, "availability", get("availability"), "unknown availability", "error"))
+            row["availability"] = np.nan
+        row["source_ids"] = get("source_ids")
+        row["reference_link"] = get("reference_link")
+        rows.append(row)
+    rows = pd.DataFrame(rows, index=chunk.index)
+    return rows, pd.DataFrame(errors, columns=["row","column","value","message","severity"])
+
+def normalize_submissions(submissions, vocabularies, allow_new_labels=False, max_workers=None, chunksize=CHUNK_SIZE):
+    """
+    Normalize submissions into the standardized schema, chunked over a
+    process pool (small batches run in-process).
+
+    Args:
+        submissions (pandas DataFrame): Output of read_submissions
+        vocabularies (dict): Column -> known label codes
+        allow_new_labels (bool): Accept well-formed labels not yet in the catalog
+        max_workers (int or None): Process pool size (default: CPU count)
+        chunksize (int): Rows per worker task
+
+    Returns:
+        rows (pandas DataFrame): Standardized rows (index aligned with submissions)
+        errors (pandas DataFrame): Problems found (severity "error" rejects a row)
+    """
+    chunks = [(submissions.iloc[i:i+chunksize], vocabularies, allow_new_labels) for i in range(0, len(submissions), chunksize)]
+    if len(chunks) <= 1:
+        results = [_normalize_chunk(chunk) for chunk in chunks]
+    else:
+        max_workers = max_workers or min(len(chunks), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(_normalize_chunk, chunks))
+    if len(results) == 0:
+        return pd.DataFrame(), pd.DataFrame(columns=["row","column","value","message","severity"])
+    rows = pd.concat([r[0] for r in results])
+    errors = pd.concat([r[1] for r in results], ignore_index=True)
+    return rows, errors
+
+def _title_keys(titles, years):
+    """
+    Duplicate-detection keys (normalized title and year).
+    """
+    return normalize_title(pd.Series(titles)).values + " (" + pd.Series(years).astype(str).str.replace(r"\.0$", "", regex=True).values + ")"
+
+def ingest_submissions(paths,
+                       catalog_path=CATALOG_PATH,
+                       raw_catalog_path=RAW_CATALOG_PATH,
+                       allow_new_labels=False,
+                       max_workers=None,
+                       dry_run=False):
+    """
+    Merge form exports into both catalog workbooks in one pass. Submissions
+    are normalized in a process pool, validated against both sheet schemas
+    and the known label vocabularies, and de-duplicated (by title and year)
+    against the catalog and each other. Only new, valid rows are appended,
+    to both workbooks together (if either write fails, neither workbook
+    changes); the cached Parquet copies are extended in place so the next
+    load does not re-parse the workbooks.
+
+    Args:
+        paths (list of str): Form exports (.csv or .jsonl)
+        catalog_path (str): Standardized catalog workbook
+        raw_catalog_path (str): Raw catalog workbook (None to skip)
+        allow_new_labels (bool): Accept well-formed labels not yet in the catalog
+        max_workers (int or None): Process pool size
+        dry_run (bool): Report without appending
+
+    Returns:
+        result (dict): "appended" standardized rows, "duplicates" (submission
+                       rows skipped), "errors" (all problems found, by
+                       source file and submission row) and
+                       "rejected" (submission rows with errors)
+    """
+    submissions = pd.concat([read_submissions(path) for path in paths], ignore_index=True)
+    catalog_df = load_catalog(catalog_path)
+    rows, errors = normalize_submissions(submissions, known_vocabularies(catalog_df), allow_new_labels, max_workers)
+    ## Skip Papers Already in the Catalog (or Submitted Twice)
+    keys = pd.Series(_title_keys(rows["title"].fillna(""), rows["year"]), index=rows.index)
+    existing = set(_title_keys(catalog_df["title"], catalog_df["year"]))
+    duplicates = rows.index[keys.isin(existing).values | keys.duplicated().values]
+    rows = rows.drop(index=duplicates)
+    ## Provisional Identifiers (New Papers Are Their Own Source Unless Stated Otherwise)
+    first_id = int(catalog_df["paper_id"].max()) + 1
+    self_sourced = rows["source_ids"].isnull()
+    rows["paper_id"] = np.arange(len(rows)) + first_id
+    rows["source_ids"] = rows["source_ids"].where(~self_sourced, rows["paper_id"]).astype(str).str.replace(r"\.0$", "", regex=True)
+    rows["year"] = pd.to_numeric(rows["year"], errors="coerce")
+    rows = rows[list(STANDARDIZED_SCHEMA.keys())]
+    ## Raw Sheet Rows (Submitted Text, Prepared Before Anything Is Written)
+    raw_rows = submissions.loc[rows.index].rename(columns=RAW_FIELDS)
+    raw_rows["Year"] = rows["year"].values
+    raw_rows = raw_rows.reindex(columns=list(RAW_SCHEMA.keys()))
+    ## Validate Both Sheets and Reject Rows with Errors
+    schema_errors = validate_catalog(rows, STANDARDIZED_SCHEMA).assign(severity="error")
+    errors = pd.concat([errors, schema_errors], ignore_index=True)
+    if raw_catalog_path is not None:
+        raw_errors = validate_catalog(raw_rows, RAW_SCHEMA).assign(severity="error")
+        errors = pd.concat([errors, raw_errors], ignore_index=True)
+    errors.insert(0, "source_file", submissions["source_file"].reindex(errors["row"]).values)
+    rejected = pd.Index(errors.loc[errors["severity"] == "error", "row"].dropna().unique())
+    rows = rows.drop(index=rows.index.intersection(rejected))
+    raw_rows = raw_rows.loc[rows.index]
+    ## Final Identifiers (Contiguous After Rejections)
+    rows["paper_id"] = np.arange(len(rows)) + first_id
+    rows["source_ids"] = rows["source_ids"].where(~self_sourced.loc[rows.index], rows["paper_id"].astype(str))
+    result = {"appended":rows.reset_index(drop=True),
+              "duplicates":submissions.loc[duplicates],
+              "errors":errors,
+              "rejected":submissions.loc[submissions.index.intersection(rejected)]}
+    if dry_run or len(rows) == 0:
+        return result
+    ## Write Both Workbooks Together (Neither Changes if Either Write Fails)
+    appends = [(catalog_path, rows, 0)]
+    if raw_catalog_path is not None:
+        appends.append((raw_catalog_path, raw_rows, 0))
+    _ = append_catalogs(appends)
+    return result
@@ -0,0 +1,185 @@
+###################
+### Imports
+###################
+
+## Standard Libraries
+from functools import lru_cache
+
+## External Libraries
+import pandas as pd
+import numpy as np
+import pyarrow as pa
+
+## Local
+from .encoding import list_array, explode_lists, rebuild_lists, to_list_column, join_items
+
+###################
+### Lookup Tables
+###################
+
+## Availability Code -> Display Label
+AVAILABILITY_LABELS = {
+    "not_available_for_distribution":"Not Available (Prohibited)",
+    "no_longer_exists":"Not Available (No Longer Exists)",
+    "available_via_signed_agreement":"Available (Signed Agreement)",
+    "available_via_author_contact":"Available (Author Discretion)",
+    "available_via_download":"Available (No Restrictions)",
+    "reproducible_via_api":"Available (Reproducible via API)",
+    "pending":"Pending Availability",
+}
+
+## Label for Missing Availability
+UNKNOWN_AVAILABILITY = "Unknown"
+
+## Task Codes Whose Display Name Is Not Title Case
+TASK_NAME_OVERRIDES = {
+    "adhd":"ADHD",
+    "ocd":"OCD",
+    "ptsd":"PTSD",
+    "mental_health_(combined)":"Mental Health Disorder (General)",
+    "rape_(survivor)":"Trauma (Rape Survivor)",
+}
+
+## Task Display Name -> Abbreviation
+TASK_ABBREVIATIONS = {
+    "Suicide (Ideation)":"SI",
+    "Suicide (Attempt)":"SA",
+    "Bipolar Disorder":"BIPD",
+    "Borderline Personality Disorder":"BRPD",
+    "PTSD": "PTSD",
+    "Seasonal Affective Disorder": "SAD",
+    "Depression": "DEP",
+    "Anxiety": "ANX",
+    "Eating": "EAT",
+    "Eating (Recovery)":"EATR",
+    "OCD": "OCD",
+    "Schizophrenia": "SCHZ",
+    "ADHD": "ADHD",
+    "Psychosis": "PSY",
+    "Anxiety (Social)": "ANXS",
+    "Self Harm": "SH",
+    "Rape (Survivors)": "RS",
+    "Panic": "PAN",
+    "Trauma": "TRA",
+    "Alcoholism": "ALC",
+    "Opiate Addiction": "OPAD",
+    "Aspergers": "ASP",
+    "Autism": "AUT",
+    "Opiate Usage": "OPUS",
+    "Mental Health Disorder (General)": "MHGEN",
+    "Stress": "STR",
+    "Stress (Stressor And Subjects)":"STRS"
+}
+
+###################
+### Single Labels (Cached Fallbacks)
+###################
+
+@lru_cache(maxsize=None)
+def clean_task_name(task):
+    """
+    Display name for a task code (e.g. "suicide_(ideation)" -> "Suicide (Ideation)").
+    """
+    if task in TASK_NAME_OVERRIDES:
+        return TASK_NAME_OVERRIDES[task]
+    return task.replace("_"," ").title()
+
+@lru_cache(maxsize=None)
+def task_abbreviation(task):
+    """
+    Abbreviation for a task code (e.g. "depression" -> "DEP").
+    """
+    return TASK_ABBREVIATIONS[clean_task_name(task)]
+
+@lru_cache(maxsize=None)
+def clean_platform_name(platform):
+    """
+    Display name for a platform code (e.g. "sina_weibo" -> "Sina Weibo").
+    """
+    return platform.replace("_"," ").title()
+
+@lru_cache(maxsize=None)
+def availability_label(availability):
+    """
+    Display label for an availability code.
+    """
+    if availability not in AVAILABILITY_LABELS:
+        raise ValueError("Encountered unaccounted availability")
+    return AVAILABILITY_LABELS[availability]
+
+@lru_cache(maxsize=None)
+def availability_short_label(label):
+    """
+    Parenthetical portion of an availability label (e.g. "Signed Agreement").
+    """
+    return label.split("(")[1].split(")")[0]
+
+###################
+### Columns (Once per Unique Value)
+###################
+
+def map_unique(values, func, na_value=np.nan):
+    """
+    Apply a function once per distinct value of a column and broadcast the
+    results back by category code.
+
+    Args:
+        values (pandas Series): Categorical or string column
+        func (callable): Function applied to each distinct non-null value
+        na_value (any): Output for missing cells
+
+    Returns:
+        mapped (pandas Series): Mapped values aligned with the input
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        codes, uniques = values.cat.codes.values, values.cat.categories
+    else:
+        codes, uniques = pd.factorize(values)
+    mapped = np.empty(len(uniques) + 1, dtype=object)
+    mapped[:-1] = [func(u) for u in uniques]
+    mapped[-1] = na_value
+    return pd.Series(mapped[codes], index=values.index, name=values.name)
+
+def map_items(values, func, sep=", "):
+    """
+    Apply a function once per distinct item of a list column and join each
+    row's mapped items.
+
+    Args:
+        values (pandas Series): List column
+        func (callable): Function applied to each distinct item
+        sep (str): Separator between joined items
+
+    Returns:
+        joined (pandas Series): Joined strings aligned with the input (missing
+                                lists stay missing)
+    """
+    rows, items = explode_lists(values)
+    codes, uniques = pd.factorize(items)
+    mapped = np.array([func(u) for u in uniques], dtype=object)[codes]
+    lists = rebuild_lists(list_array(values), rows, pa.array(mapped, type=pa.string()))
+    return join_items(to_list_column(lists, values.index), sep)
+
+def task_abbreviations(tasks):
+    """
+    Join the abbreviations of each row's tasks.
+    """
+    return map_items(tasks, task_abbreviation)
+
+def clean_platform_names(platforms):
+    """
+    Join the display names of each row's platforms.
+    """
+    return map_items(platforms, clean_platform_name)
+
+def availability_labels(availability):
+    """
+    Display label for each row's availability code (missing -> "Unknown").
+    """
+    return map_unique(availability, availability_label, na_value=UNKNOWN_AVAILABILITY)
+
+def availability_short_labels(availability):
+    """
+    Parenthetical portion of each row's availability label.
+    """
+    return map_unique(availability, availability_short_label)
@@ -0,0 +1,232 @@
+###################
+### Imports
+###################
+
+## Standard Libraries
+import os
+from collections import deque
+
+## External Libraries
+import pandas as pd
+import numpy as np
+
+## Local
+from .memo import hash_object, prune_cache
+from .encoding import is_list_column, explode_lists
+
+###################
+### Globals
+###################
+
+## Location of Cached Lineage Indexes
+CACHE_DIR = "./.cache/lineage/"
+
+###################
+### Helpers
+###################
+
+def _explode_sources(paper_ids, source_ids):
+    """
+    Long (paper_id, source_id) pairs from a source_ids column holding either
+    comma-separated strings or Arrow lists of integers.
+    """
+    if is_list_column(source_ids):
+        rows, sources = explode_lists(source_ids)
+        return pd.DataFrame({"paper_id":paper_ids.values[rows].astype(np.int64),
+                             "source_id":sources.astype(np.int64)})
+    sources = pd.Series(source_ids.values, index=paper_ids.values)
+    sources = sources.astype(str).str.split(",").explode().dropna()
+    pairs = pd.DataFrame({"paper_id":sources.index.values.astype(np.int64),
+                          "source_id":pd.to_numeric(pd.Series(sources.values).astype(str).str.strip()).values.astype(np.int64)})
+    return pairs
+
+def _build_csr(rows, cols, n_nodes):
+    """
+    Compressed sparse row adjacency (indptr, indices) from edge positions.
+    """
+    order = np.lexsort((cols, rows))
+    indices = cols[order].astype(np.int32)
+    indptr = np.zeros(n_nodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n_nodes), out=indptr[1:])
+    return indptr, indices
+
+###################
+### Index
+###################
+
+class LineageIndex(object):
+
+    """
+    Dataset reuse graph built from source_ids. An edge runs from a source
+    dataset to each paper that reuses it (self references mark original
+    datasets and are not edges). Adjacency is stored as CSR arrays in both
+    directions, so neighbor queries cost O(degree).
+    """
+
+    def __init__(self, paper_ids, down_indptr, down_indices, up_indptr, up_indices):
+        """
+
+        """
+        self.paper_ids = np.asarray(paper_ids, dtype=np.int64)
+        self.down_indptr = down_indptr
+        self.down_indices = down_indices
+        self.up_indptr = up_indptr
+        self.up_indices = up_indices
+
+    @classmethod
+    def from_catalog(cls, df):
+        """
+        Build the index from a catalog's paper_id and source_ids columns.
+        Sources that do not match a paper_id in the catalog are ignored.
+
+        Args:
+            df (pandas DataFrame): Catalog (raw or normalized source_ids)
+
+        Returns:
+            index (LineageIndex)
+        """
+        paper_ids = np.sort(df["paper_id"].values.astype(np.int64))
+        pairs = _explode_sources(df["paper_id"], df["source_ids"])
+        pairs = pairs.loc[(pairs["paper_id"] != pairs["source_id"]) & pairs["source_id"].isin(paper_ids)]
+        pairs = pairs.drop_duplicates()
+        users = np.searchsorted(paper_ids, pairs["paper_id"].values)
+        sources = np.searchsorted(paper_ids, pairs["source_id"].values)
+        down_indptr, down_indices = _build_csr(sources, users, len(paper_ids))
+        up_indptr, up_indices = _build_csr(users, sources, len(paper_ids))
+        return cls(paper_ids, down_indptr, down_indices, up_indptr, up_indices)
+
+    def save(self, path):
+        """
+        Write the CSR arrays to a compressed .npz file.
+        """
+        np.savez_compressed(path,
+                            paper_ids=self.paper_ids,
+                            down_indptr=self.down_indptr,
+                            down_indices=self.down_indices,
+                            up_indptr=self.up_indptr,
+                            up_indices=self.up_indices)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load an index written by save.
+        """
+        arrays = np.load(path)
+        return cls(arrays["paper_ids"],
+                   arrays["down_indptr"],
+                   arrays["down_indices"],
+                   arrays["up_indptr"],
+                   arrays["up_indices"])
+
+    def _position(self, paper_id):
+        """
+
+        """
+        pos = np.searchsorted(self.paper_ids, paper_id)
+        if pos >= len(self.paper_ids) or self.paper_ids[pos] != paper_id:
+            raise KeyError(f"Unknown paper_id: {paper_id}")
+        return pos
+
+    def _neighbors(self, indptr, indices, pos):
+        """
+
+        """
+        return indices[indptr[pos]:indptr[pos+1]]
+
+    def downstream(self, paper_id):
+        """
+        Papers that directly reuse a paper's dataset.
+        """
+        pos = self._position(paper_id)
+        return self.paper_ids[self._neighbors(self.down_indptr, self.down_indices, pos)].tolist()
+
+    def upstream(self, paper_id):
+        """
+        Datasets a paper directly reuses.
+        """
+        pos = self._position(paper_id)
+        return self.paper_ids[self._neighbors(self.up_indptr, self.up_indices, pos)].tolist()
+
+    def _traverse(self, indptr, indices, paper_id):
+        """
+        Breadth-first traversal returning {paper_id: depth} (excluding the start).
+        """
+        start = self._position(paper_id)
+        depths = {start:0}
+        queue = deque([start])
+        while queue:
+            pos = queue.popleft()
+            for n in self._neighbors(indptr, indices, pos):
+                if n not in depths:
+                    depths[n] = depths[pos] + 1
+                    queue.append(n)
+        del depths[start]
+        return dict((int(self.paper_ids[p]), d) for p, d in depths.items())
+
+    def descendants(self, paper_id):
+        """
+        All papers that transitively build on a paper's dataset, with depth.
+        """
+        return self._traverse(self.down_indptr, self.down_indices, paper_id)
+
+    def ancestors(self, paper_id):
+        """
+        Transitive lineage of a paper's data sources, with depth.
+        """
+        return self._traverse(self.up_indptr, self.up_indices, paper_id)
+
+    def reuse_counts(self):
+        """
+        Number of papers directly reusing each dataset.
+
+        Returns:
+            counts (pandas Series): Reuse count indexed by paper_id
+        """
+        return pd.Series(np.diff(self.down_indptr), index=self.paper_ids, name="reuse_count")
+
+###################
+### Cached Construction
+###################
+
+def build_lineage_index(df, cache_dir=CACHE_DIR):
+    """
+    Load the lineage index for a catalog from disk, building and caching it
+    if the catalog's paper_id/source_ids columns have changed. Only the
+    MEMO_KEEP most recently used indexes are kept.
+
+    Args:
+        df (pandas DataFrame): Catalog
+        cache_dir (str or None): Cache directory (None disables caching)
+
+    Returns:
+        index (LineageIndex)
+    """
+    if cache_dir is None:
+        return LineageIndex.from_catalog(df)
+    key = hash_object([df["paper_id"], df["source_ids"]])
+    cache_path = os.path.join(cache_dir, f"lineage.{key[:16]}.npz")
+    if os.path.exists(cache_path):
+        os.utime(cache_path)
+        return LineageIndex.load(cache_path)
+    index = LineageIndex.from_catalog(df)
+    if not os.path.exists(cache_dir):
+        os.makedirs(cache_dir)
+    index.save(cache_path)
+    prune_cache(cache_dir, "lineage.", ".npz")
+    return index
+
+def reuse_count_column(df, index=None):
+    """
+    Vectorized reuse count for each row of a catalog.
+
+    Args:
+        df (pandas DataFrame): Catalog
+        index (LineageIndex or None): Prebuilt index (built if None)
+
+    Returns:
+        reuse_count (pandas Series): Aligned with df
+    """
+    if index is None:
+        index = build_lineage_index(df)
+    counts = index.reuse_counts()
+    return pd.Series(counts.reindex(df["paper_id"].values).fillna(0).astype(int).values, index=df.index, name="reuse_count")
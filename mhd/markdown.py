@@ -0,0 +1,254 @@
+###################
+### Imports
+###################
+
+## Standard Libraries
+import os
+import json
+import hashlib
+import unicodedata
+
+###################
+### Globals
+###################
+
+## Separator Between Cells When Hashing Rows
+CELL_SEPARATOR = "\x1f"
+
+## Section of the README Holding the Dataset Table
+TABLE_SECTION = "## Dataset Directory"
+
+## Minimum Padding Added to Header Widths (Matches tabulate's Pipe Format)
+MIN_PADDING = 2
+
+## Write Buffer Size for Streaming Output
+WRITE_BUFFER = 1 << 16
+
+###################
+### Hashing
+###################
+
+def hash_row(cells):
+    """
+    Hash a single rendered catalog row.
+
+    Args:
+        cells (list of str): Formatted cell strings
+
+    Returns:
+        row_hash (str): SHA-1 digest of the row
+    """
+    row_str = CELL_SEPARATOR.join(cells)
+    return hashlib.sha1(row_str.encode("utf-8")).hexdigest()
+
+def hash_content(row_hashes, template, columns):
+    """
+    Hash the README content (template text, columns and rows), excluding the
+    **Last Update** timestamp.
+    """
+    hasher = hashlib.sha256()
+    hasher.update(template.encode("utf-8"))
+    hasher.update(CELL_SEPARATOR.join(columns).encode("utf-8"))
+    for h in row_hashes:
+        hasher.update(h.encode("utf-8"))
+    return hasher.hexdigest()
+
+###################
+### Manifest
+###################
+
+def load_manifest(path):
+    """
+    Load the sidecar manifest describing the current README table.
+
+    Args:
+        path (str): Path to the manifest
+
+    Returns:
+        manifest (dict or None): Content hash, columns and ordered row hashes.
+                                 None if no manifest exists.
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path, "r") as the_file:
+        manifest = json.load(the_file)
+    return manifest
+
+def write_manifest(path, content_hash, columns, row_hashes, source_hash=None, widths=None):
+    """
+    Write the sidecar manifest. The optional source hash identifies the
+    inputs the README was rendered from, so an unchanged README can be
+    detected without parsing the workbook. The column widths of the table
+    let later splices pad new rows like the existing ones.
+    """
+    manifest = {"content_hash":content_hash,
+                "columns":list(columns),
+                "widths":None if widths is None else list(widths),
+                "rows":row_hashes,
+                "source_hash":source_hash}
+    with open(path, "w") as the_file:
+        json.dump(manifest, the_file, indent=1)
+
+###################
+### Rendering
+###################
+
+def format_cell(value):
+    """
+    Convert a cell value to its string representation in the table.
+    """
+    if isinstance(value, float) and value != value:
+        return "nan"
+    return str(value)
+
+def display_width(text):
+    """
+    Number of terminal columns a string occupies (combining marks take none,
+    wide East Asian characters take two).
+    """
+    if text.isascii():
+        return len(text)
+    width = 0
+    for ch in text:
+        if unicodedata.combining(ch):
+            continue
+        width += 2 if unicodedata.east_asian_width(ch) in ("W","F") else 1
+    return width
+
+def scan_rows(rows, columns):
+    """
+    Cheap first pass over the rows computing each row's hash and the width
+    of every column. Only the hashes and widths are retained.
+
+    Args:
+        rows (iterable of list): Cell values for each row
+        columns (list of str): Column headers
+
+    Returns:
+        row_hashes (list of str): Hash of each row, in order
+        widths (list of int): Display width of each column
+    """
+    row_hashes = []
+    widths = [len(c) + MIN_PADDING for c in columns]
+    for row in rows:
+        cells = [format_cell(v) for v in row]
+        row_hashes.append(hash_row(cells))
+        for i, c in enumerate(cells):
+            w = display_width(c)
+            if w > widths[i]:
+                widths[i] = w
+    return row_hashes, widths
+
+def format_line(cells, widths, numeric):
+    """
+    Format a single pipe-table line.
+
+    Args:
+        cells (list of str): Formatted cell strings
+        widths (list of int): Column widths
+        numeric (list of bool): Whether each column is right-aligned
+
+    Returns:
+        line (str): Markdown table line
+    """
+    padded = []
+    for c, w, n in zip(cells, widths, numeric):
+        pad = " " * max(w - display_width(c), 0)
+        padded.append(pad + c if n else c + pad)
+    return "| " + " | ".join(padded) + " |"
+
+def format_header(columns, widths, numeric):
+    """
+    Format the header and alignment lines of a pipe table.
+    """
+    header = format_line(list(columns), widths, numeric)
+    rule = []
+    for w, n in zip(widths, numeric):
+        rule.append("-" * (w + 1) + ":" if n else ":" + "-" * (w + 1))
+    rule = "|" + "|".join(rule) + "|"
+    return [header, rule]
+
+def write_table(the_file, rows, columns, widths, numeric):
+    """
+    Stream a pipe table to an open file, one row at a time.
+
+    Args:
+        the_file (file): Writable text file
+        rows (iterable of list): Cell values for each row
+        columns (list of str): Column headers
+        widths (list of int): Column widths from scan_rows
+        numeric (list of bool): Whether each column is right-aligned
+    """
+    lines = format_header(columns, widths, numeric)
+    the_file.write("\n".join(lines))
+    for row in rows:
+        the_file.write("\n")
+        the_file.write(format_line([format_cell(v) for v in row], widths, numeric))
+
+def _find_table(lines):
+    """
+
+    """
+    if TABLE_SECTION not in lines:
+        return None, None
+    start = lines.index(TABLE_SECTION)
+    while start < len(lines) and not lines[start].startswith("|"):
+        start += 1
+    end = start
+    while end < len(lines) and lines[end].startswith("|"):
+        end += 1
+    if start == end:
+        return None, None
+    return start, end
+
+def load_existing_table(readme_path, manifest, columns, widths):
+    """
+    Read the dataset table of an existing README, keyed by row hash.
+
+    Args:
+        readme_path (str): Path to the existing README
+        manifest (dict): Manifest describing the existing README table
+        columns (list of str): Column headers of the table being rendered
+        widths (list of int): Column widths of the table being rendered
+
+    Returns:
+        existing (tuple or None): Header lines and a dict mapping row hashes to
+                                  table lines. None if the README does not line
+                                  up with the manifest (e.g. the columns or
+                                  column widths changed), in which case a full
+                                  render is needed.
+    """
+    if not os.path.exists(readme_path) or manifest["columns"] != list(columns) or manifest.get("widths") != list(widths):
+        return None
+    with open(readme_path, "r") as the_file:
+        lines = the_file.read().split("\n")
+    start, end = _find_table(lines)
+    if start is None or end - start != len(manifest["rows"]) + 2:
+        return None
+    header_lines = lines[start:start+2]
+    row_lines = dict(zip(manifest["rows"], lines[start+2:end]))
+    return header_lines, row_lines
+
+def splice_table(the_file, rows, row_hashes, existing, widths, numeric):
+    """
+    Stream a pipe table that reuses existing README lines for rows whose hash
+    is unchanged, rendering only rows that were added or modified. Column
+    widths match the existing table's (see load_existing_table), so the
+    output is identical to a full write_table.
+
+    Args:
+        the_file (file): Writable text file
+        rows (iterable of list): Cell values for each row
+        row_hashes (list of str): Hash of each row from scan_rows
+        existing (tuple): Output of load_existing_table
+        widths (list of int): Column widths from scan_rows
+        numeric (list of bool): Whether each column is right-aligned
+    """
+    header_lines, row_lines = existing
+    the_file.write("\n".join(header_lines))
+    for h, row in zip(row_hashes, rows):
+        the_file.write("\n")
+        if h in row_lines:
+            the_file.write(row_lines[h])
+        else:
+            the_file.write(format_line([format_cell(v) for v in row], widths, numeric))
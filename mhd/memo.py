@@ -0,0 +1,190 @@
+###################
+### Imports
+###################
+
+## Standard Libraries
+import os
+import pickle
+import hashlib
+import inspect
+import functools
+
+## External Libraries
+import pandas as pd
+import numpy as np
+import pyarrow.compute as pc
+
+## Local
+from .encoding import is_list_column, list_array
+
+###################
+### Globals
+###################
+
+## Location of Memoized Stage Outputs
+MEMO_DIR = "./.cache/stages/"
+
+## Set MHD_NO_MEMO=1 to Disable Memoization
+MEMO_ENABLED = os.environ.get("MHD_NO_MEMO", "0") != "1"
+
+## Cached Outputs Kept per Stage (Most Recently Used First; Older Entries Are Pruned)
+MEMO_KEEP = 2
+
+## Package Whose Modules Stages Call Into (Any Edit Invalidates Cached Outputs)
+PACKAGE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+###################
+### Hashing
+###################
+
+def _canonical_cell(value):
+    """
+    Order-independent representation of a DataFrame cell (sets are sorted).
+    """
+    if isinstance(value, (set, frozenset)):
+        return repr(sorted(value))
+    return repr(value)
+
+def _update_hash(hasher, obj):
+    """
+
+    """
+    if isinstance(obj, pd.DataFrame):
+        hasher.update(b"DataFrame")
+        _update_hash(hasher, list(obj.columns))
+        _update_hash(hasher, obj.index)
+        for col in obj.columns:
+            _update_hash(hasher, obj[col])
+    elif isinstance(obj, (pd.Series, pd.Index)):
+        hasher.update(type(obj).__name__.encode("utf-8"))
+        values = pd.Series(obj)
+        hasher.update(str(values.dtype).encode("utf-8"))
+        if is_list_column(values):
+            ## Arrow Lists: Lengths (-1 for Missing) Then Flattened Items
+            lists = list_array(values)
+            hasher.update(pc.fill_null(pc.list_value_length(lists), -1).to_numpy().tobytes())
+            values = pd.Series(lists.flatten().to_numpy(zero_copy_only=False))
+        elif values.dtype == object:
+            values = values.map(_canonical_cell).astype(str)
+        hasher.update(pd.util.hash_pandas_object(values, index=False).values.tobytes())
+        if isinstance(obj, pd.Series):
+            _update_hash(hasher, obj.name)
+    elif isinstance(obj, np.ndarray):
+        hasher.update(str(obj.dtype).encode("utf-8"))
+        hasher.update(str(obj.shape).encode("utf-8"))
+        hasher.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, dict):
+        hasher.update(b"dict")
+        for key in sorted(obj.keys(), key=repr):
+            _update_hash(hasher, key)
+            _update_hash(hasher, obj[key])
+    elif isinstance(obj, (list, tuple)):
+        hasher.update(type(obj).__name__.encode("utf-8"))
+        for item in obj:
+            _update_hash(hasher, item)
+    elif isinstance(obj, (set, frozenset)):
+        hasher.update(_canonical_cell(obj).encode("utf-8"))
+    else:
+        hasher.update(repr(obj).encode("utf-8"))
+    hasher.update(b"\x1e")
+
+def hash_object(obj):
+    """
+    Deterministic content hash of stage inputs (DataFrames, Series, arrays,
+    containers and scalars). Set-valued cells hash independently of ordering.
+
+    Args:
+        obj (any): Object to hash
+
+    Returns:
+        digest (str): Hexadecimal SHA-256 digest
+    """
+    hasher = hashlib.sha256()
+    _update_hash(hasher, obj)
+    return hasher.hexdigest()
+
+###################
+### Memoization
+###################
+
+@functools.lru_cache(maxsize=None)
+def _file_hash(path):
+    """
+
+    """
+    with open(path, "rb") as the_file:
+        return hashlib.sha256(the_file.read()).hexdigest()
+
+def code_hash(func):
+    """
+    Hash of the code a stage runs: its own source, the module defining it
+    (module-level helpers and constants) and every module of the mhd package.
+
+    Args:
+        func (callable): Stage function
+
+    Returns:
+        digest (str): Hexadecimal SHA-256 digest
+    """
+    package_files = sorted(os.path.join(PACKAGE_DIR, f) for f in os.listdir(PACKAGE_DIR) if f.endswith(".py"))
+    module_file = os.path.abspath(inspect.getsourcefile(func))
+    files = package_files + ([module_file] if module_file not in package_files else [])
+    return hash_object([inspect.getsource(func)] + [[os.path.basename(f), _file_hash(f)] for f in files])
+
+def prune_cache(cache_dir, prefix, suffix, keep=MEMO_KEEP):
+    """
+    Remove all but the `keep` most recently used cache entries named
+    <prefix>*<suffix> in a directory (hits refresh an entry's mtime).
+
+    Args:
+        cache_dir (str): Cache directory
+        prefix (str): Filename prefix shared by the entries (e.g. "normalize.")
+        suffix (str): Filename suffix shared by the entries (e.g. ".pkl")
+        keep (int): Number of entries to keep
+    """
+    entries = [os.path.join(cache_dir, f) for f in os.listdir(cache_dir) if f.startswith(prefix) and f.endswith(suffix)]
+    entries = sorted(entries, key=os.path.getmtime, reverse=True)
+    for path in entries[keep:]:
+        os.remove(path)
+
+def memoize_stage(name, check=None):
+    """
+    Decorator that caches a pipeline stage's output on disk, keyed by a hash
+    of the code it runs (see code_hash), its arguments and keyword arguments.
+    Changing a stage's inputs or parameters only invalidates that stage and
+    the stages that consume its output. Only the MEMO_KEEP most recently
+    used outputs of each stage are kept.
+
+    Args:
+        name (str): Stage name (used in cache filenames)
+        check (callable or None): Optional validator for a cached result (e.g.
+                                  confirm output files still exist). A cached
+                                  result failing the check is recomputed.
+
+    Returns:
+        decorator (callable)
+    """
+    def decorator(func):
+        source_hash = code_hash(func)
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not MEMO_ENABLED:
+                return func(*args, **kwargs)
+            key = hash_object([source_hash, list(args), kwargs])
+            cache_path = f"{MEMO_DIR}{name}.{key[:16]}.pkl"
+            if os.path.exists(cache_path):
+                with open(cache_path, "rb") as the_file:
+                    result = pickle.load(the_file)
+                if check is None or check(result):
+                    os.utime(cache_path)
+                    return result
+            result = func(*args, **kwargs)
+            if not os.path.exists(MEMO_DIR):
+                os.makedirs(MEMO_DIR)
+            with open(cache_path + ".tmp", "wb") as the_file:
+                pickle.dump(result, the_file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(cache_path + ".tmp", cache_path)
+            prune_cache(MEMO_DIR, f"{name}.", ".pkl")
+            return result
+        return wrapper
+    return decorator
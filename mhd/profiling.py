@@ -0,0 +1,178 @@
+###################
+### Imports
+###################
+
+## Standard Libraries
+import os
+import json
+import time
+import atexit
+import cProfile
+import functools
+import tracemalloc
+from contextlib import contextmanager
+
+###################
+### Globals
+###################
+
+## Set MHD_PROFILE=1 to Enable Stage Timing (or Pass --profile)
+PROFILE_ENABLED = os.environ.get("MHD_PROFILE", "0") == "1"
+
+## Set MHD_PROFILE_DUMP=1 to Also Write a cProfile Dump of the Slowest Stage
+PROFILE_DUMP = os.environ.get("MHD_PROFILE_DUMP", "0") == "1"
+
+## Where Reports Are Written
+PROFILE_DIR = "./.cache/profile/"
+
+###################
+### Profiler
+###################
+
+class Profiler(object):
+
+    """
+    Opt-in stage instrumentation. Each stage records wall-clock time, CPU
+    time and peak traced memory (tracemalloc). When dumps are requested every
+    stage also runs under cProfile, and the statistics of the slowest stage
+    are written alongside the report.
+    """
+
+    def __init__(self, enabled=PROFILE_ENABLED, dump=PROFILE_DUMP):
+        """
+
+        """
+        self.enabled = enabled
+        self.dump = dump
+        self.records = []
+        self._stats = {}
+
+    @contextmanager
+    def stage(self, name):
+        """
+        Context manager timing a block of code as a named stage.
+        """
+        if not self.enabled:
+            yield
+            return
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        profile = cProfile.Profile() if self.dump else None
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        if profile is not None:
+            profile.enable()
+        try:
+            yield
+        finally:
+            if profile is not None:
+                profile.disable()
+            wall, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+            _, peak = tracemalloc.get_traced_memory()
+            if started_tracing:
+                tracemalloc.stop()
+            self.records.append({"stage":name,
+                                 "wall_seconds":wall,
+                                 "cpu_seconds":cpu,
+                                 "peak_memory_mb":peak / 1024 ** 2})
+            if profile is not None:
+                self._stats[len(self.records) - 1] = profile
+
+    def report(self):
+        """
+        Stage records, slowest first.
+        """
+        return sorted(self.records, key=lambda r: r["wall_seconds"], reverse=True)
+
+    def format_markdown(self):
+        """
+        Markdown table of stage timings (slowest first).
+        """
+        lines = ["| Stage | Wall (s) | CPU (s) | Peak Memory (MB) |",
+                 "|:------|---------:|--------:|-----------------:|"]
+        for record in self.report():
+            lines.append("| {} | {:.4f} | {:.4f} | {:.2f} |".format(record["stage"],
+                                                                     record["wall_seconds"],
+                                                                     record["cpu_seconds"],
+                                                                     record["peak_memory_mb"]))
+        total = sum(r["wall_seconds"] for r in self.records)
+        lines.append(f"\nTotal instrumented wall time: {total:.4f} s")
+        return "\n".join(lines) + "\n"
+
+    def write_report(self, name, output_dir=PROFILE_DIR):
+        """
+        Write {name}.json and {name}.md timing reports (and {name}.prof for the
+        slowest stage when dumps are enabled).
+
+        Args:
+            name (str): Report name (e.g. the script being profiled)
+            output_dir (str): Output directory
+
+        Returns:
+            paths (list of str): Files written
+        """
+        if len(self.records) == 0:
+            return []
+        if not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+        paths = [os.path.join(output_dir, f"{name}.json"), os.path.join(output_dir, f"{name}.md")]
+        with open(paths[0], "w") as the_file:
+            json.dump(self.report(), the_file, indent=1)
+        with open(paths[1], "w") as the_file:
+            the_file.write(f"# Stage Timings ({name})\n\n")
+            the_file.write(self.format_markdown())
+        if len(self._stats) > 0:
+            slowest = max(self._stats, key=lambda i: self.records[i]["wall_seconds"])
+            paths.append(os.path.join(output_dir, f"{name}.prof"))
+            self._stats[slowest].dump_stats(paths[-1])
+            with open(paths[1], "a") as the_file:
+                the_file.write(f"\ncProfile dump of slowest stage ({self.records[slowest]['stage']}): `{paths[-1]}`\n")
+        return paths
+
+## Shared Profiler Used by the Pipeline Scripts
+PROFILER = Profiler()
+
+###################
+### Hooks
+###################
+
+def profile_stage(name):
+    """
+    Decorator timing every call of a pipeline stage with the shared profiler.
+    Costs nothing beyond a flag check while profiling is disabled.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with PROFILER.stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def stage(name):
+    """
+    Context manager timing a block of script code with the shared profiler.
+    """
+    return PROFILER.stage(name)
+
+def enable_profiling(name, dump=None, output_dir=PROFILE_DIR):
+    """
+    Turn on the shared profiler (e.g. for --profile) and write its report
+    when the interpreter exits, so early exits are still reported.
+
+    Args:
+        name (str): Report name
+        dump (bool or None): Write a cProfile dump of the slowest stage
+                             (default: MHD_PROFILE_DUMP)
+        output_dir (str): Report directory
+    """
+    PROFILER.enabled = True
+    if dump is not None:
+        PROFILER.dump = dump
+    def _report():
+        paths = PROFILER.write_report(name, output_dir)
+        if len(paths) > 0:
+            print(PROFILER.format_markdown())
+            print("Profile written to {}".format(", ".join(paths)))
+    atexit.register(_report)
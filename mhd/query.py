@@ -0,0 +1,234 @@
+###################
+### Imports
+###################
+
+## External Libraries
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+## Local
+from .catalog import load_catalog
+from .config import CATALOG_PATH, INDEX_FIELDS
+from .schema import _to_list_array, to_compact
+from .encoding import list_array, join_items
+
+###################
+### Globals
+###################
+
+## Columns Returned by Queries
+OUTPUT_COLUMNS = ["paper_id",
+                  "title",
+                  "authors",
+                  "year",
+                  "platforms",
+                  "tasks",
+                  "annotation_style",
+                  "primary_language",
+                  "availability",
+                  "n_individuals_total",
+                  "n_documents_total"]
+
+###################
+### Index Construction
+###################
+
+def _group_rows(rows, labels):
+    """
+
+    """
+    labels = pc.utf8_lower(labels).to_numpy(zero_copy_only=False)
+    codes, uniques = pd.factorize(labels)
+    order = np.lexsort((rows, codes))
+    codes, rows = codes[order], rows[order]
+    ## Drop Labels Repeated Within a Cell
+    first = np.ones(len(rows), dtype=bool)
+    first[1:] = (codes[1:] != codes[:-1]) | (rows[1:] != rows[:-1])
+    codes, rows = codes[first], rows[first]
+    if len(rows) == 0:
+        return {}
+    bounds = np.flatnonzero(np.diff(codes)) + 1
+    index = dict(zip(uniques[codes[np.r_[0, bounds]]], np.split(rows, bounds)))
+    return index
+
+def build_inverted_index(column):
+    """
+    Map each label in a compact label column to the sorted row ids that
+    contain it. Categorical cells are split once per category rather than once
+    per row. Missing and "na" cells are not indexed.
+
+    Args:
+        column (pandas Series): Arrow list or categorical column of to_compact
+                                output, with a RangeIndex
+
+    Returns:
+        index (dict): Label -> sorted numpy array of row ids
+    """
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        category_lists = pa.array(_to_list_array(pd.Series(column.cat.categories, dtype=object)))
+        codes = column.cat.codes.values
+        rows = np.flatnonzero(codes >= 0)
+        pairs = pd.DataFrame({"row":rows, "code":codes[rows]}).merge(
+            pd.DataFrame({"code":category_lists.value_parent_indices().to_numpy(),
+                          "label":category_lists.flatten().to_numpy(zero_copy_only=False)}),
+            on="code")
+        rows, labels = pairs["row"].values, pa.array(pairs["label"].values, type=pa.string())
+    else:
+        lists = list_array(column)
+        rows, labels = lists.value_parent_indices().to_numpy(), lists.flatten()
+    return _group_rows(rows, labels)
+
+def _join_labels(column):
+    """
+
+    """
+    joined = join_items(column)
+    return joined.where(joined != "", "na")
+
+###################
+### Catalog Index
+###################
+
+class CatalogIndex(object):
+
+    """
+    Compact standardized catalog (see mhd.schema.to_compact) with inverted
+    indexes from task, platform, language, annotation style and availability
+    to sorted row id arrays.
+    """
+
+    def __init__(self, df):
+        """
+        Args:
+            df (pandas DataFrame): Standardized catalog (raw label codes)
+        """
+        self.compact, self.sizes = to_compact(df.reset_index(drop=True))
+        self.indexes = dict((field, build_inverted_index(self.compact[col])) for field, col in INDEX_FIELDS.items())
+        self.all_ids = np.arange(len(self.compact))
+
+    @classmethod
+    def from_workbook(cls, path=CATALOG_PATH, **kwargs):
+        """
+        Build an index from the (cached) standardized workbook.
+        """
+        return cls(load_catalog(path, **kwargs))
+
+    def labels(self, field):
+        """
+        Sorted labels available for a field.
+        """
+        return sorted(self.indexes[field].keys())
+
+    def _resolve(self, field, value):
+        """
+        Match a query value to indexed labels. Exact matches take precedence;
+        otherwise labels ending in "_<value>" match (e.g. "signed_agreement"
+        matches "available_via_signed_agreement").
+        """
+        value = value.strip().lower()
+        index = self.indexes[field]
+        if value in index:
+            return [value]
+        return [label for label in index if label.endswith("_" + value)]
+
+    def lookup(self, field, values):
+        """
+        Row ids matching any of the values for a field.
+
+        Args:
+            field (str): One of INDEX_FIELDS
+            values (str or list of str): Labels to match
+
+        Returns:
+            ids (numpy array): Sorted matching row ids
+        """
+        if isinstance(values, str):
+            values = [values]
+        index = self.indexes[field]
+        postings = [index[label] for v in values for label in self._resolve(field, v)]
+        if not postings:
+            return np.array([], dtype=self.all_ids.dtype)
+        return np.unique(np.concatenate(postings))
+
+    def query_ids(self,
+                  min_year=None,
+                  max_year=None,
+                  min_individuals=None,
+                  min_documents=None,
+                  **fields):
+        """
+        Row ids satisfying every criterion. Values within a field are combined
+        with OR; fields are combined with AND.
+
+        Args:
+            min_year, max_year (int or None): Inclusive publication year bounds
+            min_individuals, min_documents (float or None): Minimum total sizes
+            **fields: Keyword per INDEX_FIELDS entry (str or list of str)
+
+        Returns:
+            ids (list of int): Sorted matching row ids
+        """
+        ## Intersect Inverted Index Postings (Smallest First)
+        postings = []
+        for field, values in fields.items():
+            if field not in INDEX_FIELDS:
+                raise ValueError(f"Unknown query field: {field}")
+            if values:
+                postings.append(self.lookup(field, values))
+        postings = sorted(postings, key=len)
+        ids = postings[0] if postings else self.all_ids
+        for p in postings[1:]:
+            ids = np.intersect1d(ids, p, assume_unique=True)
+        ## Numeric Criteria on Surviving Candidates
+        ranges = [("year", min_year, max_year),
+                  ("n_individuals_total", min_individuals, None),
+                  ("n_documents_total", min_documents, None)]
+        for col, lower, upper in ranges:
+            values = self.compact[col].values
+            if lower is not None:
+                ids = ids[values[ids] >= lower]
+            if upper is not None:
+                ids = ids[values[ids] <= upper]
+        return ids.tolist()
+
+    def query(self, **criteria):
+        """
+        Catalog rows satisfying every criterion (see query_ids). Label lists
+        are joined back into their comma-separated form.
+
+        Returns:
+            results (pandas DataFrame): Matching rows (OUTPUT_COLUMNS)
+        """
+        ids = self.query_ids(**criteria)
+        results = self.compact.iloc[ids][OUTPUT_COLUMNS].reset_index(drop=True)
+        for col in ["platforms","tasks","annotation_style"]:
+            results[col] = _join_labels(results[col])
+        return results
+
+###################
+### Output
+###################
+
+def format_results(results, output_format="table"):
+    """
+    Render query results as a table, JSON or CSV.
+
+    Args:
+        results (pandas DataFrame): Output of CatalogIndex.query
+        output_format (str): One of "table", "json", "csv"
+
+    Returns:
+        output (str): Rendered results
+    """
+    if output_format == "json":
+        return results.to_json(orient="records", indent=2)
+    elif output_format == "csv":
+        return results.to_csv(index=False)
+    elif output_format == "table":
+        ## Imported Here So Only Table Rendering Pays for tabulate
+        from tabulate import tabulate
+        return tabulate(results, tablefmt="psql", headers="keys", showindex="never")
+    else:
+        raise ValueError(f"Unknown output format: {output_format}")
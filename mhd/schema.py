@@ -0,0 +1,264 @@
+###################
+### Imports
+###################
+
+## External Libraries
+import pandas as pd
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+## Local
+from .sizes import SIZE_PATTERN, parse_sizes, sum_sizes
+from .labels import AVAILABILITY_LABELS
+from .encoding import filter_items
+
+###################
+### Schemas
+###################
+
+## Allowed Characters in Label Codes
+LABEL_PATTERN = r"[a-z0-9_()\-]+"
+
+## Annotation Levels
+ANNOTATION_LEVELS = ["individual","document","conversation"]
+
+## Column Specifications (Kind, Required, Extra Options)
+STANDARDIZED_SCHEMA = {
+    "paper_id":{"kind":"int", "required":True, "unique":True},
+    "title":{"kind":"text", "required":True},
+    "authors":{"kind":"text", "required":True},
+    "year":{"kind":"year", "required":True},
+    "platforms":{"kind":"label_set", "required":True},
+    "tasks":{"kind":"label_set", "required":False},
+    "annotation_style":{"kind":"label_set", "required":True},
+    "annotation_level":{"kind":"label_set", "required":True, "vocabulary":ANNOTATION_LEVELS},
+    "n_individuals":{"kind":"size", "required":False},
+    "n_documents":{"kind":"size", "required":False},
+    "n_conversations":{"kind":"size", "required":False},
+    "availability":{"kind":"category", "required":False, "vocabulary":list(AVAILABILITY_LABELS.keys())},
+    "primary_language":{"kind":"label_set", "required":True},
+    "source_ids":{"kind":"id_list", "required":True},
+    "reference_link":{"kind":"text", "required":True},
+}
+RAW_SCHEMA = {
+    "Paper":{"kind":"text", "required":True},
+    "Authors":{"kind":"text", "required":True},
+    "Year":{"kind":"year", "required":True},
+    "Platform":{"kind":"text", "required":True},
+    "Target Outcomes":{"kind":"text", "required":False},
+    "Labeling Methodology":{"kind":"text", "required":False},
+    "Size":{"kind":"text", "required":True},
+    "Availability":{"kind":"text", "required":False},
+    "Additional Comments":{"kind":"text", "required":False},
+    "Dataset Link (if any)":{"kind":"text", "required":False},
+    "Reference Link":{"kind":"text", "required":True},
+}
+
+## Plausible Publication Years
+YEAR_RANGE = (1990, 2100)
+
+###################
+### Exceptions
+###################
+
+class SchemaError(ValueError):
+
+    """
+    Raised when a catalog fails validation. Holds every error found.
+    """
+
+    def __init__(self, errors):
+        """
+        Args:
+            errors (pandas DataFrame): Output of validate_catalog
+        """
+        self.errors = errors
+        summary = "\n".join(f"  row {r} [{c}]: {m} ({v!r})" for r, c, v, m in errors.itertuples(index=False, name=None))
+        super().__init__(f"Catalog failed validation with {len(errors)} error(s):\n{summary}")
+
+###################
+### Column Checks
+###################
+
+def _split_entries(values):
+    """
+    Explode comma-separated cells into one stripped entry per row (indexed by
+    the original row).
+    """
+    return values.dropna().astype(str).str.split(",").explode().str.strip()
+
+def _check_int(values, spec):
+    """
+
+    """
+    present = values.dropna()
+    numeric = pd.to_numeric(present, errors="coerce")
+    bad = numeric.isnull() | (numeric != np.floor(numeric))
+    errors = [(present.loc[bad], "not an integer")]
+    if spec.get("unique", False):
+        errors.append((present.loc[present.duplicated(keep=False)], "duplicate identifier"))
+    return errors
+
+def _check_year(values, spec):
+    """
+
+    """
+    present = values.dropna()
+    numeric = pd.to_numeric(present, errors="coerce")
+    bad = numeric.isnull() | (numeric < YEAR_RANGE[0]) | (numeric > YEAR_RANGE[1])
+    return [(present.loc[bad], f"not a year in {YEAR_RANGE}")]
+
+def _check_text(values, spec):
+    """
+
+    """
+    present = values.dropna()
+    bad = present.astype(str).str.strip() == ""
+    return [(present.loc[bad], "empty text")]
+
+def _check_category(values, spec):
+    """
+
+    """
+    present = values.dropna()
+    bad = ~present.isin(spec["vocabulary"])
+    return [(present.loc[bad], "unknown category")]
+
+def _check_label_set(values, spec):
+    """
+
+    """
+    entries = _split_entries(values)
+    entries = entries.loc[~entries.index.isin(values.index[values.astype(object) == "na"])]
+    bad = ~entries.str.fullmatch(LABEL_PATTERN)
+    if "vocabulary" in spec:
+        bad |= ~entries.isin(spec["vocabulary"])
+    return [(entries.loc[bad.fillna(True)], "malformed or unknown label")]
+
+def _check_size(values, spec):
+    """
+
+    """
+    present = values.dropna().astype(str)
+    present = present.loc[present.str.strip() != "na"]
+    entries = present.str.split(", ").explode().str.strip()
+    bad = ~entries.str.fullmatch(SIZE_PATTERN)
+    return [(entries.loc[bad.fillna(True)], "malformed size entry (expected '<label> (<count>[k])')")]
+
+def _check_id_list(values, spec):
+    """
+
+    """
+    entries = _split_entries(values)
+    bad = ~entries.str.fullmatch(r"\d+")
+    return [(entries.loc[bad.fillna(True)], "non-integer source id")]
+
+## Kind -> Check
+COLUMN_CHECKS = {
+    "int":_check_int,
+    "year":_check_year,
+    "text":_check_text,
+    "category":_check_category,
+    "label_set":_check_label_set,
+    "size":_check_size,
+    "id_list":_check_id_list,
+}
+
+###################
+### Validation
+###################
+
+def validate_catalog(df, schema=STANDARDIZED_SCHEMA, raise_errors=False):
+    """
+    Validate every column of a catalog in one batch pass, collecting all
+    errors rather than stopping at the first one.
+
+    Args:
+        df (pandas DataFrame): Raw catalog as loaded from the workbook
+        schema (dict): STANDARDIZED_SCHEMA or RAW_SCHEMA
+        raise_errors (bool): If True, raise SchemaError when any error is found
+
+    Returns:
+        errors (pandas DataFrame): One row per error with "row" (DataFrame
+                                   index), "column", "value" and "message"
+    """
+    records = []
+    for column, spec in schema.items():
+        if column not in df.columns:
+            records.append((None, column, None, "missing column"))
+            continue
+        values = df[column]
+        if spec["required"]:
+            for row in values.index[values.isnull()]:
+                records.append((row, column, None, "missing required value"))
+        for bad, message in COLUMN_CHECKS[spec["kind"]](values, spec):
+            for row, value in bad.items():
+                records.append((row, column, value, message))
+    errors = pd.DataFrame(records, columns=["row","column","value","message"])
+    if raise_errors and len(errors) > 0:
+        raise SchemaError(errors)
+    return errors
+
+###################
+### Compact Representation
+###################
+
+def _to_list_array(values, value_type=pa.string()):
+    """
+    Convert comma-separated cells to an Arrow list column without creating
+    per-row Python objects. Missing cells become nulls and "na" cells (no
+    applicable labels) become empty lists.
+    """
+    values = values.astype(object)
+    strings = pa.array(values.where(values != "na", ""), type=pa.string(), from_pandas=True)
+    lists = pc.split_pattern(strings, ",")
+    items = pc.utf8_trim_whitespace(lists.flatten())
+    lists = pa.ListArray.from_arrays(lists.offsets, items, mask=lists.is_null())
+    lists = filter_items(lists, pc.not_equal(items, ""))
+    return lists.array.astype(pd.ArrowDtype(pa.list_(value_type)))
+
+def to_compact(df):
+    """
+    Materialize a validated standardized catalog as a compact typed frame:
+    categoricals for single-valued labels, Arrow list columns for set-valued
+    labels and source ids, and float64 totals (all and relevant labels) for
+    sizes. Annotation level and primary language are nearly always
+    single-valued, so they are categoricals over the distinct cells (a rare
+    "spanish, portuguese" is one category). No per-row Python sets or dicts
+    are created.
+
+    Args:
+        df (pandas DataFrame): Raw standardized catalog (validated)
+
+    Returns:
+        compact_df (pandas DataFrame): Typed catalog
+        size_df (pandas DataFrame): Long (paper_id, field, label, count) sizes
+    """
+    compact_df = pd.DataFrame(index=df.index)
+    compact_df["paper_id"] = df["paper_id"].astype(np.int32)
+    compact_df["title"] = df["title"].astype("string[pyarrow]")
+    compact_df["authors"] = df["authors"].astype("string[pyarrow]")
+    compact_df["year"] = df["year"].astype(np.int16)
+    for col in ["platforms","tasks","annotation_style"]:
+        compact_df[col] = _to_list_array(df[col])
+    for col in ["annotation_level","primary_language"]:
+        compact_df[col] = pd.Categorical(df[col].astype(object))
+    compact_df["availability"] = pd.Categorical(df["availability"], categories=list(AVAILABILITY_LABELS.keys()))
+    compact_df["source_ids"] = _to_list_array(df["source_ids"].astype(str), pa.int32())
+    compact_df["reference_link"] = df["reference_link"].astype("string[pyarrow]")
+    ## Sizes (Long Format + Totals)
+    size_dfs = []
+    for col in ["n_individuals","n_documents","n_conversations"]:
+        col_sizes = parse_sizes(df[col])
+        col_sizes["field"] = col
+        size_dfs.append(col_sizes)
+        totals = sum_sizes(col_sizes, df.index)
+        compact_df[f"{col}_relevant_total"] = totals["relevant_total"].astype(np.float64).values
+        compact_df[f"{col}_total"] = totals["total"].astype(np.float64).values
+    size_df = pd.concat(size_dfs, ignore_index=True)
+    size_df["paper_id"] = df["paper_id"].values[df.index.get_indexer(size_df["paper"])].astype(np.int32)
+    size_df = size_df[["paper_id","field","label","count"]]
+    size_df["field"] = size_df["field"].astype("category")
+    size_df["label"] = size_df["label"].astype("category")
+    return compact_df, size_df
@@ -0,0 +1,216 @@
+###################
+### Imports
+###################
+
+## Standard Libraries
+import os
+import re
+import sqlite3
+import hashlib
+
+## External Libraries
+import pandas as pd
+
+## Local
+from .catalog import load_catalog
+from .config import RAW_CATALOG_PATH, INDEX_PATH
+
+###################
+### Globals
+###################
+
+## Free-Text Columns (Sheet Column -> Index Column)
+TEXT_COLUMNS = {
+    "Paper":"paper",
+    "Authors":"authors",
+    "Platform":"platform",
+    "Target Outcomes":"target_outcomes",
+    "Labeling Methodology":"labeling_methodology",
+    "Additional Comments":"additional_comments",
+}
+
+## Relative BM25 Weight of Each Indexed Column
+COLUMN_WEIGHTS = {
+    "paper":2.0,
+    "authors":1.0,
+    "platform":1.0,
+    "target_outcomes":1.5,
+    "labeling_methodology":1.5,
+    "additional_comments":1.0,
+}
+
+## Query Terms Expanded to the Phrases Used in the Sheet
+QUERY_EXPANSIONS = {
+    "regex":["regex", "regular expression", "regular expressions"],
+    "self-report":["self-report", "self report", "self-reported", "self reported"],
+    "diagnosis":["diagnosis", "diagnosed", "diagnoses"],
+}
+
+## Characters That Separate Query Terms
+TERM_PATTERN = re.compile(r"[\w\-']+", flags=re.UNICODE)
+
+###################
+### Index Construction
+###################
+
+def _connect(index_path):
+    """
+    Open (and if needed create) the index database.
+    """
+    index_dir = os.path.dirname(index_path)
+    if index_dir and not os.path.exists(index_dir):
+        os.makedirs(index_dir)
+    connection = sqlite3.connect(index_path)
+    columns = ", ".join(TEXT_COLUMNS.values())
+    connection.executescript(f"""
+        CREATE TABLE IF NOT EXISTS documents (
+            doc_id INTEGER PRIMARY KEY,
+            doc_key TEXT UNIQUE NOT NULL,
+            content_hash TEXT NOT NULL,
+            year INTEGER,
+            availability TEXT
+        );
+        CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
+            {columns},
+            tokenize = 'porter unicode61 remove_diacritics 2'
+        );
+    """)
+    return connection
+
+def _document_keys(catalog_df):
+    """
+    Stable identifier of each sheet row: title and year, with an occurrence
+    number appended to repeated title/year pairs (e.g. duplicate submissions).
+    """
+    keys = pd.Series(["{} ({})".format(str(paper).strip(), year) for paper, year in zip(catalog_df["Paper"], catalog_df["Year"])],
+                     index=catalog_df.index,
+                     dtype=object)
+    occurrence = keys.groupby(keys).cumcount()
+    return keys.where(occurrence == 0, keys + " #" + (occurrence + 1).astype(str))
+
+def _content_hash(cells):
+    """
+    Hash of a row's indexed text and metadata cells.
+    """
+    return hashlib.sha1("\x1f".join(str(c) for c in cells).encode("utf-8")).hexdigest()
+
+def build_search_index(catalog_df, index_path=INDEX_PATH):
+    """
+    Incrementally build the full-text index. Rows whose content is unchanged
+    are left alone; new or edited rows are (re)indexed and rows removed from
+    the catalog are deleted.
+
+    Args:
+        catalog_df (pandas DataFrame): Raw catalog (data_sources.xlsx)
+        index_path (str): SQLite database path
+
+    Returns:
+        changes (dict): Number of "added", "updated", "removed" and "unchanged" rows
+    """
+    connection = _connect(index_path)
+    existing = dict((key, (doc_id, content_hash)) for doc_id, key, content_hash in connection.execute("SELECT doc_id, doc_key, content_hash FROM documents"))
+    changes = {"added":0, "updated":0, "removed":0, "unchanged":0}
+    seen = set()
+    fts_columns = ", ".join(TEXT_COLUMNS.values())
+    placeholders = ", ".join("?" for _ in TEXT_COLUMNS)
+    rows = catalog_df[list(TEXT_COLUMNS.keys()) + ["Year","Availability"]].itertuples(index=False, name=None)
+    with connection:
+        for key, row in zip(_document_keys(catalog_df), rows):
+            content_hash = _content_hash(row)
+            seen.add(key)
+            if key in existing and existing[key][1] == content_hash:
+                changes["unchanged"] += 1
+                continue
+            text = [cell if not pd.isnull(cell) else "" for cell in row[:len(TEXT_COLUMNS)]]
+            year, availability = row[-2:]
+            metadata = [int(year), availability if not pd.isnull(availability) else None]
+            if key in existing:
+                doc_id = existing[key][0]
+                connection.execute("UPDATE documents SET content_hash = ?, year = ?, availability = ? WHERE doc_id = ?", [content_hash] + metadata + [doc_id])
+                connection.execute("DELETE FROM documents_fts WHERE rowid = ?", (doc_id,))
+                changes["updated"] += 1
+            else:
+                doc_id = connection.execute("INSERT INTO documents (doc_key, content_hash, year, availability) VALUES (?, ?, ?, ?)", [key, content_hash] + metadata).lastrowid
+                changes["added"] += 1
+            connection.execute(f"INSERT INTO documents_fts (rowid, {fts_columns}) VALUES (?, {placeholders})", [doc_id] + text)
+        for key in set(existing) - seen:
+            connection.execute("DELETE FROM documents_fts WHERE rowid = ?", (existing[key][0],))
+            connection.execute("DELETE FROM documents WHERE doc_id = ?", (existing[key][0],))
+            changes["removed"] += 1
+    connection.close()
+    return changes
+
+###################
+### Queries
+###################
+
+def _quote(phrase):
+    """
+
+    """
+    return '"{}"'.format(phrase.replace('"', '""'))
+
+def parse_query(text, match_all=False):
+    """
+    Translate free text into an FTS5 query. Each term (expanded with
+    QUERY_EXPANSIONS) becomes a quoted phrase, so punctuation such as hyphens
+    is never interpreted as query syntax.
+
+    Args:
+        text (str): Keywords, e.g. "regex self-report diagnosis"
+        match_all (bool): Require every term (default: any term, ranked)
+
+    Returns:
+        fts_query (str)
+    """
+    terms = []
+    for term in TERM_PATTERN.findall(text.lower()):
+        phrases = QUERY_EXPANSIONS.get(term, [term])
+        terms.append("(" + " OR ".join(_quote(p) for p in phrases) + ")")
+    if len(terms) == 0:
+        raise ValueError("Search query contains no terms")
+    return (" AND " if match_all else " OR ").join(terms)
+
+def search(text, index_path=INDEX_PATH, limit=10, match_all=False):
+    """
+    Ranked keyword search over titles, authors, platforms, outcomes,
+    labeling methodology and comments (BM25, weighted by COLUMN_WEIGHTS).
+
+    Args:
+        text (str): Keywords
+        index_path (str): Index built by build_search_index
+        limit (int): Maximum number of results
+        match_all (bool): Require every term
+
+    Returns:
+        results (pandas DataFrame): Matching rows (best first) with a BM25
+                                    "score" (higher is better) and a "snippet"
+    """
+    if not os.path.exists(index_path):
+        raise FileNotFoundError(f"No search index found at {index_path}. Build it with build_search_index.")
+    weights = ", ".join(str(w) for w in COLUMN_WEIGHTS.values())
+    connection = sqlite3.connect(index_path)
+    results = pd.read_sql_query(f"""
+        SELECT documents_fts.paper AS "Paper",
+               documents_fts.authors AS "Authors",
+               documents.year AS "Year",
+               documents_fts.platform AS "Platform",
+               documents.availability AS "Availability",
+               -bm25(documents_fts, {weights}) AS score,
+               snippet(documents_fts, -1, '[', ']', '...', 12) AS snippet
+        FROM documents_fts
+        JOIN documents ON documents.doc_id = documents_fts.rowid
+        WHERE documents_fts MATCH ?
+        ORDER BY bm25(documents_fts, {weights})
+        LIMIT ?
+    """, connection, params=(parse_query(text, match_all), limit))
+    connection.close()
+    return results
+
+def search_catalog(text, catalog_path=RAW_CATALOG_PATH, index_path=INDEX_PATH, **kwargs):
+    """
+    Refresh the index from the catalog workbook (only changed rows are
+    re-indexed) and run a search.
+    """
+    _ = build_search_index(load_catalog(catalog_path), index_path)
+    return search(text, index_path, **kwargs)
@@ -0,0 +1,74 @@
+###################
+### Imports
+###################
+
+## External Libraries
+import pandas as pd
+import numpy as np
+
+###################
+### Globals
+###################
+
+## Single "<label> (<count>[k])" Entry Within a Size Cell
+SIZE_PATTERN = r"(?P<label>[^\s,]+)\s+\(?(?P<count>\d+(?:\.\d+)?)(?P<suffix>k?)\)?"
+
+## Keys To Consider for Counting Depression/Suicide Data Set Sizes
+RELEVANT_SIZE_LABELS = ["combined",
+                        "control",
+                        "depression",
+                        "depression_(low-mild)",
+                        "depression_(high)",
+                        "mental_health_(combined)",
+                        "increase_activity",
+                        "constant_activity",
+                        "decrease_activity",
+                        "suicide_(ideation)",
+                        "suicide_(attempt)"]
+
+###################
+### Parsing
+###################
+
+def parse_sizes(sizes):
+    """
+    Parse a column of size strings (e.g. "depression (9.3k), control (476)")
+    into long format using a single regular expression pass. Missing cells and
+    "na" cells produce no rows.
+
+    Args:
+        sizes (pandas Series): Raw size strings, indexed by paper
+
+    Returns:
+        size_df (pandas DataFrame): One row per (paper, label) with a float count
+    """
+    matches = sizes.astype(object).str.extractall(SIZE_PATTERN)
+    counts = matches["count"].astype(float) * np.where(matches["suffix"] == "k", 1000.0, 1.0)
+    size_df = pd.DataFrame({"paper":matches.index.get_level_values(0),
+                            "label":matches["label"].values,
+                            "count":counts.values})
+    ## Repeated Labels Within a Cell Keep the Last Value
+    size_df = size_df.drop_duplicates(["paper","label"], keep="last").reset_index(drop=True)
+    return size_df
+
+def sum_sizes(size_df,
+              index,
+              relevant_labels=RELEVANT_SIZE_LABELS):
+    """
+    Compute relevant and total size sums per paper from parsed sizes.
+
+    Args:
+        size_df (pandas DataFrame): Output of parse_sizes
+        index (pandas Index): Index of the parsed size column
+        relevant_labels (list of str): Labels counted towards the relevant total
+
+    Returns:
+        totals (pandas DataFrame): "relevant_total" and "total" columns aligned
+                                   with the index. Papers without any parsed
+                                   size are null.
+    """
+    size_df = size_df.assign(relevant_count=size_df["count"].where(size_df["label"].isin(relevant_labels), 0.0))
+    totals = size_df.groupby("paper", sort=False).agg(relevant_total=("relevant_count","sum"),
+                                                      total=("count","sum"))
+    totals = totals.reindex(index)
+    return totals
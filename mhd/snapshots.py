@@ -0,0 +1,282 @@
+###################
+### Imports
+###################
+
+## Standard Libraries
+import os
+import json
+import hashlib
+from datetime import datetime
+
+## External Libraries
+import pandas as pd
+import numpy as np
+
+## Local
+from .config import SNAPSHOT_DIR
+from .watch import row_hashes
+
+###################
+### Globals
+###################
+
+## Manifest of Snapshots (Oldest First)
+MANIFEST_NAME = "manifest.json"
+
+## Column Holding Each Row's Content Hash
+HASH_COLUMN = "_row_hash"
+
+## Set-Valued Columns Whose Label Counts Are Compared Between Versions
+LABEL_COLUMNS = ["tasks","platforms"]
+
+## Cell Markers Meaning "No Labels"
+EMPTY_LABELS = ["na"]
+
+## Parquet Settings (Rows Are Sorted by Key, So Row-Group Statistics Prune Reads by Key)
+COMPRESSION = "zstd"
+ROW_GROUP_SIZE = 10000
+
+###################
+### Helpers
+###################
+
+def _load_manifest(snapshot_dir):
+    """
+
+    """
+    manifest_path = os.path.join(snapshot_dir, MANIFEST_NAME)
+    if not os.path.exists(manifest_path):
+        return []
+    with open(manifest_path, "r") as the_file:
+        return json.load(the_file)
+
+def _write_manifest(snapshot_dir, manifest):
+    """
+
+    """
+    with open(os.path.join(snapshot_dir, MANIFEST_NAME), "w") as the_file:
+        json.dump(manifest, the_file, indent=1)
+
+def _object_path(snapshot_dir, snapshot_id):
+    """
+
+    """
+    return os.path.join(snapshot_dir, f"{snapshot_id}.parquet")
+
+def _snapshot_id(hashes, columns):
+    """
+    Content address of a catalog version: its column names in order and its
+    row hashes (independent of row order). Row hashes do not cover column
+    names, so renaming or reordering columns yields a new version.
+    """
+    hasher = hashlib.sha256(json.dumps(list(map(str, columns))).encode("utf-8"))
+    hasher.update(np.sort(hashes.values.astype(np.uint64)).tobytes())
+    return hasher.hexdigest()
+
+def resolve_snapshot(ref, snapshot_dir=SNAPSHOT_DIR):
+    """
+    Find a snapshot by position in the history (0 is the oldest, -1 the
+    latest) or by a prefix of its content hash (at least 8 characters if
+    the prefix is all digits, so it is not read as a position).
+
+    Returns:
+        entry (dict): Manifest entry ("id", "created", "rows", "key", "note")
+    """
+    manifest = _load_manifest(snapshot_dir)
+    if len(manifest) == 0:
+        raise FileNotFoundError(f"No snapshots found in {snapshot_dir}")
+    ref = str(ref)
+    if ref.lstrip("-").isdigit() and len(ref) < 8:
+        return manifest[int(ref)]
+    matches = [entry for entry in manifest if entry["id"].startswith(ref)]
+    if len(matches) != 1:
+        raise KeyError(f"Snapshot reference {ref} matches {len(matches)} snapshots")
+    return matches[0]
+
+def read_snapshot(ref, columns=None, keys=None, snapshot_dir=SNAPSHOT_DIR):
+    """
+    Read a stored catalog version.
+
+    Args:
+        ref (int or str): Snapshot position or hash prefix
+        columns (list of str or None): Columns to read (columnar; others are skipped)
+        keys (list or None): Only read rows with these key values
+        snapshot_dir (str): Snapshot directory
+
+    Returns:
+        df (pandas DataFrame)
+    """
+    entry = resolve_snapshot(ref, snapshot_dir)
+    filters = None
+    if keys is not None:
+        if len(keys) == 0:
+            columns = columns if columns is not None else entry["columns"] + [HASH_COLUMN]
+            return pd.DataFrame(columns=columns)
+        filters = [(entry["key"], "in", list(keys))]
+    return pd.read_parquet(_object_path(snapshot_dir, entry["id"]), columns=columns, filters=filters)
+
+###################
+### Snapshots
+###################
+
+def take_snapshot(df, key="paper_id", snapshot_dir=SNAPSHOT_DIR, note=None):
+    """
+    Store a catalog version as a compressed, content-addressed Parquet file
+    with a content hash per row. A version identical to one already stored
+    is not written again; it is only appended to the history if it differs
+    from the latest snapshot. Raises a ValueError if the key is repeated, since
+    versions are diffed row by row on it.
+
+    Args:
+        df (pandas DataFrame): Catalog (e.g. the standardized sheet as loaded)
+        key (str): Column uniquely identifying a row
+        snapshot_dir (str): Snapshot directory
+        note (str or None): Optional description stored in the manifest
+
+    Returns:
+        entry (dict): Manifest entry of the snapshot
+        created (bool): Whether the history gained a new entry
+    """
+    repeated = df[key].loc[df[key].duplicated()].unique()
+    if len(repeated) > 0:
+        raise ValueError("Snapshot key {} must be unique; repeated values: {}".format(key, ", ".join(map(str, repeated[:10]))))
+    hashes = row_hashes(df, [key])
+    snapshot_id = _snapshot_id(hashes, df.columns)
+    manifest = _load_manifest(snapshot_dir)
+    if len(manifest) > 0 and manifest[-1]["id"] == snapshot_id:
+        return manifest[-1], False
+    if not os.path.exists(snapshot_dir):
+        os.makedirs(snapshot_dir)
+    object_path = _object_path(snapshot_dir, snapshot_id)
+    if not os.path.exists(object_path):
+        stored = df.assign(**{HASH_COLUMN:hashes.values}).sort_values(key)
+        stored.to_parquet(object_path + ".tmp", index=False, compression=COMPRESSION, row_group_size=ROW_GROUP_SIZE)
+        os.replace(object_path + ".tmp", object_path)
+    entry = {"id":snapshot_id,
+             "created":datetime.now().isoformat(),
+             "rows":len(df),
+             "key":key,
+             "columns":df.columns.tolist(),
+             "note":note}
+    manifest.append(entry)
+    _write_manifest(snapshot_dir, manifest)
+    return entry, True
+
+def list_snapshots(snapshot_dir=SNAPSHOT_DIR):
+    """
+    History of stored versions (oldest first).
+
+    Returns:
+        history (pandas DataFrame): Position, short id, creation time, rows and note
+    """
+    manifest = _load_manifest(snapshot_dir)
+    history = pd.DataFrame(manifest, columns=["id","created","rows","note"])
+    history.insert(0, "version", np.arange(len(history)))
+    history["id"] = history["id"].str[:12]
+    return history
+
+###################
+### Diffs
+###################
+
+def label_counts(values, empty=EMPTY_LABELS):
+    """
+    Number of rows containing each label of a comma-separated label column.
+    """
+    labels = values.dropna().astype(str).str.split(", ").explode().str.strip()
+    labels = labels.loc[(labels != "") & ~labels.isin(empty)]
+    return labels.value_counts()
+
+def _label_shift(old_rows, new_rows, col):
+    """
+    Change in label counts implied by replacing old_rows with new_rows.
+    """
+    old_counts = label_counts(old_rows[col]) if col in old_rows.columns else pd.Series(dtype=int)
+    new_counts = label_counts(new_rows[col]) if col in new_rows.columns else pd.Series(dtype=int)
+    shift = new_counts.sub(old_counts, fill_value=0).astype(int)
+    return shift.loc[shift != 0].sort_values()
+
+def diff_snapshots(old_ref, new_ref, snapshot_dir=SNAPSHOT_DIR):
+    """
+    Compare two stored versions. Only the key and row-hash columns of each
+    version are read in full; complete rows are read just for the added,
+    removed and changed keys, and label count shifts are computed from
+    those rows alone.
+
+    Args:
+        old_ref, new_ref (int or str): Snapshot positions or hash prefixes
+        snapshot_dir (str): Snapshot directory
+
+    Returns:
+        diff (dict): "added" and "removed" rows, "changed" (key, changed
+                     columns), "tasks_shift" and "platforms_shift" (change
+                     in the number of papers per label)
+    """
+    old_entry, new_entry = resolve_snapshot(old_ref, snapshot_dir), resolve_snapshot(new_ref, snapshot_dir)
+    key = new_entry["key"]
+    old_hashes = read_snapshot(old_entry["id"], [key, HASH_COLUMN], snapshot_dir=snapshot_dir).set_index(key)[HASH_COLUMN]
+    new_hashes = read_snapshot(new_entry["id"], [key, HASH_COLUMN], snapshot_dir=snapshot_dir).set_index(key)[HASH_COLUMN]
+    shared = old_hashes.index.intersection(new_hashes.index)
+    added = new_hashes.index.difference(old_hashes.index)
+    removed = old_hashes.index.difference(new_hashes.index)
+    changed = shared[old_hashes.loc[shared].values != new_hashes.loc[shared].values]
+    ## Read Only Affected Rows
+    old_rows = read_snapshot(old_entry["id"], keys=removed.union(changed).tolist(), snapshot_dir=snapshot_dir).set_index(key)
+    new_rows = read_snapshot(new_entry["id"], keys=added.union(changed).tolist(), snapshot_dir=snapshot_dir).set_index(key)
+    old_changed, new_changed = old_rows.loc[changed], new_rows.loc[changed]
+    columns = [c for c in new_entry["columns"] if c != key and c in old_changed.columns]
+    old_values, new_values = old_changed[columns].astype(object), new_changed[columns].astype(object)
+    differs = ~((old_values.values == new_values.values) | (old_values.isnull().values & new_values.isnull().values))
+    changed_columns = pd.DataFrame({key:changed.values,
+                                    "columns":[", ".join(np.array(columns)[row]) for row in differs]})
+    diff = {
+        "added":new_rows.loc[added].drop(columns=[HASH_COLUMN]).reset_index(),
+        "removed":old_rows.loc[removed].drop(columns=[HASH_COLUMN]).reset_index(),
+        "changed":changed_columns,
+    }
+    for col in LABEL_COLUMNS:
+        diff[f"{col}_shift"] = _label_shift(old_rows, new_rows, col)
+    return diff
+
+###################
+### Growth
+###################
+
+def yearly_growth(years):
+    """
+    Year-over-year growth of a set of papers.
+
+    Args:
+        years (pandas Series): Publication year of each paper
+
+    Returns:
+        growth (pandas DataFrame): Per-year "papers", "cumulative", "change"
+                                   and "pct_change" (every year in range)
+    """
+    counts = years.dropna().astype(int).value_counts().sort_index()
+    if len(counts) > 0:
+        counts = counts.reindex(np.arange(counts.index.min(), counts.index.max() + 1), fill_value=0)
+    growth = pd.DataFrame({"papers":counts.values}, index=pd.Index(counts.index, name="year"))
+    growth["cumulative"] = growth["papers"].cumsum()
+    growth["change"] = growth["papers"].diff()
+    growth["pct_change"] = growth["papers"].pct_change().replace([np.inf, -np.inf], np.nan) * 100
+    return growth
+
+def growth_series(ref=-1, snapshot_dir=SNAPSHOT_DIR):
+    """
+    Year-over-year growth of a stored version (reads the year column only).
+    """
+    return yearly_growth(read_snapshot(ref, ["year"], snapshot_dir=snapshot_dir)["year"])
+
+def catalog_history(snapshot_dir=SNAPSHOT_DIR):
+    """
+    Size of the catalog at each stored version with the number of papers
+    added, removed and changed since the previous version.
+    """
+    history = list_snapshots(snapshot_dir)
+    changes = [(np.nan, np.nan, np.nan)]
+    for version in range(1, len(history)):
+        diff = diff_snapshots(version - 1, version, snapshot_dir)
+        changes.append((len(diff["added"]), len(diff["removed"]), len(diff["changed"])))
+    history[["added","removed","changed"]] = pd.DataFrame(changes[:len(history)], index=history.index)
+    return history
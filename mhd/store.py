@@ -0,0 +1,223 @@
+###################
+### Imports
+###################
+
+## Standard Libraries
+import os
+import json
+import shutil
+
+## External Libraries
+import pandas as pd
+import numpy as np
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+## Local
+from .config import STORE_DIR
+from .memo import hash_object
+from .encoding import is_list_column, multi_hot_encode, label_counts
+
+###################
+### Globals
+###################
+
+## Manifest (Ignored by Dataset Discovery Because of the Leading Underscore)
+MANIFEST_NAME = "_manifest.json"
+
+## Upper Bound on (Year, Platform) Partitions Written at Once (pyarrow Defaults to 1024)
+MAX_PARTITIONS = 100000
+
+## Hive Partition Keys
+PARTITIONING = ds.partitioning(pa.schema([("year", pa.int64()), ("primary_platform", pa.string())]), flavor="hive")
+
+###################
+### Write
+###################
+
+def _load_manifest(store_dir):
+    """
+
+    """
+    manifest_path = os.path.join(store_dir, MANIFEST_NAME)
+    if not os.path.exists(manifest_path):
+        return None
+    with open(manifest_path, "r") as the_file:
+        return json.load(the_file)
+
+def _partition_keys(years, platforms):
+    """
+    (year, primary_platform) partition of each row, with None for nulls.
+    """
+    return list(zip(pd.Series(years).astype(object).where(pd.notnull(years), None),
+                    pd.Series(platforms).astype(object).where(pd.notnull(platforms), None)))
+
+def write_store(df, store_dir=STORE_DIR, changed=None):
+    """
+    Write a normalized catalog as a Hive-partitioned Parquet dataset
+    (year=YYYY/primary_platform=NAME/). The store is only rewritten when the
+    catalog's content hash changes, and when the changed papers are known
+    only the partitions holding them (before or after the edit) are rewritten.
+
+    Args:
+        df (pandas DataFrame): Normalized catalog with "year" and
+                               "primary_platform" columns
+        store_dir (str): Output directory
+        changed (collection of int or None): paper_ids added, removed or
+                                             edited since the last write
+                                             (None rewrites every partition)
+
+    Returns:
+        store_dir (str): Output directory
+    """
+    key = hash_object(df)
+    manifest = _load_manifest(store_dir)
+    if manifest is not None and manifest["content_hash"] == key:
+        return store_dir
+    dtypes = [str(d) for d in df.dtypes]
+    ## Without pandas Metadata (load_store Restores Arrow List Columns Itself)
+    table = pa.Table.from_pandas(df, preserve_index=False).replace_schema_metadata(None)
+    if changed is not None and manifest is not None and manifest["columns"] == df.columns.tolist() and manifest["dtypes"] == dtypes:
+        ## Partitions Holding Changed Papers Before or After the Edit
+        changed = list(changed)
+        dataset = _open_store(store_dir)
+        old_rows = dataset.to_table(columns=["year","primary_platform"], filter=ds.field("paper_id").isin(changed)).to_pandas()
+        new_rows = df.loc[df["paper_id"].isin(changed)]
+        partitions = set(_partition_keys(old_rows["year"].values, old_rows["primary_platform"].values))
+        partitions |= set(_partition_keys(new_rows["year"].values, new_rows["primary_platform"].values))
+        for fragment in dataset.get_fragments():
+            partition = ds.get_partition_keys(fragment.partition_expression)
+            if (partition.get("year"), partition.get("primary_platform")) in partitions:
+                os.remove(fragment.path)
+        rows = np.array([p in partitions for p in _partition_keys(df["year"].values, df["primary_platform"].values)], dtype=bool)
+        ds.write_dataset(table.filter(pa.array(rows)),
+                         store_dir,
+                         format="parquet",
+                         partitioning=PARTITIONING,
+                         max_partitions=MAX_PARTITIONS,
+                         basename_template="part-" + key[:12] + "-{i}.parquet",
+                         existing_data_behavior="overwrite_or_ignore")
+    else:
+        if os.path.exists(store_dir):
+            shutil.rmtree(store_dir)
+        ds.write_dataset(table,
+                         store_dir,
+                         format="parquet",
+                         partitioning=PARTITIONING,
+                         max_partitions=MAX_PARTITIONS)
+    with open(os.path.join(store_dir, MANIFEST_NAME), "w") as the_file:
+        json.dump({"content_hash":key, "columns":df.columns.tolist(), "dtypes":dtypes}, the_file, indent=1)
+    return store_dir
+
+###################
+### Read
+###################
+
+def store_filter(min_year=None,
+                 max_year=None,
+                 platforms=None,
+                 languages=None):
+    """
+    Build a dataset filter expression. Year and platform predicates select
+    partitions (directories are pruned without being opened); language
+    predicates are checked against Parquet row-group statistics.
+
+    Args:
+        min_year (int or None): Earliest publication year (inclusive)
+        max_year (int or None): Latest publication year (inclusive)
+        platforms (list of str or None): Primary platforms to keep
+        languages (list of str or None): Primary languages to keep (as
+                                         normalized, e.g. "English")
+
+    Returns:
+        expression (pyarrow.dataset.Expression or None)
+    """
+    predicates = []
+    if min_year is not None:
+        predicates.append(ds.field("year") >= min_year)
+    if max_year is not None:
+        predicates.append(ds.field("year") <= max_year)
+    if platforms is not None:
+        predicates.append(ds.field("primary_platform").isin(list(platforms)))
+    if languages is not None:
+        predicates.append(ds.field("primary_language").isin(list(languages)))
+    if len(predicates) == 0:
+        return None
+    expression = predicates[0]
+    for p in predicates[1:]:
+        expression = expression & p
+    return expression
+
+def _open_store(store_dir):
+    """
+
+    """
+    if _load_manifest(store_dir) is None:
+        raise FileNotFoundError(f"No catalog store found at {store_dir}")
+    return ds.dataset(store_dir, format="parquet", partitioning=PARTITIONING)
+
+def store_files(store_dir=STORE_DIR, **predicates):
+    """
+    Parquet files that a query with the given predicates would read.
+    """
+    dataset = _open_store(store_dir)
+    return sorted(f.path for f in dataset.get_fragments(filter=store_filter(**predicates)))
+
+def _list_dtype(arrow_type):
+    """
+
+    """
+    return pd.ArrowDtype(arrow_type) if pa.types.is_list(arrow_type) else None
+
+def load_store(store_dir=STORE_DIR,
+               columns=None,
+               **predicates):
+    """
+    Load a slice of the partitioned catalog, pushing predicates down to the
+    reader so only matching partitions and row groups are read.
+
+    Args:
+        store_dir (str): Store written by write_store
+        columns (list of str or None): Columns to read (default all)
+        **predicates: min_year, max_year, platforms, languages (see store_filter)
+
+    Returns:
+        df (pandas DataFrame): Matching rows in paper_id order, with list
+                               columns restored as Arrow lists
+    """
+    manifest = _load_manifest(store_dir)
+    dataset = _open_store(store_dir)
+    columns = columns or manifest["columns"]
+    table = dataset.to_table(columns=columns, filter=store_filter(**predicates))
+    df = table.to_pandas(types_mapper=_list_dtype)
+    if "paper_id" in df.columns:
+        df = df.sort_values("paper_id")
+    return df.reset_index(drop=True)
+
+###################
+### Filtered Analyses
+###################
+
+def slice_distribution(column,
+                       store_dir=STORE_DIR,
+                       **predicates):
+    """
+    Count papers per label of one column over a slice of the catalog. Only
+    that column is read, and only from the partitions and row groups matching
+    the predicates.
+
+    Args:
+        column (str): Normalized column, list-valued (e.g. "tasks") or scalar
+                      (e.g. "primary_language")
+        store_dir (str): Store written by write_store
+        **predicates: min_year, max_year, platforms, languages (see store_filter)
+
+    Returns:
+        counts (pandas Series): Paper count per label, sorted ascending
+    """
+    values = load_store(store_dir, columns=[column], **predicates)[column]
+    if is_list_column(values):
+        return label_counts(*multi_hot_encode(values))
+    counts = values.value_counts()
+    ## Categorical Columns Also Count Categories Absent from the Slice
+    return counts.loc[counts > 0].sort_values()
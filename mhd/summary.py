@@ -0,0 +1,288 @@
+###################
+### Imports
+###################
+
+## External Libraries
+import pandas as pd
+import numpy as np
+
+###################
+### Globals
+###################
+
+## KLL Sketch Accuracy Parameter (Larger -> More Accurate, More Memory)
+SKETCH_K = 200
+
+## Quantiles Reported by Default
+QUANTILES = [0.25, 0.5, 0.75]
+
+###################
+### Accumulators
+###################
+
+class RunningStats(object):
+
+    """
+    Count, min, max, mean and variance accumulated with Welford's algorithm.
+    Batches are folded in with Chan's parallel update, so partial results
+    from different shards can be merged exactly.
+    """
+
+    def __init__(self):
+        """
+
+        """
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.nan
+        self.max = np.nan
+
+    def _combine(self, count, mean, m2, vmin, vmax):
+        """
+        Fold in another partial result (count, mean, sum of squared deviations).
+        """
+        if count == 0:
+            return
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta ** 2 * self.count * count / total
+        self.min = vmin if self.count == 0 else min(self.min, vmin)
+        self.max = vmax if self.count == 0 else max(self.max, vmax)
+        self.count = total
+
+    def update(self, values):
+        """
+        Add a batch of values (missing values are ignored).
+        """
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return self
+        mean = values.mean()
+        self._combine(len(values), mean, ((values - mean) ** 2).sum(), values.min(), values.max())
+        return self
+
+    def merge(self, other):
+        """
+        Merge another RunningStats into this one.
+        """
+        self._combine(other.count, other.mean, other.m2, other.min, other.max)
+        return self
+
+    @property
+    def variance(self):
+        """
+        Sample variance (ddof=1, matching pandas).
+        """
+        if self.count < 2:
+            return np.nan
+        return self.m2 / (self.count - 1)
+
+    @property
+    def std(self):
+        """
+
+        """
+        return np.sqrt(self.variance)
+
+class KLLSketch(object):
+
+    """
+    KLL quantile sketch. Values are held in a hierarchy of compactors; when
+    a level overflows it is sorted and every other item is promoted to the
+    next level with double weight. Memory is O(k) and sketches are
+    mergeable. Until the first compaction the sketch holds every value, so
+    quantiles are exact for small inputs.
+    """
+
+    def __init__(self, k=SKETCH_K):
+        """
+        Args:
+            k (int): Capacity of the top compactor
+        """
+        self.k = k
+        self.count = 0
+        self.compactors = [np.empty(0, dtype=np.float64)]
+        self._offset = 0
+
+    def _capacity(self, level):
+        """
+
+        """
+        depth = len(self.compactors) - level - 1
+        return max(2, int(np.ceil(self.k * (2 / 3) ** depth)))
+
+    def _compress(self):
+        """
+        Compact overflowing levels until the sketch fits its capacity.
+        """
+        while sum(len(c) for c in self.compactors) > sum(self._capacity(h) for h in range(len(self.compactors))):
+            for level in range(len(self.compactors)):
+                if len(self.compactors[level]) < self._capacity(level):
+                    continue
+                if level + 1 == len(self.compactors):
+                    self.compactors.append(np.empty(0, dtype=np.float64))
+                items = np.sort(self.compactors[level])
+                keep = items[-1:] if len(items) % 2 == 1 else items[:0]
+                items = items[:len(items) - len(keep)]
+                ## Alternate Offsets Keep the Sketch Deterministic and Unbiased
+                self.compactors[level + 1] = np.concatenate([self.compactors[level + 1], items[self._offset::2]])
+                self.compactors[level] = keep
+                self._offset = 1 - self._offset
+                break
+
+    def update(self, values):
+        """
+        Add a batch of values (missing values are ignored).
+        """
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        self.compactors[0] = np.concatenate([self.compactors[0], values])
+        self.count += len(values)
+        self._compress()
+        return self
+
+    def merge(self, other):
+        """
+        Merge another sketch into this one.
+        """
+        while len(self.compactors) < len(other.compactors):
+            self.compactors.append(np.empty(0, dtype=np.float64))
+        for level, items in enumerate(other.compactors):
+            self.compactors[level] = np.concatenate([self.compactors[level], items])
+        self.count += other.count
+        self._compress()
+        return self
+
+    def quantile(self, q):
+        """
+        Approximate q-th quantile (exact while no compaction has occurred).
+        """
+        if self.count == 0:
+            return np.nan
+        if len(self.compactors) == 1:
+            return float(np.quantile(self.compactors[0], q))
+        items = np.concatenate(self.compactors)
+        weights = np.concatenate([np.full(len(c), 2 ** h, dtype=np.float64) for h, c in enumerate(self.compactors)])
+        order = np.argsort(items, kind="stable")
+        cumulative = np.cumsum(weights[order])
+        position = np.searchsorted(cumulative, q * cumulative[-1], side="left")
+        return float(items[order][min(position, len(items) - 1)])
+
+class SizeSummary(object):
+
+    """
+    Streaming summary of a size column: RunningStats for moments and a
+    KLLSketch for the median and other quantiles.
+    """
+
+    def __init__(self, k=SKETCH_K):
+        """
+
+        """
+        self.stats = RunningStats()
+        self.sketch = KLLSketch(k)
+        self.missing = 0
+
+    def update(self, values):
+        """
+        Add a batch of values, counting missing entries separately.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        self.missing += int(np.isnan(values).sum())
+        self.stats.update(values)
+        self.sketch.update(values)
+        return self
+
+    def merge(self, other):
+        """
+        Merge another SizeSummary into this one.
+        """
+        self.stats.merge(other.stats)
+        self.sketch.merge(other.sketch)
+        self.missing += other.missing
+        return self
+
+    def summarize(self, quantiles=QUANTILES):
+        """
+        Args:
+            quantiles (list of float): Quantiles to report
+
+        Returns:
+            summary (dict): count, missing, min, max, mean, std and quantiles
+        """
+        summary = {"count":self.stats.count,
+                   "missing":self.missing,
+                   "min":self.stats.min,
+                   "max":self.stats.max,
+                   "mean":self.stats.mean if self.stats.count > 0 else np.nan,
+                   "std":self.stats.std}
+        for q in quantiles:
+            summary[f"q{int(q * 100)}"] = self.sketch.quantile(q)
+        return summary
+
+###################
+### Grouped Summaries
+###################
+
+def _iter_chunks(df, chunksize):
+    """
+
+    """
+    if chunksize is None:
+        yield df
+        return
+    for start in range(0, len(df), chunksize):
+        yield df.iloc[start:start + chunksize]
+
+def summarize_sizes(df,
+                    group_col="annotation_level",
+                    value_cols=["n_documents_total","n_individuals_total"],
+                    chunksize=None,
+                    k=SKETCH_K):
+    """
+    Accumulate grouped size statistics in one pass over a catalog (or over
+    successive chunks of it).
+
+    Args:
+        df (pandas DataFrame): Normalized catalog (or one shard of it)
+        group_col (str): Column to group by
+        value_cols (list of str): Size columns to summarize
+        chunksize (int or None): Process the catalog in chunks of this many rows
+        k (int): KLL sketch capacity
+
+    Returns:
+        summaries (dict): (group, column) -> SizeSummary. Combine the results of
+                          independent shards with merge_summaries.
+    """
+    summaries = {}
+    for chunk in _iter_chunks(df, chunksize):
+        for group, group_df in chunk.groupby(group_col, sort=False):
+            for col in value_cols:
+                if (group, col) not in summaries:
+                    summaries[(group, col)] = SizeSummary(k)
+                summaries[(group, col)].update(group_df[col].values)
+    return summaries
+
+def merge_summaries(*partials):
+    """
+    Combine the output of summarize_sizes computed over disjoint shards.
+    """
+    merged = {}
+    for partial in partials:
+        for key, summary in partial.items():
+            if key not in merged:
+                merged[key] = SizeSummary(summary.sketch.k)
+            merged[key].merge(summary)
+    return merged
+
+def summary_table(summaries, quantiles=QUANTILES):
+    """
+    Tabulate summaries as a DataFrame indexed by (group, column).
+    """
+    records = dict((key, summary.summarize(quantiles)) for key, summary in summaries.items())
+    table = pd.DataFrame.from_dict(records, orient="index")
+    table.index = pd.MultiIndex.from_tuples(table.index, names=["group","column"])
+    return table.sort_index()
@@ -0,0 +1,198 @@
+###################
+### Imports
+###################
+
+## Standard Libraries
+import os
+import json
+import time
+import threading
+from urllib.parse import urlparse, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+## External Libraries
+import pandas as pd
+
+###################
+### File Watching
+###################
+
+class FileWatcher(object):
+
+    """
+    Polling file watcher (portable, no inotify dependency). A change is only
+    reported once a file's size and modification time have stayed the same
+    for `settle` seconds, so half-written saves (e.g. from Excel) are not
+    picked up.
+    """
+
+    def __init__(self, paths, interval=1.0, settle=0.5):
+        """
+        Args:
+            paths (list of str): Files to watch
+            interval (float): Seconds between polls
+            settle (float): Seconds a change must be stable before it is reported
+        """
+        self.paths = list(paths)
+        self.interval = interval
+        self.settle = settle
+        self._seen = dict((path, self._signature(path)) for path in self.paths)
+        self._pending = {}
+
+    def _signature(self, path):
+        """
+
+        """
+        if not os.path.exists(path):
+            return None
+        stat = os.stat(path)
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def poll(self):
+        """
+        Check every path once.
+
+        Returns:
+            changed (list of str): Paths whose settled signature changed
+        """
+        now = time.monotonic()
+        changed = []
+        for path in self.paths:
+            signature = self._signature(path)
+            if signature == self._seen[path]:
+                self._pending.pop(path, None)
+                continue
+            if path not in self._pending or self._pending[path][0] != signature:
+                self._pending[path] = (signature, now)
+                continue
+            if now - self._pending[path][1] >= self.settle:
+                self._seen[path] = signature
+                del self._pending[path]
+                changed.append(path)
+        return changed
+
+    def watch(self, stop_event=None):
+        """
+        Yield lists of changed paths until stop_event is set.
+        """
+        while stop_event is None or not stop_event.is_set():
+            changed = self.poll()
+            if len(changed) > 0:
+                yield changed
+            time.sleep(min(self.interval, self.settle) if len(self._pending) > 0 else self.interval)
+
+###################
+### Row Diffs
+###################
+
+def row_hashes(df, key_cols):
+    """
+    Content hash of every row, indexed by the row's key.
+    """
+    hashes = pd.util.hash_pandas_object(df.astype(str), index=False)
+    key = df[key_cols].astype(str).agg(" | ".join, axis=1) if len(key_cols) > 1 else df[key_cols[0]]
+    hashes.index = key.values
+    return hashes
+
+def row_keys(df, key_cols):
+    """
+    Unique key of every row: the key column values plus the row's occurrence
+    among rows sharing them (0 unless the key is repeated), so repeated keys
+    are matched across versions in order of appearance.
+    """
+    occurrence = df.groupby(key_cols, sort=False, dropna=False).cumcount()
+    return pd.MultiIndex.from_arrays([df[col].values for col in key_cols] + [occurrence.values],
+                                     names=list(key_cols) + ["occurrence"])
+
+def diff_rows(old_df, new_df, key_cols):
+    """
+    Compare two versions of a catalog row by row.
+
+    Args:
+        old_df (pandas DataFrame or None): Previous version
+        new_df (pandas DataFrame): Current version
+        key_cols (list of str): Columns identifying a row (e.g. ["paper_id"])
+
+    Returns:
+        diff (dict): Keys (tuples of key column values and occurrence, see
+                     row_keys) of "added", "removed" and "changed" rows, and
+                     the "columns" that differ in any changed row
+    """
+    new_hashes = pd.Series(pd.util.hash_pandas_object(new_df.astype(str), index=False).values, index=row_keys(new_df, key_cols))
+    if old_df is None:
+        return {"added":new_hashes.index.tolist(), "removed":[], "changed":[], "columns":new_df.columns.tolist()}
+    old_hashes = pd.Series(pd.util.hash_pandas_object(old_df.astype(str), index=False).values, index=row_keys(old_df, key_cols))
+    shared = old_hashes.index.intersection(new_hashes.index)
+    changed = shared[old_hashes.loc[shared].values != new_hashes.loc[shared].values]
+    ## Columns Differing Among Changed Rows
+    columns = [col for col in new_df.columns if col in old_df.columns]
+    old_values = old_df.set_axis(old_hashes.index).loc[changed, columns].astype(object)
+    new_values = new_df.set_axis(new_hashes.index).loc[changed, columns].astype(object)
+    differs = ~((old_values.values == new_values.values) | (old_values.isnull().values & new_values.isnull().values))
+    differs = differs.any(axis=0)
+    return {"added":new_hashes.index.difference(old_hashes.index).tolist(),
+            "removed":old_hashes.index.difference(new_hashes.index).tolist(),
+            "changed":changed.tolist(),
+            "columns":[col for col, d in zip(columns, differs) if d]}
+
+###################
+### Local Query Endpoint
+###################
+
+def _make_handler(routes):
+    """
+    Request handler dispatching GET /<route>?<params> to routes[route](params).
+    """
+    class CatalogHandler(BaseHTTPRequestHandler):
+
+        def do_GET(self):
+            """
+
+            """
+            url = urlparse(self.path)
+            route = url.path.strip("/")
+            params = dict((k, v if len(v) > 1 else v[0]) for k, v in parse_qs(url.query).items())
+            if route not in routes:
+                self._respond(404, {"error":f"Unknown route: /{route}", "routes":sorted(routes)})
+                return
+            try:
+                self._respond(200, routes[route](params))
+            except (KeyError, ValueError) as error:
+                self._respond(400, {"error":str(error)})
+
+        def _respond(self, status, payload):
+            """
+
+            """
+            body = json.dumps(payload, default=str).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            """
+            Silence per-request logging.
+            """
+            pass
+
+    return CatalogHandler
+
+def serve(routes, host="127.0.0.1", port=8765):
+    """
+    Serve JSON routes over HTTP from a background thread.
+
+    Args:
+        routes (dict): Route name -> callable(params dict) returning a
+                       JSON-serializable object
+        host (str): Interface to bind (localhost only by default)
+        port (int): Port (0 picks a free port)
+
+    Returns:
+        server (ThreadingHTTPServer): Running server (call shutdown() to stop)
+    """
+    server = ThreadingHTTPServer((host, port), _make_handler(routes))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
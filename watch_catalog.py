@@ -0,0 +1,224 @@
+"""
+Keep the catalogs warm in memory and re-emit outputs when the workbooks change.
+
+Run from the root directory of the repository:
+
+    python watch_catalog.py [--port 8765] [--interval 1.0]
+
+Each save is diffed row by row against the warm copy, and only the outputs
+depending on the changed rows and columns are refreshed. Edits to
+data_sources.xlsx re-render README.md (only changed rows) and refresh the
+full-text index. Edits to supplemental_data/data_sources_standardized.xlsx
+re-run analysis/statistics.py in-process with the changed paper_ids (memoized
+stages, cached figures and per-partition store writes mean only affected
+outputs are recomputed) and rebuild the query and, if sources changed, lineage
+indexes. Saves that change no rows are ignored. A local HTTP endpoint answers
+queries against the warm catalog, e.g.
+
+    curl "http://127.0.0.1:8765/query?task=depression&min_year=2015"
+    curl "http://127.0.0.1:8765/search?q=regex+self-report"
+    curl "http://127.0.0.1:8765/lineage?paper_id=1"
+"""
+
+###################
+### Imports
+###################
+
+## Standard Libraries
+import os
+import sys
+import json
+import argparse
+import threading
+import importlib.util
+from datetime import datetime
+
+## Local
+import excel_to_markdown
+from mhd.catalog import load_catalog
+from mhd.query import CATALOG_PATH, INDEX_FIELDS, CatalogIndex
+from mhd.lineage import build_lineage_index
+from mhd.search import TEXT_COLUMNS, build_search_index, search
+from mhd.watch import FileWatcher, diff_rows, serve
+
+###################
+### Globals
+###################
+
+## Row Keys Used for Diffs
+RAW_KEY = ["Paper","Year"]
+STANDARDIZED_KEY = ["paper_id"]
+
+## Columns Each Output Depends On (Edits Elsewhere Leave It As Is)
+README_COLUMNS = excel_to_markdown.col_subset + ["Reference Link"]
+SEARCH_COLUMNS = list(TEXT_COLUMNS.keys()) + ["Year","Availability"]
+LINEAGE_COLUMNS = ["paper_id","source_ids"]
+
+## Warm State (Swapped Under the Lock)
+STATE = {}
+STATE_LOCK = threading.Lock()
+
+###################
+### Helpers
+###################
+
+def _load_statistics():
+    """
+    Import analysis/statistics.py without shadowing the standard library module.
+    """
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "analysis", "statistics.py")
+    spec = importlib.util.spec_from_file_location("analysis_statistics", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def log(message):
+    """
+
+    """
+    print("[{}] {}".format(datetime.now().strftime("%H:%M:%S"), message), flush=True)
+
+def _describe(diff):
+    """
+
+    """
+    return "{} added, {} removed, {} changed".format(len(diff["added"]), len(diff["removed"]), len(diff["changed"]))
+
+###################
+### Refresh
+###################
+
+def _affects(diff, columns):
+    """
+    Whether a diff adds or removes rows or edits any of the given columns.
+    """
+    return len(diff["added"]) + len(diff["removed"]) > 0 or len(set(diff["columns"]) & set(columns)) > 0
+
+def refresh_raw():
+    """
+    Reload data_sources.xlsx and, for the outputs whose columns changed,
+    re-render the README (incrementally) and update the full-text index.
+    """
+    raw_df = excel_to_markdown.load_raw_catalog(excel_to_markdown.CATALOG_PATH)
+    diff = diff_rows(STATE.get("raw_df"), raw_df, RAW_KEY)
+    log(f"{excel_to_markdown.CATALOG_PATH}: {_describe(diff)}")
+    if _affects(diff, README_COLUMNS):
+        written = excel_to_markdown.render_readme(raw_df,
+                                                  incremental="raw_df" in STATE,
+                                                  sources=excel_to_markdown.source_hash(excel_to_markdown.CATALOG_PATH))
+        log("README {}".format("updated" if written else "unchanged"))
+    if _affects(diff, SEARCH_COLUMNS):
+        log("Search index: {}".format(build_search_index(raw_df)))
+    with STATE_LOCK:
+        STATE["raw_df"] = raw_df
+
+def refresh_standardized(statistics):
+    """
+    Reload the standardized catalog and, if any row changed, re-run the
+    analysis for the changed papers and rebuild the query index. The lineage
+    index and titles are only rebuilt when their columns changed.
+    """
+    catalog_df = load_catalog(CATALOG_PATH)
+    diff = diff_rows(STATE.get("catalog_df"), catalog_df, STANDARDIZED_KEY)
+    log(f"{CATALOG_PATH}: {_describe(diff)}")
+    if not _affects(diff, catalog_df.columns):
+        return
+    changed = set(key[0] for key in diff["added"] + diff["removed"] + diff["changed"])
+    outputs = statistics.main(changed=changed if "catalog_df" in STATE else None)
+    log("Analysis outputs refreshed ({} figures, {} exports)".format(len(outputs["figure_paths"]), len(outputs["export_paths"])))
+    index = CatalogIndex(catalog_df)
+    lineage = build_lineage_index(catalog_df) if _affects(diff, LINEAGE_COLUMNS) else STATE["lineage"]
+    titles = catalog_df.set_index("paper_id")["title"] if _affects(diff, ["paper_id","title"]) else STATE["titles"]
+    with STATE_LOCK:
+        STATE["catalog_df"] = catalog_df
+        STATE["index"] = index
+        STATE["lineage"] = lineage
+        STATE["titles"] = titles
+
+###################
+### Routes
+###################
+
+def route_status(params):
+    """
+
+    """
+    return {"raw_rows":len(STATE["raw_df"]), "standardized_rows":len(STATE["catalog_df"])}
+
+def route_query(params):
+    """
+
+    """
+    criteria = dict((field, params[field] if isinstance(params[field], list) else [params[field]]) for field in INDEX_FIELDS if field in params)
+    numeric = dict((k, float(params[k])) for k in ["min_year","max_year","min_individuals","min_documents"] if k in params)
+    results = STATE["index"].query(**numeric, **criteria)
+    return json.loads(results.to_json(orient="records"))
+
+def route_search(params):
+    """
+
+    """
+    results = search(params["q"], limit=int(params.get("limit", 10)))
+    return json.loads(results.to_json(orient="records"))
+
+def route_lineage(params):
+    """
+
+    """
+    paper_id = int(params["paper_id"])
+    lineage = STATE["lineage"]
+    related = lineage.ancestors(paper_id) if params.get("direction") == "upstream" else lineage.descendants(paper_id)
+    return [{"paper_id":p, "depth":d, "title":STATE["titles"][p]} for p, d in sorted(related.items(), key=lambda x: (x[1], x[0]))]
+
+ROUTES = {
+    "status":route_status,
+    "query":route_query,
+    "search":route_search,
+    "lineage":route_lineage,
+}
+
+###################
+### Execute
+###################
+
+def parse_command_line():
+    """
+
+    """
+    parser = argparse.ArgumentParser(description="Watch the catalog workbooks and keep outputs up to date")
+    parser.add_argument("--interval", type=float, default=1.0, help="Seconds between polls")
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765, help="Query endpoint port (-1 disables the endpoint)")
+    args = parser.parse_args()
+    return args
+
+def main():
+    """
+
+    """
+    args = parse_command_line()
+    statistics = _load_statistics()
+    ## Warm Start
+    refresh_raw()
+    refresh_standardized(statistics)
+    if args.port >= 0:
+        server = serve(ROUTES, args.host, args.port)
+        log("Serving {} on http://{}:{}/".format(", ".join(sorted(ROUTES)), *server.server_address))
+    ## Watch
+    refreshers = {excel_to_markdown.CATALOG_PATH:refresh_raw,
+                  CATALOG_PATH:lambda: refresh_standardized(statistics)}
+    watcher = FileWatcher(list(refreshers.keys()), interval=args.interval)
+    log("Watching {}".format(", ".join(watcher.paths)))
+    try:
+        for changed in watcher.watch():
+            for path in changed:
+                try:
+                    refreshers[path]()
+                except Exception as error:
+                    log(f"Failed to refresh {path}: {error!r}")
+    except KeyboardInterrupt:
+        log("Stopped")
+        sys.exit(0)
+
+if __name__ == "__main__":
+    main()